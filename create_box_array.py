@@ -9,6 +9,12 @@ def create_box_array():
     base_size = 10
     spacing = 15  # Space between boxes
     
+    # Collect the values that differ between boxes as columns, one row per box
+    sizes = []
+    translations = []
+    colors = []
+    descriptions = []
+    
     # Create a 6x6x6 grid
     for i in range(6):
         for j in range(6):
@@ -32,19 +38,24 @@ def create_box_array():
                 g = 0
                 b = int(255 * (1 - color_factor))  # More blue as distance decreases
                 
-                # Create the box
-                result = rhino.send_command("create_object", {
-                    "type": "BOX",
-                    "params": {
-                        "width": size,
-                        "length": size,
-                        "height": size
-                    },
-                    "translation": [x, y, z],
-                    "color": [r, g, b]
-                })
-                
-                print(f"Created box at ({x}, {y}, {z}) with size {size} and color ({r}, {g}, {b})")
+                # Queue the box
+                sizes.append(size)
+                translations.append([x, y, z])
+                colors.append([r, g, b])
+                descriptions.append(f"box at ({x}, {y}, {z}) with size {size} and color ({r}, {g}, {b})")
+    
+    # Send every box in one columnar command instead of one command per box
+    results = rhino.create_objects_columnar(
+        "BOX",
+        params={"width": sizes, "length": sizes, "height": sizes},
+        translations=translations,
+        colors=colors,
+    )
+    for description, result in zip(descriptions, results):
+        if "error" in result:
+            print(f"Failed to create {description}: {result['error']}")
+        else:
+            print(f"Created {description}")
 
 if __name__ == "__main__":
     create_box_array() 
\ No newline at end of file
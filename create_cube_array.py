@@ -9,6 +9,12 @@ def create_cube_array():
     base_size = 10
     spacing = 15  # Space between cubes
     
+    # Every cube is an instance of one unit cube, which only needs a scale, a position and a color
+    scales = []
+    translations = []
+    colors = []
+    descriptions = []
+    
     # Create a 6x6x6 grid
     for i in range(6):
         for j in range(6):
@@ -32,19 +38,27 @@ def create_cube_array():
                 g = 0
                 b = int(255 * (1 - color_factor))  # More blue as distance decreases
                 
-                # Create the cube
-                result = rhino.send_command("create_object", {
-                    "type": "BOX",
-                    "params": {
-                        "width": size,
-                        "length": size,
-                        "height": size
-                    },
-                    "translation": [x, y, z],
-                    "color": [r, g, b]
-                })
-                
-                print(f"Created cube at ({x}, {y}, {z}) with size {size} and color ({r}, {g}, {b})")
+                # Queue the cube, scaled from its minimum corner
+                scales.append([size, size, size])
+                translations.append([x - size / 2, y - size / 2, z - size / 2])
+                colors.append([r, g, b])
+                descriptions.append(f"cube at ({x}, {y}, {z}) with size {size} and color ({r}, {g}, {b})")
+    
+    # Define the unit cube once with its minimum corner at the origin, then place every cube
+    results, block = rhino.create_block_instances(
+        "Unit Cube",
+        objects=[{"type": "BOX", "params": {"width": 1, "length": 1, "height": 1}, "translation": [0.5, 0.5, 0.5]}],
+        replace=True,
+        scales=scales,
+        translations=translations,
+        colors=colors,
+    )
+    for description, result in zip(descriptions, results):
+        if "error" in result:
+            print(f"Failed to create {description}: {result['error']}")
+        else:
+            print(f"Created {description}")
+    print(f"{block['instance_count']} instances of {block['name']}")
 
 if __name__ == "__main__":
     create_cube_array() 
\ No newline at end of file
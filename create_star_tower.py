@@ -1,3 +1,4 @@
+from rhinomcp import run_sync
 from rhinomcp.tools.create_object import create_object
 from mcp.server.fastmcp import Context
 import math
@@ -26,7 +27,7 @@ def create_star_tower():
         top_points.append([x, y, 100])
     
     # Create the surface
-    result = create_object(
+    result = run_sync(create_object(
         Context(),
         type='SURFACE',
         params={
@@ -34,7 +35,7 @@ def create_star_tower():
             'points': points + top_points,
             'degree': (3, 1)
         }
-    )
+    ))
     print(result)
 
 if __name__ == "__main__":
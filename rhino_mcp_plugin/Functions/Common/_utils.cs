@@ -21,6 +21,9 @@ public partial class RhinoMCPFunctions
     }
     private double[][] castToDoubleArray2D(JToken token)
     {
+        // Clients that negotiated "binary_arrays" send long point lists packed
+        if (token is JObject packed && packed[Serializer.PackedArrayKey] != null) return Serializer.UnpackArray2D(packed);
+
         List<double[]> result = new List<double[]>();
         foreach (var t in (JArray)token)
         {
@@ -29,6 +32,33 @@ public partial class RhinoMCPFunctions
         }
         return result.ToArray();
     }
+    private double[][] castToColumn(JToken token, int count)
+    {
+        // One row per object: packed, a list of numbers or a list of lists of numbers
+        double[][] rows;
+        if (token is JObject packed && packed[Serializer.PackedArrayKey] != null)
+            rows = Serializer.UnpackArray2D(packed);
+        else if (token is JArray list && list.Count > 0 && list[0].Type != JTokenType.Array)
+            rows = list.Select(value => new[] { value.ToObject<double>() }).ToArray();
+        else
+            rows = castToDoubleArray2D(token);
+        if (rows.Length != count)
+            throw new InvalidOperationException($"Column has {rows.Length} rows for {count} objects");
+        return rows;
+    }
+    private Dictionary<string, double[][]> castToColumns(JToken token, int count)
+    {
+        // Every column holds one row per object, values shared by all objects are sent elsewhere
+        var columns = new Dictionary<string, double[][]>();
+        if (token is JObject columnTokens)
+        {
+            foreach (var property in columnTokens.Properties())
+            {
+                columns[property.Name] = castToColumn(property.Value, count);
+            }
+        }
+        return columns;
+    }
     private int castToInt(JToken token)
     {
         return token?.ToObject<int>() ?? 0;
@@ -76,6 +106,22 @@ public partial class RhinoMCPFunctions
         return ptList;
     }
 
+    private Transform castToTransform(double[] matrix)
+    {
+        // Row-major, either all 16 values or the top three rows of an affine transform
+        if (matrix.Length != 12 && matrix.Length != 16)
+            throw new InvalidOperationException($"A transform has 12 or 16 values, got {matrix.Length}");
+        var xform = Transform.Identity;
+        for (int r = 0; r < matrix.Length / 4; r++)
+        {
+            for (int c = 0; c < 4; c++)
+            {
+                xform[r, c] = matrix[r * 4 + c];
+            }
+        }
+        return xform;
+    }
+
     private Point3d castToPoint3d(JToken token)
     {
         double[] point = castToDoubleArray(token);
@@ -108,11 +154,19 @@ public partial class RhinoMCPFunctions
 
     private Transform applyRotation(JObject parameters, GeometryBase geometry)
     {
-        double[] rotation = parameters["rotation"].ToObject<double[]>();
+        return applyRotation(parameters["rotation"].ToObject<double[]>(), geometry);
+    }
+
+    private Transform applyRotation(double[] rotation, GeometryBase geometry)
+    {
+        return applyRotation(rotation, geometry.GetBoundingBox(true));
+    }
+
+    private Transform applyRotation(double[] rotation, BoundingBox bbox)
+    {
         var xform = Transform.Identity;
 
         // Calculate the center for rotation
-        BoundingBox bbox = geometry.GetBoundingBox(true);
         Point3d center = bbox.Center;
 
         // Create rotation transformations (in radians)
@@ -130,7 +184,11 @@ public partial class RhinoMCPFunctions
 
     private Transform applyTranslation(JObject parameters)
     {
-        double[] translation = parameters["translation"].ToObject<double[]>();
+        return applyTranslation(parameters["translation"].ToObject<double[]>());
+    }
+
+    private Transform applyTranslation(double[] translation)
+    {
         var xform = Transform.Identity;
         Vector3d move = new Vector3d(translation[0], translation[1], translation[2]);
         xform *= Transform.Translation(move);
@@ -140,11 +198,19 @@ public partial class RhinoMCPFunctions
 
     private Transform applyScale(JObject parameters, GeometryBase geometry)
     {
-        double[] scale = parameters["scale"].ToObject<double[]>();
+        return applyScale(parameters["scale"].ToObject<double[]>(), geometry);
+    }
+
+    private Transform applyScale(double[] scale, GeometryBase geometry)
+    {
+        return applyScale(scale, geometry.GetBoundingBox(true));
+    }
+
+    private Transform applyScale(double[] scale, BoundingBox bbox)
+    {
         var xform = Transform.Identity;
 
         // Calculate the min for scaling
-        BoundingBox bbox = geometry.GetBoundingBox(true);
         Point3d anchor = bbox.Min;
         Plane plane = Plane.WorldXY;
         plane.Origin = anchor;
@@ -155,4 +221,14 @@ public partial class RhinoMCPFunctions
 
         return xform;
     }
+
+    private Transform applyTransforms(double[] translation, double[] rotation, double[] scale, BoundingBox bbox)
+    {
+        // Same order as modify_object: rotate, then scale, then move
+        var xform = Transform.Identity;
+        if (translation != null) xform *= applyTranslation(translation);
+        if (scale != null) xform *= applyScale(scale, bbox);
+        if (rotation != null) xform *= applyRotation(rotation, bbox);
+        return xform;
+    }
 }
\ No newline at end of file
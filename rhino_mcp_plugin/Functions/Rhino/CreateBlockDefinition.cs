@@ -0,0 +1,108 @@
+using System;
+using System.Collections.Generic;
+using System.Drawing;
+using System.Linq;
+using Newtonsoft.Json.Linq;
+using Rhino;
+using Rhino.DocObjects;
+using Rhino.Geometry;
+using rhinomcp.Serializers;
+
+namespace RhinoMCPPlugin.Functions;
+
+public partial class RhinoMCPFunctions
+{
+    public JObject CreateBlockDefinition(JObject parameters)
+    {
+        // parse meta data
+        string name = castToString(parameters.SelectToken("name"));
+        string description = castToString(parameters.SelectToken("description")) ?? "";
+        bool replace = castToBool(parameters.SelectToken("replace"));
+        JArray objects = parameters["objects"] as JArray;
+        if (string.IsNullOrEmpty(name))
+            throw new InvalidOperationException("Block name is required");
+        if (objects == null || objects.Count == 0)
+            throw new InvalidOperationException("A block needs at least one object");
+
+        // The objects of a block are built like those of create_object, around the origin as base point
+        var doc = RhinoDoc.ActiveDoc;
+        var geometries = new List<GeometryBase>();
+        var attributes = new List<ObjectAttributes>();
+        foreach (JObject spec in objects)
+        {
+            GeometryBase geometry = CreateGeometry(castToString(spec.SelectToken("type")), spec["params"] as JObject ?? new JObject());
+            double[] translation = spec["translation"]?.ToObject<double[]>();
+            double[] rotation = spec["rotation"]?.ToObject<double[]>();
+            double[] scale = spec["scale"]?.ToObject<double[]>();
+            if (translation != null || rotation != null || scale != null)
+                geometry.Transform(applyTransforms(translation, rotation, scale, geometry.GetBoundingBox(true)));
+
+            var objectAttributes = doc.CreateDefaultAttributes();
+            string objectName = castToString(spec.SelectToken("name"));
+            if (!string.IsNullOrEmpty(objectName)) objectAttributes.Name = objectName;
+            if (spec.ContainsKey("color"))
+            {
+                int[] color = castToIntArray(spec.SelectToken("color"));
+                objectAttributes.ColorSource = ObjectColorSource.ColorFromObject;
+                objectAttributes.ObjectColor = Color.FromArgb(color[0], color[1], color[2]);
+            }
+            else
+            {
+                // Objects without a color of their own take the color of each instance
+                objectAttributes.ColorSource = ObjectColorSource.ColorFromParent;
+            }
+            geometries.Add(geometry);
+            attributes.Add(objectAttributes);
+        }
+
+        int index;
+        InstanceDefinition existing = doc.InstanceDefinitions.Find(name);
+        if (existing != null)
+        {
+            // Replacing the geometry updates every instance already placed
+            if (!replace)
+                throw new InvalidOperationException($"Block {name} already exists");
+            if (!doc.InstanceDefinitions.ModifyGeometry(existing.Index, geometries, attributes))
+                throw new InvalidOperationException($"Failed to replace block {name}");
+            index = existing.Index;
+        }
+        else
+        {
+            index = doc.InstanceDefinitions.Add(name, description, Point3d.Origin, geometries, attributes);
+            if (index < 0)
+                throw new InvalidOperationException($"Failed to create block {name}");
+        }
+
+        // Update views
+        doc.Views.Redraw();
+
+        return DescribeBlock(doc.InstanceDefinitions[index]);
+    }
+
+    private BoundingBox BlockBoundingBox(InstanceDefinition definition)
+    {
+        BoundingBox bbox = BoundingBox.Empty;
+        foreach (var obj in definition.GetObjects())
+        {
+            bbox.Union(obj.Geometry.GetBoundingBox(true));
+        }
+        return bbox;
+    }
+
+    private JObject DescribeBlock(InstanceDefinition definition)
+    {
+        // Memory estimates let callers see what instancing saved over copies of the geometry
+        RhinoObject[] objects = definition.GetObjects();
+        InstanceObject[] references = definition.GetReferences(0);
+        return new JObject
+        {
+            ["name"] = definition.Name,
+            ["index"] = definition.Index,
+            ["object_count"] = objects.Length,
+            ["instance_count"] = references.Length,
+            ["definition_bytes"] = objects.Sum(obj => (long)obj.MemoryEstimate()),
+            ["instance_bytes"] = references.Length > 0 ? (long)references[0].MemoryEstimate() : 0,
+            ["bounding_box"] = Serializer.SerializeBBox(BlockBoundingBox(definition))
+        };
+    }
+}
\ No newline at end of file
@@ -0,0 +1,81 @@
+using System;
+using System.Collections.Generic;
+using System.Drawing;
+using Newtonsoft.Json.Linq;
+using Rhino;
+using Rhino.DocObjects;
+using Rhino.Geometry;
+using rhinomcp.Serializers;
+
+namespace RhinoMCPPlugin.Functions;
+
+public partial class RhinoMCPFunctions
+{
+    public JObject CreateBlockInstances(JObject parameters)
+    {
+        // parse meta data
+        string block = castToString(parameters.SelectToken("block"));
+        int count = castToInt(parameters.SelectToken("count"));
+        JArray names = parameters["names"] as JArray;
+        string name = castToString(parameters.SelectToken("name"));
+        if (names != null && names.Count != count)
+            throw new InvalidOperationException($"Got {names.Count} names for {count} instances");
+
+        var doc = RhinoDoc.ActiveDoc;
+        InstanceDefinition definition = doc.InstanceDefinitions.Find(block)
+            ?? throw new InvalidOperationException($"Block {block} not found");
+
+        // Transforms are taken relative to the block's bounding box, as modify_object does for objects
+        BoundingBox bbox = BlockBoundingBox(definition);
+        Dictionary<string, double[][]> columns = castToColumns(parameters["columns"], count);
+        double[] row(string key, int index)
+        {
+            if (columns.TryGetValue(key, out double[][] column)) return column[index];
+            return parameters[key]?.ToObject<double[]>();
+        }
+
+        var ids = new JArray();
+        var errors = new JArray();
+        for (int i = 0; i < count; i++)
+        {
+            try
+            {
+                Transform xform = applyTransforms(row("translation", i), row("rotation", i), row("scale", i), bbox);
+
+                var attributes = doc.CreateDefaultAttributes();
+                string instanceName = names != null ? castToString(names[i]) : name;
+                if (!string.IsNullOrEmpty(instanceName)) attributes.Name = instanceName;
+                double[] color = row("color", i);
+                if (color != null)
+                {
+                    attributes.ColorSource = ObjectColorSource.ColorFromObject;
+                    attributes.ObjectColor = Color.FromArgb((int)color[0], (int)color[1], (int)color[2]);
+                }
+
+                Guid objectId = doc.Objects.AddInstanceObject(definition.Index, xform, attributes);
+                if (objectId == Guid.Empty)
+                    throw new InvalidOperationException("Failed to place instance");
+                ids.Add(objectId.ToString());
+            }
+            catch (Exception ex)
+            {
+                ids.Add(JValue.CreateNull());
+                errors.Add(new JObject
+                {
+                    ["index"] = i,
+                    ["error"] = ex.Message
+                });
+            }
+        }
+
+        // Update views
+        doc.Views.Redraw();
+
+        return new JObject
+        {
+            ["ids"] = ids,
+            ["errors"] = errors,
+            ["block"] = DescribeBlock(definition)
+        };
+    }
+}
\ No newline at end of file
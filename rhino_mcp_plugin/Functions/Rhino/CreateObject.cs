@@ -21,7 +21,34 @@ public partial class RhinoMCPFunctions
         JObject geoParams = (JObject)parameters.SelectToken("params");
 
         var doc = RhinoDoc.ActiveDoc;
-        Guid objectId = Guid.Empty;
+        Guid objectId = doc.Objects.Add(CreateGeometry(type, geoParams));
+
+        if (objectId == Guid.Empty)
+            throw new InvalidOperationException("Failed to create object");
+
+        var rhinoObject = doc.Objects.Find(objectId);
+        if (rhinoObject != null)
+        {
+            if (!string.IsNullOrEmpty(name)) rhinoObject.Attributes.Name = name;
+            if (customColor)
+            {
+                rhinoObject.Attributes.ColorSource = ObjectColorSource.ColorFromObject;
+                rhinoObject.Attributes.ObjectColor = Color.FromArgb(color[0], color[1], color[2]);
+            }
+            doc.Objects.ModifyAttributes(rhinoObject, rhinoObject.Attributes, true);
+        }
+
+        // Update views
+        doc.Views.Redraw();
+
+        // apply modification
+        parameters["id"] = objectId;
+        return ModifyObject(parameters);
+    }
+
+    private GeometryBase CreateGeometry(string type, JObject geoParams)
+    {
+        GeometryBase geometry;
 
         // Create a box centered at the specified point
         switch (type)
@@ -30,44 +57,44 @@ public partial class RhinoMCPFunctions
                 double x = castToDouble(geoParams.SelectToken("x"));
                 double y = castToDouble(geoParams.SelectToken("y"));
                 double z = castToDouble(geoParams.SelectToken("z"));
-                objectId = doc.Objects.AddPoint(x, y, z);
+                geometry = new Rhino.Geometry.Point(new Point3d(x, y, z));
                 break;
             case "LINE":
                 double[] start = castToDoubleArray(geoParams.SelectToken("start"));
                 double[] end = castToDoubleArray(geoParams.SelectToken("end"));
                 var ptStart = new Point3d(start[0], start[1], start[2]);
                 var ptEnd = new Point3d(end[0], end[1], end[2]);
-                objectId = doc.Objects.AddLine(ptStart, ptEnd);
+                geometry = new LineCurve(ptStart, ptEnd);
                 break;
             case "POLYLINE":
                 List<Point3d> ptList = castToPoint3dList(geoParams.SelectToken("points"));
-                objectId = doc.Objects.AddPolyline(ptList);
+                geometry = new PolylineCurve(ptList);
                 break;
             case "CIRCLE":
                 Point3d circleCenter = castToPoint3d(geoParams.SelectToken("center"));
                 double circleRadius = castToDouble(geoParams.SelectToken("radius"));
                 var circle = new Circle(circleCenter, circleRadius);
-                objectId = doc.Objects.AddCircle(circle);
+                geometry = new ArcCurve(circle);
                 break;
             case "ARC":
                 Point3d arcCenter = castToPoint3d(geoParams.SelectToken("center"));
                 double arcRadius = castToDouble(geoParams.SelectToken("radius"));
                 double arcAngle = castToDouble(geoParams.SelectToken("angle"));
                 var arc = new Arc(new Plane(arcCenter, Vector3d.ZAxis), arcRadius, arcAngle * Math.PI / 180);
-                objectId = doc.Objects.AddArc(arc);
+                geometry = new ArcCurve(arc);
                 break;
             case "ELLIPSE":
                 Point3d ellipseCenter = castToPoint3d(geoParams.SelectToken("center"));
                 double ellipseRadiusX = castToDouble(geoParams.SelectToken("radius_x"));
                 double ellipseRadiusY = castToDouble(geoParams.SelectToken("radius_y"));
                 var ellipse = new Ellipse(new Plane(ellipseCenter, Vector3d.ZAxis), ellipseRadiusX, ellipseRadiusY);
-                objectId = doc.Objects.AddEllipse(ellipse);
+                geometry = ellipse.ToNurbsCurve();
                 break;
             case "CURVE":
                 List<Point3d> controlPoints = castToPoint3dList(geoParams.SelectToken("points"));
                 int degree = castToInt(geoParams.SelectToken("degree"));
                 var curve = Curve.CreateControlPointCurve(controlPoints, degree) ?? throw new InvalidOperationException("unable to create control point curve from given points");
-                objectId = doc.Objects.AddCurve(curve);
+                geometry = curve;
                 break;
             case "BOX":
                 // parse size
@@ -81,7 +108,7 @@ public partial class RhinoMCPFunctions
                     new Interval(-ySize / 2, ySize / 2),
                     new Interval(-zSize / 2, zSize / 2)
                 );
-                objectId = doc.Objects.AddBox(box);
+                geometry = box.ToBrep();
                 break;
 
             case "SPHERE":
@@ -90,7 +117,7 @@ public partial class RhinoMCPFunctions
                 // Create sphere at origin with specified radius
                 Sphere sphere = new Sphere(Point3d.Origin, radius);
                 // Convert sphere to BREP for adding to document
-                objectId = doc.Objects.AddBrep(sphere.ToBrep());
+                geometry = sphere.ToBrep();
                 break;
             case "CONE":
                 double coneRadius = castToDouble(geoParams.SelectToken("radius"));
@@ -98,7 +125,7 @@ public partial class RhinoMCPFunctions
                 bool coneCap = castToBool(geoParams.SelectToken("cap"));
                 Cone cone = new Cone(Plane.WorldXY, coneHeight, coneRadius);
                 Brep brep = Brep.CreateFromCone(cone, coneCap);
-                objectId = doc.Objects.AddBrep(brep);
+                geometry = brep;
                 break;
             case "CYLINDER":
                 double cylinderRadius = castToDouble(geoParams.SelectToken("radius"));
@@ -106,7 +133,7 @@ public partial class RhinoMCPFunctions
                 bool cylinderCap = castToBool(geoParams.SelectToken("cap"));
                 Circle cylinderCircle = new Circle(Plane.WorldXY, cylinderRadius);
                 Cylinder cylinder = new Cylinder(cylinderCircle, cylinderHeight);
-                objectId = doc.Objects.AddBrep(cylinder.ToBrep(cylinderCap, cylinderCap));
+                geometry = cylinder.ToBrep(cylinderCap, cylinderCap);
                 break;
             case "SURFACE":
                 int[] surfaceCount = castToIntArray(geoParams.SelectToken("count"));
@@ -114,32 +141,12 @@ public partial class RhinoMCPFunctions
                 int[] surfaceDegree = castToIntArray(geoParams.SelectToken("degree"));
                 bool[] surfaceClosed = castToBoolArray(geoParams.SelectToken("closed"));
                 var surf = NurbsSurface.CreateThroughPoints(surfacePoints, surfaceCount[0], surfaceCount[1], surfaceDegree[0], surfaceDegree[1], surfaceClosed[0], surfaceClosed[1]);
-                objectId = doc.Objects.AddSurface(surf);
+                geometry = surf;
                 break;
             default:
                 throw new InvalidOperationException("Invalid object type");
         }
 
-        if (objectId == Guid.Empty)
-            throw new InvalidOperationException("Failed to create object");
-
-        var rhinoObject = doc.Objects.Find(objectId);
-        if (rhinoObject != null)
-        {
-            if (!string.IsNullOrEmpty(name)) rhinoObject.Attributes.Name = name;
-            if (customColor)
-            {
-                rhinoObject.Attributes.ColorSource = ObjectColorSource.ColorFromObject;
-                rhinoObject.Attributes.ObjectColor = Color.FromArgb(color[0], color[1], color[2]);
-            }
-            doc.Objects.ModifyAttributes(rhinoObject, rhinoObject.Attributes, true);
-        }
-
-        // Update views
-        doc.Views.Redraw();
-
-        // apply modification
-        parameters["id"] = objectId;
-        return ModifyObject(parameters);
+        return geometry ?? throw new InvalidOperationException("Failed to create object");
     }
 }
\ No newline at end of file
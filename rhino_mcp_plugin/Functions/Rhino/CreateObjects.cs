@@ -11,37 +11,50 @@ namespace RhinoMCPPlugin.Functions;
 public partial class RhinoMCPFunctions
 {
     public JObject CreateObjects(JObject parameters)
+    {
+        var doc = RhinoDoc.ActiveDoc;
+        var results = new JObject();
+
+        // A list of objects is answered with a list of results in the same order
+        if (parameters["objects"] is JArray objects)
         {
-            var doc = RhinoDoc.ActiveDoc;
-            var results = new JObject();
-            
-            // Process each object in the parameters
-            foreach (var property in parameters.Properties())
+            var list = new JArray();
+            foreach (var item in objects)
             {
-                try
-                {
-                    // Get the object parameters
-                    JObject objectParams = (JObject)property.Value;
-                    
-                    // Create the object using the existing CreateObject method
-                    JObject result = CreateObject(objectParams);
-                    
-                    // Add the result to our results collection
-                    results[property.Name] = result;
-                }
-                catch (Exception ex)
-                {
-                    // If there's an error creating this object, add the error to the results
-                    results[property.Name] = new JObject
-                    {
-                        ["error"] = ex.Message
-                    };
-                }
+                list.Add(CreateEach(item));
             }
-            
-            // Update views
             doc.Views.Redraw();
-            
+            results["objects"] = list;
             return results;
         }
+
+        // Process each object in the parameters
+        foreach (var property in parameters.Properties())
+        {
+            // Create the object using the existing CreateObject method
+            // and add the result to our results collection
+            results[property.Name] = CreateEach(property.Value);
+        }
+
+        // Update views
+        doc.Views.Redraw();
+
+        return results;
+    }
+
+    private JObject CreateEach(JToken objectParams)
+    {
+        try
+        {
+            return CreateObject((JObject)objectParams);
+        }
+        catch (Exception ex)
+        {
+            // If there's an error creating this object, add the error to the results
+            return new JObject
+            {
+                ["error"] = ex.Message
+            };
+        }
+    }
 }
\ No newline at end of file
@@ -0,0 +1,94 @@
+using System;
+using System.Collections.Generic;
+using System.Drawing;
+using System.Linq;
+using Newtonsoft.Json.Linq;
+using Rhino;
+using Rhino.DocObjects;
+using Rhino.Geometry;
+using rhinomcp.Serializers;
+
+namespace RhinoMCPPlugin.Functions;
+
+public partial class RhinoMCPFunctions
+{
+    private static readonly HashSet<string> TransformColumns = new HashSet<string> { "translation", "rotation", "scale", "color" };
+
+    public JObject CreateObjectsColumnar(JObject parameters)
+    {
+        // parse meta data
+        string type = castToString(parameters.SelectToken("type"));
+        int count = castToInt(parameters.SelectToken("count"));
+        JObject constants = parameters["params"] as JObject ?? new JObject();
+        JArray names = parameters["names"] as JArray;
+        string name = castToString(parameters.SelectToken("name"));
+        if (names != null && names.Count != count)
+            throw new InvalidOperationException($"Got {names.Count} names for {count} objects");
+
+        // Every column holds one row per object, the other values are shared by all objects
+        Dictionary<string, double[][]> columns = castToColumns(parameters["columns"], count);
+        var geometryColumns = columns.Keys.Where(key => !TransformColumns.Contains(key)).ToList();
+
+        double[] row(string key, int index)
+        {
+            if (columns.TryGetValue(key, out double[][] column)) return column[index];
+            return parameters[key]?.ToObject<double[]>();
+        }
+
+        var doc = RhinoDoc.ActiveDoc;
+        var ids = new JArray();
+        var errors = new JArray();
+        for (int i = 0; i < count; i++)
+        {
+            try
+            {
+                JObject geoParams = (JObject)constants.DeepClone();
+                foreach (string key in geometryColumns)
+                {
+                    double[] values = columns[key][i];
+                    geoParams[key] = values.Length == 1 ? new JValue(values[0]) : new JArray(values);
+                }
+                GeometryBase geometry = CreateGeometry(type, geoParams);
+
+                double[] translation = row("translation", i);
+                double[] rotation = row("rotation", i);
+                double[] scale = row("scale", i);
+                if (translation != null || rotation != null || scale != null)
+                    geometry.Transform(applyTransforms(translation, rotation, scale, geometry.GetBoundingBox(true)));
+
+                var attributes = doc.CreateDefaultAttributes();
+                string objectName = names != null ? castToString(names[i]) : name;
+                if (!string.IsNullOrEmpty(objectName)) attributes.Name = objectName;
+                double[] color = row("color", i);
+                if (color != null)
+                {
+                    attributes.ColorSource = ObjectColorSource.ColorFromObject;
+                    attributes.ObjectColor = Color.FromArgb((int)color[0], (int)color[1], (int)color[2]);
+                }
+
+                Guid objectId = doc.Objects.Add(geometry, attributes);
+                if (objectId == Guid.Empty)
+                    throw new InvalidOperationException("Failed to create object");
+                ids.Add(objectId.ToString());
+            }
+            catch (Exception ex)
+            {
+                ids.Add(JValue.CreateNull());
+                errors.Add(new JObject
+                {
+                    ["index"] = i,
+                    ["error"] = ex.Message
+                });
+            }
+        }
+
+        // Update views
+        doc.Views.Redraw();
+
+        return new JObject
+        {
+            ["ids"] = ids,
+            ["errors"] = errors
+        };
+    }
+}
\ No newline at end of file
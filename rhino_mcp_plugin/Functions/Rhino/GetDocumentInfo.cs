@@ -43,14 +43,7 @@ public partial class RhinoMCPFunctions
         foreach (var docLayer in doc.Layers)
         {
             if (count >= LIMIT) break;
-            layerData.Add(new JObject
-            {
-                ["id"] = docLayer.Id.ToString(),
-                ["name"] = docLayer.Name,
-                ["color"] = docLayer.Color.ToString(),
-                ["visible"] = docLayer.IsVisible,
-                ["locked"] = docLayer.IsLocked
-            });
+            layerData.Add(Serializer.LayerSummary(docLayer));
             count++;
         }
 
@@ -0,0 +1,49 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using Newtonsoft.Json.Linq;
+using Rhino;
+using Rhino.DocObjects;
+using rhinomcp.Serializers;
+
+namespace RhinoMCPPlugin.Functions;
+
+public partial class RhinoMCPFunctions
+{
+    private const int DefaultPageSize = 500;
+    private const int MaxPageSize = 5000;
+    private readonly PageSnapshots<Guid> documentPages = new PageSnapshots<Guid>();
+
+    /// <summary>
+    /// Lists the document's objects one page at a time, in runtime serial number order.
+    /// The first page takes the ids of every object, sorted once, and the later pages look up their slice
+    /// of them by id. Objects deleted while paging are left out of their page, objects whose geometry was
+    /// replaced keep their id and are listed once as they are now, and objects added after the first page
+    /// are not listed; start again from the first page to see them.
+    /// </summary>
+    public JObject GetDocumentObjects(JObject parameters)
+    {
+        int limit = Math.Min(Math.Max(parameters["limit"]?.ToObject<int>() ?? DefaultPageSize, 1), MaxPageSize);
+        var fields = new HashSet<string>(parameters["fields"] != null ? castToStringList(parameters["fields"]) : Serializer.SummaryFields);
+        var unknown = fields.Except(Serializer.SummaryFields).ToList();
+        if (unknown.Count > 0) throw new InvalidOperationException($"Unknown fields: {string.Join(", ", unknown)}");
+
+        var doc = RhinoDoc.ActiveDoc;
+        var page = documentPages.Get(parameters["cursor"]?.ToString(), limit,
+            () => doc.Objects.OrderBy(obj => obj.RuntimeSerialNumber).Select(obj => obj.Id).ToList());
+
+        var objectData = new JArray();
+        foreach (Guid id in page.Items)
+        {
+            var obj = doc.Objects.Find(id);
+            if (obj != null) objectData.Add(Serializer.RhinoObjectSummary(obj, fields));
+        }
+
+        return new JObject
+        {
+            ["objects"] = objectData,
+            ["next_cursor"] = page.NextCursor,
+            ["object_count"] = doc.Objects.Count
+        };
+    }
+}
\ No newline at end of file
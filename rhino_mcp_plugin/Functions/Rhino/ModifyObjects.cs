@@ -1,4 +1,5 @@
 using System;
+using System.Collections.Generic;
 using System.Drawing;
 using System.Linq;
 using Newtonsoft.Json.Linq;
@@ -13,6 +14,9 @@ public partial class RhinoMCPFunctions
 {
     public JObject ModifyObjects(JObject parameters)
     {
+        // Without a list of modifications the objects are transformed as a batch
+        if (parameters["objects"] == null) return TransformObjects(parameters);
+
         bool all = parameters.ContainsKey("all");
         JArray objectParameters = (JArray)parameters["objects"];
         
@@ -45,4 +49,62 @@ public partial class RhinoMCPFunctions
         doc.Views.Redraw();
         return new JObject() { ["modified"] = i };
     }
+
+    private JObject TransformObjects(JObject parameters)
+    {
+        var doc = RhinoDoc.ActiveDoc;
+
+        // The objects are listed by id, or are the selected or all objects
+        List<Guid> ids;
+        if (parameters["ids"] is JArray idList)
+            ids = idList.Select(castToGuid).ToList();
+        else if (castToBool(parameters.SelectToken("selected")))
+            ids = doc.Objects.GetSelectedObjects(false, false).Select(obj => obj.Id).ToList();
+        else if (parameters.ContainsKey("all"))
+            ids = doc.Objects.Select(obj => obj.Id).ToList();
+        else
+            throw new InvalidOperationException("Give the ids of the objects to transform, selected or all");
+
+        // Every column holds one row per object, the other values are shared by all objects
+        Dictionary<string, double[][]> columns = castToColumns(parameters["columns"], ids.Count);
+        double[] row(string key, int index)
+        {
+            if (columns.TryGetValue(key, out double[][] column)) return column[index];
+            return parameters[key]?.ToObject<double[]>();
+        }
+
+        int modified = 0;
+        var errors = new JArray();
+        for (int i = 0; i < ids.Count; i++)
+        {
+            try
+            {
+                var obj = doc.Objects.Find(ids[i]) ?? throw new InvalidOperationException($"Object with ID {ids[i]} not found");
+                double[] matrix = row("xform", i);
+                Transform xform = matrix != null
+                    ? castToTransform(matrix)
+                    : applyTransforms(row("translation", i), row("rotation", i), row("scale", i), obj.Geometry.GetBoundingBox(true));
+                if (doc.Objects.Transform(obj, xform, true) == Guid.Empty)
+                    throw new InvalidOperationException("Failed to transform object");
+                modified++;
+            }
+            catch (Exception ex)
+            {
+                errors.Add(new JObject
+                {
+                    ["index"] = i,
+                    ["error"] = ex.Message
+                });
+            }
+        }
+
+        // Update views
+        doc.Views.Redraw();
+
+        return new JObject
+        {
+            ["modified"] = modified,
+            ["errors"] = errors
+        };
+    }
 }
\ No newline at end of file
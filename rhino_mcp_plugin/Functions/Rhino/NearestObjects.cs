@@ -0,0 +1,28 @@
+using System;
+using System.Linq;
+using Newtonsoft.Json.Linq;
+using Rhino;
+using Rhino.Geometry;
+
+namespace RhinoMCPPlugin.Functions;
+
+public partial class RhinoMCPFunctions
+{
+    private const int DefaultNearestCount = 10;
+
+    public JObject NearestObjects(JObject parameters)
+    {
+        if (parameters["point"] == null) throw new InvalidOperationException("point is required");
+        Point3d point = castToPoint3d(parameters.SelectToken("point"));
+        int count = Math.Min(Math.Max(parameters["count"]?.ToObject<int>() ?? DefaultNearestCount, 1), MaxPageSize);
+        double maxDistance = parameters["max_distance"]?.ToObject<double>() ?? double.PositiveInfinity;
+
+        // Nearest first
+        var hits = spatialIndex.Nearest(RhinoDoc.ActiveDoc, point, count, maxDistance);
+        return new JObject
+        {
+            ["ids"] = new JArray(hits.Select(hit => hit.Id.ToString())),
+            ["distances"] = new JArray(hits.Select(hit => hit.Distance))
+        };
+    }
+}
\ No newline at end of file
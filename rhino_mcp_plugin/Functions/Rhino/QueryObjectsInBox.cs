@@ -0,0 +1,46 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using Newtonsoft.Json.Linq;
+using Rhino;
+using Rhino.Geometry;
+
+namespace RhinoMCPPlugin.Functions;
+
+public partial class RhinoMCPFunctions
+{
+    private readonly SpatialIndex spatialIndex = new SpatialIndex();
+    private readonly PageSnapshots<SpatialIndex.Hit> spatialPages = new PageSnapshots<SpatialIndex.Hit>();
+
+    public JObject QueryObjectsInBox(JObject parameters)
+    {
+        if (parameters["min"] == null || parameters["max"] == null)
+            throw new InvalidOperationException("A box needs min and max corners");
+        // Either two opposite corners will do
+        var box = new BoundingBox(new[] { castToPoint3d(parameters.SelectToken("min")), castToPoint3d(parameters.SelectToken("max")) });
+        bool contained = castToBool(parameters.SelectToken("contained"));
+
+        return SpatialPage(() => spatialIndex.InBox(RhinoDoc.ActiveDoc, box, contained), parameters, false);
+    }
+
+    /// <summary>
+    /// One page of the objects a spatial query found, as ids in runtime serial number order like
+    /// get_document_objects. The first page runs the query and keeps its hits, the later pages are slices
+    /// of them, so objects deleted or moved while paging are still listed where they were found.
+    /// </summary>
+    private JObject SpatialPage(Func<List<SpatialIndex.Hit>> query, JObject parameters, bool distances)
+    {
+        int limit = Math.Min(Math.Max(parameters["limit"]?.ToObject<int>() ?? DefaultPageSize, 1), MaxPageSize);
+        var page = spatialPages.Get(parameters["cursor"]?.ToString(), limit,
+            () => query().OrderBy(hit => hit.Serial).ToList());
+
+        var result = new JObject
+        {
+            ["ids"] = new JArray(page.Items.Select(hit => hit.Id.ToString())),
+            ["next_cursor"] = page.NextCursor,
+            ["count"] = page.Count
+        };
+        if (distances) result["distances"] = new JArray(page.Items.Select(hit => hit.Distance));
+        return result;
+    }
+}
\ No newline at end of file
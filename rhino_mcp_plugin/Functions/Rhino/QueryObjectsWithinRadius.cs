@@ -0,0 +1,20 @@
+using System;
+using Newtonsoft.Json.Linq;
+using Rhino;
+using Rhino.Geometry;
+
+namespace RhinoMCPPlugin.Functions;
+
+public partial class RhinoMCPFunctions
+{
+    public JObject QueryObjectsWithinRadius(JObject parameters)
+    {
+        if (parameters["center"] == null || parameters["radius"] == null)
+            throw new InvalidOperationException("A sphere needs a center and a radius");
+        Point3d center = castToPoint3d(parameters.SelectToken("center"));
+        double radius = castToDouble(parameters.SelectToken("radius"));
+        if (radius < 0) throw new InvalidOperationException("radius cannot be negative");
+
+        return SpatialPage(() => spatialIndex.WithinRadius(RhinoDoc.ActiveDoc, center, radius), parameters, true);
+    }
+}
\ No newline at end of file
@@ -9,74 +9,22 @@ namespace RhinoMCPPlugin.Functions;
 
 public partial class RhinoMCPFunctions
 {
+    private readonly AttributeIndex attributeIndex = new AttributeIndex();
+
     public JObject SelectObjects(JObject parameters)
     {
-        JObject filters = (JObject)parameters["filters"];
-
         var doc = RhinoDoc.ActiveDoc;
-        var objects = doc.Objects.ToList();
-        var selectedObjects = new List<Guid>();
-        var filtersType = (string)parameters["filters_type"];
-
-        var hasName = false;
-        var hasColor = false;
-        var customAttributes = new Dictionary<string, List<string>>();
-
-        // no filter means all are selected
-        if (filters.Count == 0)
+        JObject query = parameters["query"] as JObject;
+        if (query == null)
         {
-            doc.Objects.UnselectAll();
-            doc.Objects.Select(objects.Select(o => o.Id));
-            doc.Views.Redraw();
-
-            return new JObject() { ["count"] = objects.Count };
+            JObject filters = parameters["filters"] as JObject ?? throw new InvalidOperationException("Give filters or a query");
+            query = QueryFromFilters(filters, (string)parameters["filters_type"]);
         }
 
-        foreach (JProperty f in filters.Properties())
-        {
-            if (f.Name == "name") hasName = true;
-            if (f.Name == "color") hasColor = true;
-            if (f.Name != "name" && f.Name != "color") customAttributes.Add(f.Name, castToStringList(f.Value));
-        }
-
-        var name = hasName ? castToString(filters.SelectToken("name")) : null;
-        var color = hasColor ? castToIntArray(filters.SelectToken("color")) : null;
-
-        if (filtersType == "and")
-            foreach (var obj in objects)
-            {
-                var attributeMatch = true;
-                if (hasName && obj.Name != name) continue;
-                if (hasColor && obj.Attributes.ObjectColor.R != color[0] && obj.Attributes.ObjectColor.G != color[1] && obj.Attributes.ObjectColor.B != color[2]) continue;
-                foreach (var customAttribute in customAttributes)
-                {
-                    foreach (var value in customAttribute.Value)
-                    {
-                        if (obj.Attributes.GetUserString(customAttribute.Key) != value) attributeMatch = false;
-                    }
-                }
-                if (!attributeMatch) continue;
-
-                selectedObjects.Add(obj.Id);
-            }
-        else if (filtersType == "or")
-            foreach (var obj in objects)
-            {
-                var attributeMatch = false;
-                if (hasName && obj.Name == name) attributeMatch = true;
-                if (hasColor && obj.Attributes.ObjectColor.R == color[0] && obj.Attributes.ObjectColor.G == color[1] && obj.Attributes.ObjectColor.B == color[2]) attributeMatch = true;
-
-                foreach (var customAttribute in customAttributes)
-                {
-                    foreach (var value in customAttribute.Value)
-                    {
-                        if (obj.Attributes.GetUserString(customAttribute.Key) == value) attributeMatch = true;
-                    }
-                }
-                if (!attributeMatch) continue;
-
-                selectedObjects.Add(obj.Id);
-            }
+        // no filter means all are selected
+        List<Guid> selectedObjects = query == null
+            ? doc.Objects.Select(o => o.Id).ToList()
+            : attributeIndex.Find(doc, query);
 
         doc.Objects.UnselectAll();
         doc.Objects.Select(selectedObjects);
@@ -84,4 +32,26 @@ public partial class RhinoMCPFunctions
 
         return new JObject() { ["count"] = selectedObjects.Count };
     }
+
+    // Every filter matches one of its values and filters_type combines them, keys other than name and color are user strings
+    private JObject QueryFromFilters(JObject filters, string filtersType)
+    {
+        if (filters.Count == 0) return null;
+        if (filtersType != "and" && filtersType != "or")
+            throw new InvalidOperationException($"filters_type must be and or or, got {filtersType}");
+
+        var leaves = new JArray();
+        foreach (JProperty f in filters.Properties())
+        {
+            JArray values = f.Value as JArray ?? new JArray(f.Value);
+            // A color is a list itself, a list of colors has lists as values
+            if (f.Name == "color" && values.Count > 0 && values[0].Type != JTokenType.Array) values = new JArray { values };
+            leaves.Add(new JObject
+            {
+                ["field"] = f.Name == "name" || f.Name == "color" ? f.Name : "user:" + f.Name,
+                ["in"] = values
+            });
+        }
+        return new JObject { [filtersType] = leaves };
+    }
 }
\ No newline at end of file
@@ -0,0 +1,317 @@
+using System;
+using System.Collections.Generic;
+using System.Globalization;
+using System.Linq;
+using Newtonsoft.Json.Linq;
+using Rhino;
+using Rhino.DocObjects;
+
+namespace RhinoMCPPlugin
+{
+    /// <summary>
+    /// Object ids by name, layer, color, type and user strings, so attribute queries look the matching objects
+    /// up instead of reading every object's attributes. See rhinomcp.query for the query grammar.
+    /// </summary>
+    public class AttributeIndex : DocumentIndex
+    {
+        private static readonly HashSet<string> Fields = new HashSet<string> { "name", "layer", "color", "type" };
+        private const string UserPrefix = "user:";
+
+        // field -> value -> ids, user strings as "user:key", layers by index so renaming one changes nothing
+        private readonly Dictionary<string, Dictionary<string, HashSet<Guid>>> fields = new Dictionary<string, Dictionary<string, HashSet<Guid>>>();
+        private readonly Dictionary<Guid, Dictionary<string, string>> entries = new Dictionary<Guid, Dictionary<string, string>>();
+        // Each field's values in order, for prefixes and ranges; dropped when a value is added or goes away
+        private readonly Dictionary<string, SortedValues> sorted = new Dictionary<string, SortedValues>();
+
+        private class SortedValues
+        {
+            public string[] Strings;
+            public double[] Numbers;
+            // The value of each number
+            public string[] NumberValues;
+        }
+
+        private class Node
+        {
+            public string Kind;
+            public List<Node> Children = new List<Node>();
+            public string Field;
+            // The indexed values a leaf matches
+            public HashSet<string> Values;
+            // The most objects the node can match, exact for leaves
+            public int Estimate;
+        }
+
+        public int Count => entries.Count;
+
+        /// <summary>
+        /// The ids of the objects of the document matching the query, the index is built on first use
+        /// </summary>
+        public List<Guid> Find(RhinoDoc doc, JObject query)
+        {
+            EnsureCurrent(doc);
+            return Select(Plan(query)).ToList();
+        }
+
+        protected override void Add(RhinoObject obj)
+        {
+            Add(obj.Id, obj.ObjectType, obj.Attributes);
+        }
+
+        protected override void Modify(RhinoObject obj, ObjectAttributes attributes)
+        {
+            if (entries.ContainsKey(obj.Id)) Add(obj.Id, obj.ObjectType, attributes);
+        }
+
+        protected override void Clear()
+        {
+            fields.Clear();
+            entries.Clear();
+            sorted.Clear();
+        }
+
+        private void Add(Guid id, ObjectType type, ObjectAttributes attributes)
+        {
+            var values = new Dictionary<string, string>
+            {
+                ["name"] = attributes.Name ?? "",
+                ["layer"] = attributes.LayerIndex.ToString(CultureInfo.InvariantCulture),
+                ["color"] = $"{attributes.ObjectColor.R},{attributes.ObjectColor.G},{attributes.ObjectColor.B}",
+                ["type"] = type.ToString()
+            };
+            var userStrings = attributes.GetUserStrings();
+            foreach (string key in userStrings.AllKeys) values[UserPrefix + key] = userStrings[key];
+
+            Remove(id);
+            entries[id] = values;
+            foreach (var value in values)
+            {
+                if (!fields.TryGetValue(value.Key, out var ids)) fields[value.Key] = ids = new Dictionary<string, HashSet<Guid>>();
+                if (!ids.TryGetValue(value.Value, out var set))
+                {
+                    ids[value.Value] = set = new HashSet<Guid>();
+                    sorted.Remove(value.Key);
+                }
+                set.Add(id);
+            }
+        }
+
+        protected override void Remove(Guid id)
+        {
+            if (!entries.TryGetValue(id, out var values)) return;
+            entries.Remove(id);
+            foreach (var value in values)
+            {
+                var ids = fields[value.Key];
+                ids[value.Value].Remove(id);
+                if (ids[value.Value].Count == 0)
+                {
+                    ids.Remove(value.Value);
+                    sorted.Remove(value.Key);
+                }
+            }
+        }
+
+        private Node Plan(JToken token)
+        {
+            if (!(token is JObject query)) throw new InvalidOperationException("A query must be an object");
+            foreach (string kind in new[] { "and", "or" })
+            {
+                if (query[kind] == null) continue;
+                if (!(query[kind] is JArray items) || items.Count == 0)
+                    throw new InvalidOperationException($"{kind} takes a list of queries");
+                var node = new Node { Kind = kind, Children = items.Select(Plan).OrderBy(child => child.Estimate).ToList() };
+                node.Estimate = kind == "and" ? node.Children[0].Estimate : Math.Min(entries.Count, node.Children.Sum(child => child.Estimate));
+                return node;
+            }
+            if (query["not"] != null)
+            {
+                Node child = Plan(query["not"]);
+                // Only a leaf's estimate is exact, the complement of an upper bound says nothing
+                int estimate = child.Kind == "leaf" ? entries.Count - child.Estimate : entries.Count;
+                return new Node { Kind = "not", Children = { child }, Estimate = estimate };
+            }
+
+            string field = query["field"]?.ToString();
+            if (string.IsNullOrEmpty(field)) throw new InvalidOperationException("A query needs and, or, not or a field");
+            if (query["range"] is JArray bounds && bounds.Any(bound => bound.Type != JTokenType.Null && bound.Type != JTokenType.Integer && bound.Type != JTokenType.Float))
+                throw new InvalidOperationException("range bounds must be numbers or null");
+            if (!Fields.Contains(field) && !field.StartsWith(UserPrefix)) field = UserPrefix + field;
+            fields.TryGetValue(field, out var values);
+            values = values ?? new Dictionary<string, HashSet<Guid>>();
+
+            HashSet<string> matching;
+            if ((query["eq"] != null || query["in"] != null) && field != "layer")
+            {
+                // Equality is a lookup, no need to look at every value
+                matching = new HashSet<string>(Wanted(query, field).Where(values.ContainsKey));
+            }
+            else if (query["prefix"] != null && field != "layer")
+            {
+                string prefix = query["prefix"].ToString();
+                string[] strings = Sorted(field, values).Strings;
+                int start = LowerBound(strings.Length, i => string.CompareOrdinal(strings[i], prefix) >= 0);
+                matching = new HashSet<string>(strings.Skip(start).TakeWhile(value => value.StartsWith(prefix, StringComparison.Ordinal)));
+            }
+            else if (query["range"] is JArray range && range.Count == 2 && field != "layer")
+            {
+                SortedValues numbers = Sorted(field, values);
+                double low = range[0].Type == JTokenType.Null ? double.NegativeInfinity : range[0].Value<double>();
+                double high = range[1].Type == JTokenType.Null ? double.PositiveInfinity : range[1].Value<double>();
+                int start = LowerBound(numbers.Numbers.Length, i => numbers.Numbers[i] >= low);
+                int end = LowerBound(numbers.Numbers.Length, i => numbers.Numbers[i] > high);
+                matching = new HashSet<string>(numbers.NumberValues.Skip(start).Take(end - start));
+            }
+            else
+            {
+                Func<string, bool> test = Test(query, field);
+                matching = new HashSet<string>(values.Keys.Where(test));
+            }
+            return new Node
+            {
+                Kind = "leaf",
+                Field = field,
+                Values = matching,
+                Estimate = matching.Sum(value => values[value].Count)
+            };
+        }
+
+        private SortedValues Sorted(string field, Dictionary<string, HashSet<Guid>> values)
+        {
+            if (sorted.TryGetValue(field, out var cached)) return cached;
+            string[] strings = values.Keys.ToArray();
+            Array.Sort(strings, StringComparer.Ordinal);
+            var numbers = new List<KeyValuePair<double, string>>();
+            foreach (string value in strings)
+            {
+                if (double.TryParse(value, NumberStyles.Float, CultureInfo.InvariantCulture, out double number) && !double.IsNaN(number))
+                    numbers.Add(new KeyValuePair<double, string>(number, value));
+            }
+            numbers.Sort((a, b) => a.Key.CompareTo(b.Key));
+            return sorted[field] = new SortedValues
+            {
+                Strings = strings,
+                Numbers = numbers.Select(pair => pair.Key).ToArray(),
+                NumberValues = numbers.Select(pair => pair.Value).ToArray()
+            };
+        }
+
+        // The first index for which the test holds, the test being false up to some index and true after it
+        private static int LowerBound(int count, Func<int, bool> test)
+        {
+            int low = 0, high = count;
+            while (low < high)
+            {
+                int middle = (low + high) / 2;
+                if (test(middle)) high = middle;
+                else low = middle + 1;
+            }
+            return low;
+        }
+
+        private static IEnumerable<string> Wanted(JObject leaf, string field)
+        {
+            IEnumerable<JToken> wanted = leaf["eq"] != null ? new[] { leaf["eq"] } : leaf["in"] as JArray
+                ?? throw new InvalidOperationException("in takes a list of values");
+            return wanted.Select(value => ValueKey(field, value));
+        }
+
+        // A query value as the string it is indexed by
+        private static string ValueKey(string field, JToken value)
+        {
+            if (field == "color")
+            {
+                int[] color = value.ToObject<int[]>();
+                return $"{color[0]},{color[1]},{color[2]}";
+            }
+            if (value.Type != JTokenType.Float && value.Type != JTokenType.Integer) return value.ToString();
+            // Numbers as user strings are usually written without a fraction when they have none
+            double number = value.Value<double>();
+            return number % 1 == 0 ? ((long)number).ToString(CultureInfo.InvariantCulture) : number.ToString(CultureInfo.InvariantCulture);
+        }
+
+        private Func<string, bool> Test(JObject leaf, string field)
+        {
+            Func<string, bool> test;
+            if (leaf["eq"] != null || leaf["in"] != null)
+            {
+                var wanted = new HashSet<string>(leaf["eq"] != null ? new[] { leaf["eq"].ToString() } : leaf["in"].Select(value => value.ToString()));
+                test = wanted.Contains;
+            }
+            else if (leaf["prefix"] != null)
+            {
+                string prefix = leaf["prefix"].ToString();
+                test = value => value.StartsWith(prefix, StringComparison.Ordinal);
+            }
+            else if (leaf["range"] is JArray range && range.Count == 2)
+            {
+                double? low = range[0].Type == JTokenType.Null ? (double?)null : range[0].Value<double>();
+                double? high = range[1].Type == JTokenType.Null ? (double?)null : range[1].Value<double>();
+                test = value => double.TryParse(value, NumberStyles.Float, CultureInfo.InvariantCulture, out double number)
+                    && (low == null || number >= low) && (high == null || number <= high);
+            }
+            else
+            {
+                throw new InvalidOperationException("A field needs one of eq, in, prefix or range");
+            }
+
+            if (field != "layer") return test;
+            // Layers are indexed by index and found by name or full path
+            return value =>
+            {
+                var layer = Document.Layers[int.Parse(value, CultureInfo.InvariantCulture)];
+                return layer != null && !layer.IsDeleted && (test(layer.Name) || test(layer.FullPath));
+            };
+        }
+
+        private HashSet<Guid> Select(Node node)
+        {
+            switch (node.Kind)
+            {
+                case "leaf":
+                    var ids = new HashSet<Guid>();
+                    foreach (string value in node.Values) ids.UnionWith(fields[node.Field][value]);
+                    return ids;
+                case "or":
+                    var union = new HashSet<Guid>();
+                    foreach (Node child in node.Children) union.UnionWith(Select(child));
+                    return union;
+                case "not":
+                    Node negated = node.Children[0];
+                    if (negated.Kind == "leaf" && Fields.Contains(negated.Field))
+                    {
+                        // Every object has these fields, so the others are those holding any other value
+                        var others = new HashSet<Guid>();
+                        foreach (var value in fields.TryGetValue(negated.Field, out var values) ? values : new Dictionary<string, HashSet<Guid>>())
+                        {
+                            if (!negated.Values.Contains(value.Key)) others.UnionWith(value.Value);
+                        }
+                        return others;
+                    }
+                    var rest = new HashSet<Guid>(entries.Keys);
+                    rest.ExceptWith(Select(negated));
+                    return rest;
+                default:
+                    // Start from the most selective part and only check what it leaves against the others
+                    var candidates = Select(node.Children[0]);
+                    candidates.RemoveWhere(id => !node.Children.Skip(1).All(child => Matches(child, id)));
+                    return candidates;
+            }
+        }
+
+        private bool Matches(Node node, Guid id)
+        {
+            switch (node.Kind)
+            {
+                case "leaf":
+                    return entries[id].TryGetValue(node.Field, out string value) && node.Values.Contains(value);
+                case "and":
+                    return node.Children.All(child => Matches(child, id));
+                case "or":
+                    return node.Children.Any(child => Matches(child, id));
+                default:
+                    return !Matches(node.Children[0], id);
+            }
+        }
+    }
+}
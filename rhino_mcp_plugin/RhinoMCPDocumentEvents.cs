@@ -0,0 +1,167 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using Newtonsoft.Json.Linq;
+using Rhino;
+using Rhino.DocObjects;
+using Rhino.DocObjects.Tables;
+using rhinomcp.Serializers;
+
+namespace RhinoMCPPlugin
+{
+    /// <summary>
+    /// Pushes changes of the document's object and layer tables to subscribed clients, so they can keep
+    /// a local replica instead of polling. Rhino raises these events on the UI thread, the same thread that
+    /// runs commands, so events and command replies reach a client in the order things happened.
+    /// </summary>
+    public class DocumentEventPublisher
+    {
+        private readonly List<ClientSession> subscribers = new List<ClientSession>();
+        private bool attached;
+
+        public JObject Subscribe(ClientSession session, JObject command)
+        {
+            JObject response;
+            if (!session.Events)
+            {
+                response = new JObject
+                {
+                    ["status"] = "error",
+                    ["message"] = "Document events were not negotiated"
+                };
+            }
+            else
+            {
+                lock (subscribers)
+                {
+                    if (!subscribers.Contains(session)) subscribers.Add(session);
+                }
+                // Objects are paged in with get_document_objects, layers are few enough to send right away
+                var layers = new JArray();
+                foreach (var layer in RhinoDoc.ActiveDoc.Layers)
+                {
+                    if (!layer.IsDeleted) layers.Add(Serializer.LayerSummary(layer));
+                }
+                response = new JObject
+                {
+                    ["status"] = "success",
+                    ["result"] = new JObject { ["layers"] = layers }
+                };
+                RhinoApp.WriteLine("Client subscribed to document events");
+            }
+            if (command["id"] != null) response["id"] = command["id"];
+            return response;
+        }
+
+        public void Unsubscribe(ClientSession session)
+        {
+            lock (subscribers)
+            {
+                subscribers.Remove(session);
+            }
+        }
+
+        public void Attach()
+        {
+            if (attached) return;
+            RhinoDoc.AddRhinoObject += OnObjectAdded;
+            RhinoDoc.UndeleteRhinoObject += OnObjectAdded;
+            RhinoDoc.DeleteRhinoObject += OnObjectDeleted;
+            RhinoDoc.ModifyObjectAttributes += OnObjectAttributesModified;
+            RhinoDoc.LayerTableEvent += OnLayerTableEvent;
+            RhinoDoc.NewDocument += OnDocumentReset;
+            RhinoDoc.EndOpenDocument += OnDocumentReset;
+            attached = true;
+        }
+
+        public void Detach()
+        {
+            if (!attached) return;
+            RhinoDoc.AddRhinoObject -= OnObjectAdded;
+            RhinoDoc.UndeleteRhinoObject -= OnObjectAdded;
+            RhinoDoc.DeleteRhinoObject -= OnObjectDeleted;
+            RhinoDoc.ModifyObjectAttributes -= OnObjectAttributesModified;
+            RhinoDoc.LayerTableEvent -= OnLayerTableEvent;
+            RhinoDoc.NewDocument -= OnDocumentReset;
+            RhinoDoc.EndOpenDocument -= OnDocumentReset;
+            attached = false;
+        }
+
+        private bool HasSubscribers
+        {
+            get
+            {
+                lock (subscribers)
+                {
+                    return subscribers.Count > 0;
+                }
+            }
+        }
+
+        // Replacing an object's geometry raises a delete and an add for the same id, so it needs no event of its own
+        private void OnObjectAdded(object sender, RhinoObjectEventArgs e)
+        {
+            if (HasSubscribers) Publish("object_added", Serializer.RhinoObjectSummary(e.TheObject));
+        }
+
+        private void OnObjectDeleted(object sender, RhinoObjectEventArgs e)
+        {
+            if (HasSubscribers) Publish("object_deleted", new JObject { ["id"] = e.ObjectId.ToString() });
+        }
+
+        private void OnObjectAttributesModified(object sender, RhinoModifyObjectAttributesEventArgs e)
+        {
+            if (HasSubscribers) Publish("object_modified", Serializer.RhinoObjectSummary(e.RhinoObject));
+        }
+
+        private void OnLayerTableEvent(object sender, LayerTableEventArgs e)
+        {
+            if (!HasSubscribers) return;
+            switch (e.EventType)
+            {
+                case LayerTableEventType.Added:
+                case LayerTableEventType.Undeleted:
+                    Publish("layer_added", Serializer.LayerSummary(e.NewState));
+                    break;
+                case LayerTableEventType.Deleted:
+                    Publish("layer_deleted", new JObject { ["id"] = e.OldState.Id.ToString() });
+                    break;
+                case LayerTableEventType.Modified:
+                    Publish("layer_modified", Serializer.LayerSummary(e.NewState));
+                    break;
+            }
+        }
+
+        private void OnDocumentReset(object sender, DocumentEventArgs e)
+        {
+            if (HasSubscribers) Publish("document_reset", new JObject());
+        }
+
+        private void Publish(string eventType, JObject data)
+        {
+            var message = new JObject
+            {
+                ["event"] = eventType,
+                ["data"] = data
+            };
+
+            List<ClientSession> sessions;
+            lock (subscribers)
+            {
+                sessions = subscribers.ToList();
+            }
+            foreach (var session in sessions)
+            {
+                try
+                {
+                    session.Send(message);
+                }
+                catch
+                {
+                    // The client is gone, its handler thread cleans up the rest
+                    Unsubscribe(session);
+                }
+            }
+        }
+    }
+}
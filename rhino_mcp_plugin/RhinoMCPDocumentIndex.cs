@@ -0,0 +1,72 @@
+using System;
+using Rhino;
+using Rhino.DocObjects;
+
+namespace RhinoMCPPlugin
+{
+    /// <summary>
+    /// Base of the indexes over the objects of a document. An index is built by its first query on a document
+    /// and kept current from then on by the document events, which Rhino raises on the UI thread that runs
+    /// queries too. Opening or starting another document drops it until the next query.
+    /// </summary>
+    public abstract class DocumentIndex
+    {
+        private bool attached;
+
+        protected RhinoDoc Document { get; private set; }
+
+        protected abstract void Add(RhinoObject obj);
+
+        protected abstract void Remove(Guid id);
+
+        protected abstract void Clear();
+
+        // Only needed by indexes of attributes, the object may still hold the old attributes while the event is raised
+        protected virtual void Modify(RhinoObject obj, ObjectAttributes attributes)
+        {
+        }
+
+        protected void EnsureCurrent(RhinoDoc doc)
+        {
+            Attach();
+            if (Document == doc) return;
+            Clear();
+            foreach (var obj in doc.Objects) Add(obj);
+            Document = doc;
+        }
+
+        private void Attach()
+        {
+            if (attached) return;
+            RhinoDoc.AddRhinoObject += OnObjectAdded;
+            RhinoDoc.UndeleteRhinoObject += OnObjectAdded;
+            RhinoDoc.DeleteRhinoObject += OnObjectDeleted;
+            RhinoDoc.ModifyObjectAttributes += OnObjectAttributesModified;
+            RhinoDoc.NewDocument += OnDocumentReset;
+            RhinoDoc.EndOpenDocument += OnDocumentReset;
+            attached = true;
+        }
+
+        // Replacing an object's geometry raises a delete and an add for the same id
+        private void OnObjectAdded(object sender, RhinoObjectEventArgs e)
+        {
+            if (e.TheObject.Document == Document && !e.TheObject.IsInstanceDefinitionGeometry) Add(e.TheObject);
+        }
+
+        private void OnObjectDeleted(object sender, RhinoObjectEventArgs e)
+        {
+            if (e.TheObject.Document == Document) Remove(e.ObjectId);
+        }
+
+        private void OnObjectAttributesModified(object sender, RhinoModifyObjectAttributesEventArgs e)
+        {
+            if (e.Document == Document) Modify(e.RhinoObject, e.NewAttributes);
+        }
+
+        private void OnDocumentReset(object sender, DocumentEventArgs e)
+        {
+            Document = null;
+            Clear();
+        }
+    }
+}
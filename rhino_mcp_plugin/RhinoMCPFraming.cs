@@ -0,0 +1,221 @@
+using System;
+using System.IO;
+using System.IO.Compression;
+using System.Linq;
+using System.Net.Sockets;
+using System.Text;
+using Newtonsoft.Json;
+using Newtonsoft.Json.Linq;
+
+namespace RhinoMCPPlugin
+{
+    /// <summary>
+    /// Wire framing spoken with the MCP server.
+    /// Connections start in legacy framing (bare JSON documents back to back). A client can send a
+    /// "hello" command asking for length framing, where every message is prefixed by a 5 byte header:
+    /// a big-endian uint32 payload length followed by a uint8 flags field.
+    /// The hello also negotiates optional features: with "request_id" commands carry an "id" that is
+    /// echoed in their response, so clients can keep several commands in flight on one connection.
+    /// With "binary_arrays" point lists may be sent packed as base64 blocks, see Serializer.PackArray.
+    /// With "zlib" either side may compress large payloads, flagged with Compressed in the header.
+    /// With "events" a client may subscribe to document changes, which are then pushed to it as
+    /// {"event": ..., "data": ...} messages, see DocumentEventPublisher.
+    /// </summary>
+    public static class MessageFraming
+    {
+        public const int ProtocolVersion = 1;
+        public const string Legacy = "legacy";
+        public const string Length = "length";
+        public const string HelloCommand = "hello";
+        public const string SubscribeCommand = "subscribe_document_events";
+        public const int HeaderSize = 5;
+        public const string RequestIdFeature = "request_id";
+        public const string BinaryArraysFeature = "binary_arrays";
+        public const string ZlibFeature = "zlib";
+        public const string EventsFeature = "events";
+
+        public const byte Compressed = 0x01;
+        // Smaller payloads gain little from compression and would only cost time on the UI thread
+        public const int CompressionThreshold = 4096;
+
+        private static readonly string[] SupportedFramings = { Length };
+        private static readonly string[] SupportedFeatures = { RequestIdFeature, BinaryArraysFeature, ZlibFeature, EventsFeature };
+
+        public static JObject Negotiate(JObject parameters)
+        {
+            string framing = Legacy;
+            if (parameters["framing"] is JArray requested)
+            {
+                foreach (var candidate in requested)
+                {
+                    if (Array.IndexOf(SupportedFramings, candidate.ToString()) >= 0)
+                    {
+                        framing = candidate.ToString();
+                        break;
+                    }
+                }
+            }
+
+            // Legacy framing cannot tell concatenated commands apart, so it gets no extras
+            var features = new JArray();
+            if (framing != Legacy && parameters["features"] is JArray requestedFeatures)
+            {
+                foreach (var feature in requestedFeatures)
+                {
+                    if (Array.IndexOf(SupportedFeatures, feature.ToString()) >= 0) features.Add(feature.ToString());
+                }
+            }
+
+            return new JObject
+            {
+                ["protocol"] = ProtocolVersion,
+                ["framing"] = framing,
+                ["features"] = features
+            };
+        }
+
+        public static byte[] Encode(string json, string framing, bool compress = false)
+        {
+            byte[] payload = Encoding.UTF8.GetBytes(json);
+            if (framing != Length) return payload;
+
+            byte flags = 0;
+            if (compress && payload.Length >= CompressionThreshold)
+            {
+                using (var compressed = new MemoryStream())
+                {
+                    using (var zlib = new ZLibStream(compressed, CompressionLevel.Fastest))
+                    {
+                        zlib.Write(payload, 0, payload.Length);
+                    }
+                    payload = compressed.ToArray();
+                }
+                flags |= Compressed;
+            }
+
+            byte[] message = new byte[HeaderSize + payload.Length];
+            message[0] = (byte)(payload.Length >> 24);
+            message[1] = (byte)(payload.Length >> 16);
+            message[2] = (byte)(payload.Length >> 8);
+            message[3] = (byte)payload.Length;
+            message[4] = flags;
+            Buffer.BlockCopy(payload, 0, message, HeaderSize, payload.Length);
+            return message;
+        }
+
+        public static string Decode(byte flags, byte[] payload)
+        {
+            if ((flags & Compressed) != 0)
+            {
+                using (var zlib = new ZLibStream(new MemoryStream(payload), CompressionMode.Decompress))
+                using (var decompressed = new MemoryStream())
+                {
+                    zlib.CopyTo(decompressed);
+                    payload = decompressed.ToArray();
+                }
+            }
+            return Encoding.UTF8.GetString(payload);
+        }
+    }
+
+    /// <summary>
+    /// One client connection and what was negotiated for it.
+    /// </summary>
+    public class ClientSession
+    {
+        public ClientSession(NetworkStream stream)
+        {
+            Stream = stream;
+        }
+
+        public NetworkStream Stream { get; }
+        public string Framing { get; private set; } = MessageFraming.Legacy;
+        public bool PackArrays { get; private set; }
+        public bool Compress { get; private set; }
+        public bool Events { get; private set; }
+
+        /// <summary>
+        /// Switches to the framing and features of a hello reply, after the reply has been sent.
+        /// </summary>
+        public void Apply(JObject negotiated)
+        {
+            Framing = negotiated["framing"].ToString();
+            var features = negotiated["features"].Select(f => f.ToString()).ToList();
+            PackArrays = features.Contains(MessageFraming.BinaryArraysFeature);
+            Compress = features.Contains(MessageFraming.ZlibFeature);
+            Events = features.Contains(MessageFraming.EventsFeature);
+        }
+
+        public byte[] Encode(string json)
+        {
+            return MessageFraming.Encode(json, Framing, Compress);
+        }
+
+        /// <summary>
+        /// Writes one message. Replies and pushed events come from different threads, so writes are serialized.
+        /// </summary>
+        public void Send(JObject message)
+        {
+            byte[] bytes = Encode(JsonConvert.SerializeObject(message));
+            lock (Stream)
+            {
+                Stream.Write(bytes, 0, bytes.Length);
+            }
+        }
+    }
+
+    /// <summary>
+    /// Accumulates bytes read from the socket and hands out complete length-prefixed frames.
+    /// </summary>
+    public class FrameReader
+    {
+        private byte[] buffer = new byte[8192];
+        private int start;
+        private int end;
+
+        public void Append(byte[] data, int count)
+        {
+            if (end + count > buffer.Length)
+            {
+                int pending = end - start;
+                if (pending + count > buffer.Length)
+                {
+                    byte[] grown = new byte[Math.Max(buffer.Length * 2, pending + count)];
+                    Buffer.BlockCopy(buffer, start, grown, 0, pending);
+                    buffer = grown;
+                }
+                else
+                {
+                    Buffer.BlockCopy(buffer, start, buffer, 0, pending);
+                }
+                start = 0;
+                end = pending;
+            }
+
+            Buffer.BlockCopy(data, 0, buffer, end, count);
+            end += count;
+        }
+
+        public bool TryRead(out byte flags, out byte[] payload)
+        {
+            flags = 0;
+            payload = null;
+            if (end - start < MessageFraming.HeaderSize) return false;
+
+            int length = (buffer[start] << 24) | (buffer[start + 1] << 16) | (buffer[start + 2] << 8) | buffer[start + 3];
+            if (length < 0) throw new InvalidDataException("Frame length out of range");
+            if (end - start < MessageFraming.HeaderSize + length) return false;
+
+            flags = buffer[start + 4];
+            payload = new byte[length];
+            Buffer.BlockCopy(buffer, start + MessageFraming.HeaderSize, payload, 0, length);
+            start += MessageFraming.HeaderSize + length;
+            if (start == end)
+            {
+                start = 0;
+                end = 0;
+            }
+            return true;
+        }
+    }
+}
@@ -0,0 +1,69 @@
+using System;
+using System.Collections.Generic;
+
+namespace RhinoMCPPlugin
+{
+    /// <summary>
+    /// The results of paged commands, taken once by the first page and kept until the last one, so every
+    /// further page is a slice of them rather than another pass over the document. A cursor is
+    /// "snapshot:offset"; the few most recently used snapshots are kept, and a cursor of one that was
+    /// dropped, or of a plugin that was restarted, fails so the caller starts again from the first page.
+    /// </summary>
+    public class PageSnapshots<T>
+    {
+        private const int MaxSnapshots = 8;
+
+        private readonly Dictionary<string, List<T>> snapshots = new Dictionary<string, List<T>>();
+        // Least recently used first
+        private readonly LinkedList<string> order = new LinkedList<string>();
+
+        public class Page
+        {
+            public List<T> Items;
+            public string NextCursor;
+            // Of the whole snapshot
+            public int Count;
+        }
+
+        /// <summary>
+        /// The page starting at the cursor, or the first page of what take returns without one
+        /// </summary>
+        public Page Get(string cursor, int limit, Func<List<T>> take)
+        {
+            string key;
+            int offset;
+            List<T> items;
+            if (string.IsNullOrEmpty(cursor))
+            {
+                key = Guid.NewGuid().ToString("N");
+                offset = 0;
+                items = take();
+                snapshots[key] = items;
+                order.AddLast(key);
+                while (order.Count > MaxSnapshots) Drop(order.First.Value);
+            }
+            else
+            {
+                string[] parts = cursor.Split(':');
+                if (parts.Length != 2 || !int.TryParse(parts[1], out offset) || !snapshots.TryGetValue(parts[0], out items)
+                    || offset < 0 || offset > items.Count)
+                    throw new InvalidOperationException("The cursor has expired, start again from the first page");
+                key = parts[0];
+                order.Remove(key);
+                order.AddLast(key);
+            }
+
+            int end = Math.Min(offset + limit, items.Count);
+            var page = new Page { Items = items.GetRange(offset, end - offset), Count = items.Count };
+            if (end < items.Count) page.NextCursor = $"{key}:{end}";
+            else Drop(key);
+            return page;
+        }
+
+        private void Drop(string key)
+        {
+            snapshots.Remove(key);
+            order.Remove(key);
+        }
+    }
+}
@@ -33,6 +33,10 @@ namespace RhinoMCPPlugin
         private Thread serverThread;
         private readonly object lockObject = new object();
         private RhinoMCPFunctions handler;
+        private readonly DocumentEventPublisher documentEvents = new DocumentEventPublisher();
+        private const int MaxCompletedTokens = 1024;
+        private readonly Dictionary<string, JObject> completedTokens = new Dictionary<string, JObject>();
+        private readonly Queue<string> completedTokenOrder = new Queue<string>();
 
         public RhinoMCPServer(string host = "127.0.0.1", int port = 1999)
         {
@@ -64,6 +68,7 @@ namespace RhinoMCPPlugin
                 IPAddress ipAddress = IPAddress.Parse(host);
                 listener = new TcpListener(ipAddress, port);
                 listener.Start();
+                documentEvents.Attach();
 
                 // Start server thread
                 serverThread = new Thread(ServerLoop);
@@ -86,6 +91,8 @@ namespace RhinoMCPPlugin
                 running = false;
             }
 
+            documentEvents.Detach();
+
             // Close listener
             if (listener != null)
             {
@@ -172,12 +179,15 @@ namespace RhinoMCPPlugin
         {
             RhinoApp.WriteLine("Client handler started");
 
-            byte[] buffer = new byte[8192];
+            byte[] buffer = new byte[65536];
             string incompleteData = string.Empty;
+            FrameReader frames = new FrameReader();
+            ClientSession session = null;
 
             try
             {
                 NetworkStream stream = client.GetStream();
+                session = new ClientSession(stream);
 
                 while (IsRunning())
                 {
@@ -193,6 +203,18 @@ namespace RhinoMCPPlugin
                                 break;
                             }
 
+                            if (session.Framing == MessageFraming.Length)
+                            {
+                                // Frames carry their own length, so nothing is parsed until a message is complete
+                                frames.Append(buffer, bytesRead);
+                                while (frames.TryRead(out byte flags, out byte[] payload))
+                                {
+                                    JObject command = JObject.Parse(MessageFraming.Decode(flags, payload));
+                                    if (!TryHandleInline(session, command)) DispatchCommand(session, command);
+                                }
+                                continue;
+                            }
+
                             string data = Encoding.UTF8.GetString(buffer, 0, bytesRead);
                             incompleteData += data;
 
@@ -202,44 +224,21 @@ namespace RhinoMCPPlugin
                                 JObject command = JObject.Parse(incompleteData);
                                 incompleteData = string.Empty;
 
-                                // Execute command on Rhino's main thread
-                                RhinoApp.InvokeOnUiThread(new Action(() =>
+                                if (command["type"]?.ToString() == MessageFraming.HelloCommand)
                                 {
-                                    try
-                                    {
-                                        JObject response = ExecuteCommand(command);
-                                        string responseJson = JsonConvert.SerializeObject(response);
-
-                                        try
-                                        {
-                                            byte[] responseBytes = Encoding.UTF8.GetBytes(responseJson);
-                                            stream.Write(responseBytes, 0, responseBytes.Length);
-                                        }
-                                        catch
-                                        {
-                                            RhinoApp.WriteLine("Failed to send response - client disconnected");
-                                        }
-                                    }
-                                    catch (Exception e)
+                                    // Answer in the current framing, then switch to whatever was negotiated
+                                    JObject hello = MessageFraming.Negotiate(command["params"] as JObject ?? new JObject());
+                                    WriteResponse(session, new JObject
                                     {
-                                        RhinoApp.WriteLine($"Error executing command: {e.Message}");
-                                        try
-                                        {
-                                            JObject errorResponse = new JObject
-                                            {
-                                                ["status"] = "error",
-                                                ["message"] = e.Message
-                                            };
-
-                                            byte[] errorBytes = Encoding.UTF8.GetBytes(errorResponse.ToString());
-                                            stream.Write(errorBytes, 0, errorBytes.Length);
-                                        }
-                                        catch
-                                        {
-                                            // Ignore send errors
-                                        }
-                                    }
-                                }));
+                                        ["status"] = "success",
+                                        ["result"] = hello
+                                    });
+                                    session.Apply(hello);
+                                    RhinoApp.WriteLine($"Client switched to {session.Framing} framing");
+                                    continue;
+                                }
+
+                                if (!TryHandleInline(session, command)) DispatchCommand(session, command);
                             }
                             catch (JsonException)
                             {
@@ -265,6 +264,7 @@ namespace RhinoMCPPlugin
             }
             finally
             {
+                if (session != null) documentEvents.Unsubscribe(session);
                 try
                 {
                     client.Close();
@@ -277,6 +277,91 @@ namespace RhinoMCPPlugin
             }
         }
 
+        /// <summary>
+        /// Answers commands that do not touch the document directly on the client thread,
+        /// so a connection health check does not have to wait behind the UI thread.
+        /// </summary>
+        private bool TryHandleInline(ClientSession session, JObject command)
+        {
+            if (command["type"]?.ToString() != "ping") return false;
+
+            JObject response = new JObject
+            {
+                ["status"] = "success",
+                ["result"] = new JObject { ["pong"] = true }
+            };
+            if (command["id"] != null) response["id"] = command["id"];
+            WriteResponse(session, response);
+            return true;
+        }
+
+        private void DispatchCommand(ClientSession session, JObject command)
+        {
+            // The client stops waiting after "timeout" seconds; running the command later would
+            // change the document behind the back of a caller that already reported a failure
+            var received = System.Diagnostics.Stopwatch.StartNew();
+            double? timeout = command["timeout"]?.Value<double?>();
+
+            // Execute command on Rhino's main thread
+            RhinoApp.InvokeOnUiThread(new Action(() =>
+            {
+                try
+                {
+                    if (timeout.HasValue && received.Elapsed.TotalSeconds > timeout.Value)
+                    {
+                        string cmdType = command["type"]?.ToString();
+                        RhinoApp.WriteLine($"Skipping {cmdType}: its client gave up after {timeout.Value}s");
+                        JObject expired = new JObject
+                        {
+                            ["status"] = "error",
+                            ["message"] = $"Command {cmdType} timed out before execution"
+                        };
+                        if (command["id"] != null) expired["id"] = command["id"];
+                        WriteResponse(session, expired);
+                        return;
+                    }
+
+                    JObject response;
+                    Serializer.PackArrays = session.PackArrays;
+                    try
+                    {
+                        // Subscribing needs the session, which ordinary commands know nothing about
+                        response = command["type"]?.ToString() == MessageFraming.SubscribeCommand
+                            ? documentEvents.Subscribe(session, command)
+                            : ExecuteCommand(command);
+                    }
+                    finally
+                    {
+                        Serializer.PackArrays = false;
+                    }
+                    WriteResponse(session, response);
+                }
+                catch (Exception e)
+                {
+                    RhinoApp.WriteLine($"Error executing command: {e.Message}");
+                    JObject errorResponse = new JObject
+                    {
+                        ["status"] = "error",
+                        ["message"] = e.Message
+                    };
+                    if (command["id"] != null) errorResponse["id"] = command["id"];
+                    WriteResponse(session, errorResponse);
+                }
+            }));
+        }
+
+        private void WriteResponse(ClientSession session, JObject response)
+        {
+            try
+            {
+                session.Send(response);
+            }
+            catch
+            {
+                RhinoApp.WriteLine("Failed to send response - client disconnected");
+            }
+        }
+
         private JObject ExecuteCommand(JObject command)
         {
             try
@@ -288,17 +373,33 @@ namespace RhinoMCPPlugin
 
                 JObject result = ExecuteCommandInternal(cmdType, parameters);
 
+                // Echo the request id so pipelined responses can be matched to their command
+                if (command["id"] != null) result["id"] = command["id"];
+
                 RhinoApp.WriteLine("Command execution complete");
                 return result;
             }
             catch (Exception e)
             {
                 RhinoApp.WriteLine($"Error executing command: {e.Message}");
-                return new JObject
+                JObject errorResponse = new JObject
                 {
                     ["status"] = "error",
                     ["message"] = e.Message
                 };
+                if (command["id"] != null) errorResponse["id"] = command["id"];
+                return errorResponse;
+            }
+        }
+
+        private void RememberToken(string clientToken, JObject response)
+        {
+            // Only touched from the UI thread, so no locking is needed
+            completedTokens[clientToken] = (JObject)response.DeepClone();
+            completedTokenOrder.Enqueue(clientToken);
+            while (completedTokenOrder.Count > MaxCompletedTokens)
+            {
+                completedTokens.Remove(completedTokenOrder.Dequeue());
             }
         }
 
@@ -309,8 +410,12 @@ namespace RhinoMCPPlugin
             Dictionary<string, Func<JObject, JObject>> handlers = new Dictionary<string, Func<JObject, JObject>>
             {
                 ["get_document_info"] = this.handler.GetDocumentInfo,
+                ["get_document_objects"] = this.handler.GetDocumentObjects,
                 ["create_object"] = this.handler.CreateObject,
                 ["create_objects"] = this.handler.CreateObjects,
+                ["create_objects_columnar"] = this.handler.CreateObjectsColumnar,
+                ["create_block_definition"] = this.handler.CreateBlockDefinition,
+                ["create_block_instances"] = this.handler.CreateBlockInstances,
                 ["get_object_info"] = this.handler.GetObjectInfo,
                 ["get_selected_objects_info"] = this.handler.GetSelectedObjectsInfo,
                 ["delete_object"] = this.handler.DeleteObject,
@@ -318,6 +423,9 @@ namespace RhinoMCPPlugin
                 ["modify_objects"] = this.handler.ModifyObjects,
                 ["execute_rhinoscript_python_code"] = this.handler.ExecuteRhinoscript,
                 ["select_objects"] = this.handler.SelectObjects,
+                ["query_objects_in_box"] = this.handler.QueryObjectsInBox,
+                ["query_objects_within_radius"] = this.handler.QueryObjectsWithinRadius,
+                ["nearest_objects"] = this.handler.NearestObjects,
                 ["create_layer"] = this.handler.CreateLayer,
                 ["get_or_set_current_layer"] = this.handler.GetOrSetCurrentLayer,
                 ["delete_layer"] = this.handler.DeleteLayer,
@@ -329,16 +437,30 @@ namespace RhinoMCPPlugin
 
             if (handlers.TryGetValue(cmdType, out var handler))
             {
+                // A client that retries a creation or a transform after losing the reply sends the same token again
+                string clientToken = parameters["client_token"]?.ToString();
+                if (clientToken != null)
+                {
+                    parameters.Remove("client_token");
+                    if (completedTokens.TryGetValue(clientToken, out JObject previous))
+                    {
+                        RhinoApp.WriteLine($"Returning the result of an already completed {cmdType}");
+                        return (JObject)previous.DeepClone();
+                    }
+                }
+
                 var doc = RhinoDoc.ActiveDoc;
                 var record = doc.BeginUndoRecord("Run MCP command");
                 try
                 {
                     JObject result = handler(parameters);
-                    return new JObject
+                    JObject response = new JObject
                     {
                         ["status"] = "success",
                         ["result"] = result
                     };
+                    if (clientToken != null) RememberToken(clientToken, response);
+                    return response;
                 }
                 catch (Exception e)
                 {
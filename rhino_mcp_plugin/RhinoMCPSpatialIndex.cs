@@ -0,0 +1,122 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using Rhino;
+using Rhino.DocObjects;
+using Rhino.Geometry;
+
+namespace RhinoMCPPlugin
+{
+    /// <summary>
+    /// An R-tree of the bounding boxes of the document's objects, the boxes get_document_objects reports,
+    /// so spatial queries only look at the objects near the region asked about.
+    /// </summary>
+    public class SpatialIndex : DocumentIndex
+    {
+        public class Hit
+        {
+            public Guid Id;
+            public uint Serial;
+            // From the query point to the object's bounding box, zero inside it
+            public double Distance;
+        }
+
+        private class Entry
+        {
+            public int Element;
+            public uint Serial;
+            public BoundingBox Box;
+        }
+
+        private RTree tree = new RTree();
+        private readonly Dictionary<Guid, Entry> entries = new Dictionary<Guid, Entry>();
+        // The R-tree stores ints, these are handed out in order and never reused
+        private readonly Dictionary<int, Guid> elements = new Dictionary<int, Guid>();
+        private int nextElement;
+        // Covers every object, it only grows until the index is rebuilt
+        private BoundingBox extent = BoundingBox.Empty;
+
+        public List<Hit> InBox(RhinoDoc doc, BoundingBox box, bool contained)
+        {
+            EnsureCurrent(doc);
+            var hits = new List<Hit>();
+            tree.Search(box, (sender, e) =>
+            {
+                Guid id = elements[e.Id];
+                Entry entry = entries[id];
+                if (!contained || box.Contains(entry.Box, false)) hits.Add(new Hit { Id = id, Serial = entry.Serial });
+            });
+            return hits;
+        }
+
+        public List<Hit> WithinRadius(RhinoDoc doc, Point3d center, double radius)
+        {
+            EnsureCurrent(doc);
+            return Around(center, radius);
+        }
+
+        /// <summary>
+        /// The count objects nearest to the point, nearest first, found by searching a sphere that doubles
+        /// in radius until it holds enough of them
+        /// </summary>
+        public List<Hit> Nearest(RhinoDoc doc, Point3d point, int count, double maxDistance)
+        {
+            EnsureCurrent(doc);
+            if (count <= 0 || entries.Count == 0) return new List<Hit>();
+
+            // Far enough to reach every object, and a first guess of how far count objects are spread
+            double reach = extent.IsValid ? extent.GetCorners().Max(corner => corner.DistanceTo(point)) : 0;
+            double radius = extent.IsValid ? extent.ClosestPoint(point).DistanceTo(point) + extent.Diagonal.Length * Math.Pow((double)count / entries.Count, 1.0 / 3) : 0;
+            radius = Math.Min(Math.Max(radius, RhinoMath.ZeroTolerance), maxDistance);
+            while (true)
+            {
+                List<Hit> hits = Around(point, radius);
+                if (hits.Count >= count || radius >= maxDistance || radius >= reach)
+                    return hits.OrderBy(hit => hit.Distance).Take(count).ToList();
+                radius = Math.Min(radius * 2, maxDistance);
+            }
+        }
+
+        private List<Hit> Around(Point3d center, double radius)
+        {
+            var hits = new List<Hit>();
+            tree.Search(new Sphere(center, radius), (sender, e) =>
+            {
+                Guid id = elements[e.Id];
+                Entry entry = entries[id];
+                double distance = entry.Box.ClosestPoint(center).DistanceTo(center);
+                if (distance <= radius) hits.Add(new Hit { Id = id, Serial = entry.Serial, Distance = distance });
+            });
+            return hits;
+        }
+
+        protected override void Add(RhinoObject obj)
+        {
+            BoundingBox box = obj.Geometry.GetBoundingBox(true);
+            if (!box.IsValid) return;
+            Remove(obj.Id);
+            var entry = new Entry { Element = nextElement++, Serial = obj.RuntimeSerialNumber, Box = box };
+            tree.Insert(box, entry.Element);
+            entries[obj.Id] = entry;
+            elements[entry.Element] = obj.Id;
+            extent.Union(box);
+        }
+
+        protected override void Remove(Guid id)
+        {
+            if (!entries.TryGetValue(id, out Entry entry)) return;
+            tree.Remove(entry.Box, entry.Element);
+            entries.Remove(id);
+            elements.Remove(entry.Element);
+        }
+
+        protected override void Clear()
+        {
+            tree.Dispose();
+            tree = new RTree();
+            entries.Clear();
+            elements.Clear();
+            extent = BoundingBox.Empty;
+        }
+    }
+}
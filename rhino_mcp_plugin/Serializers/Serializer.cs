@@ -15,6 +15,15 @@ namespace rhinomcp.Serializers
     {
         public static RhinoDoc doc = RhinoDoc.ActiveDoc;
 
+        public const string PackedArrayKey = "__ndarray__";
+
+        /// <summary>
+        /// Whether point lists are written packed for the client whose command is running.
+        /// Set around each command by the socket server when the client negotiated "binary_arrays".
+        /// </summary>
+        [ThreadStatic]
+        public static bool PackArrays;
+
         public static JObject SerializeColor(Color color)
         {
             return new JObject()
@@ -35,14 +44,76 @@ namespace rhinomcp.Serializers
             };
         }
 
-        public static JArray SerializePoints(IEnumerable<Point3d> pts)
+        public static JToken SerializePoints(IEnumerable<Point3d> pts)
         {
+            if (PackArrays)
+            {
+                Point3d[] points = pts.ToArray();
+                double[] values = new double[points.Length * 3];
+                for (int i = 0; i < points.Length; i++)
+                {
+                    values[i * 3] = Math.Round(points[i].X, 2);
+                    values[i * 3 + 1] = Math.Round(points[i].Y, 2);
+                    values[i * 3 + 2] = Math.Round(points[i].Z, 2);
+                }
+                return PackArray(values, points.Length, 3);
+            }
+
             return new JArray
             {
                 pts.Select(p => SerializePoint(p))
             };
         }
 
+        /// <summary>
+        /// Packs a row-major array of doubles as {"__ndarray__": base64, "dtype": "&lt;f8", "shape": [rows, columns]}.
+        /// </summary>
+        public static JObject PackArray(double[] values, int rows, int columns)
+        {
+            byte[] bytes = new byte[values.Length * sizeof(double)];
+            Buffer.BlockCopy(values, 0, bytes, 0, bytes.Length);
+            if (!BitConverter.IsLittleEndian) ReverseEach(bytes, sizeof(double));
+            return new JObject
+            {
+                [PackedArrayKey] = Convert.ToBase64String(bytes),
+                ["dtype"] = "<f8",
+                ["shape"] = new JArray { rows, columns }
+            };
+        }
+
+        /// <summary>
+        /// Unpacks a packed 2D array of little-endian float64 ("&lt;f8") or float32 ("&lt;f4") values into rows.
+        /// </summary>
+        public static double[][] UnpackArray2D(JObject packed)
+        {
+            byte[] bytes = Convert.FromBase64String(packed[PackedArrayKey].ToString());
+            string dtype = packed["dtype"]?.ToString() ?? "<f8";
+            int size = dtype == "<f4" ? sizeof(float) : dtype == "<f8" ? sizeof(double) : throw new InvalidOperationException($"Unsupported dtype {dtype}");
+            if (!BitConverter.IsLittleEndian) ReverseEach(bytes, size);
+
+            int count = bytes.Length / size;
+            int[] shape = packed["shape"]?.ToObject<int[]>() ?? new[] { count / 3, 3 };
+            int columns = shape.Length > 1 ? shape[1] : 1;
+            if (shape[0] * columns != count) throw new InvalidOperationException("Packed array shape does not match its data");
+
+            double[][] rows = new double[shape[0]][];
+            for (int i = 0; i < shape[0]; i++)
+            {
+                rows[i] = new double[columns];
+                for (int j = 0; j < columns; j++)
+                {
+                    int offset = (i * columns + j) * size;
+                    rows[i][j] = size == sizeof(float) ? BitConverter.ToSingle(bytes, offset) : BitConverter.ToDouble(bytes, offset);
+                }
+            }
+            return rows;
+        }
+
+        private static void ReverseEach(byte[] bytes, int size)
+        {
+            for (int offset = 0; offset < bytes.Length; offset += size) Array.Reverse(bytes, offset, size);
+        }
+
         public static JObject SerializeCurve(Curve crv)
         {
             return new JObject
@@ -76,6 +147,36 @@ namespace rhinomcp.Serializers
             };
         }
 
+        public static readonly string[] SummaryFields = { "id", "name", "type", "layer", "color", "bounding_box" };
+
+        /// <summary>
+        /// The cheap per-object fields used for listings and document events, limited to the given fields.
+        /// </summary>
+        public static JObject RhinoObjectSummary(RhinoObject obj, ICollection<string> fields = null)
+        {
+            var doc = obj.Document ?? RhinoDoc.ActiveDoc;
+            var data = new JObject();
+            if (fields == null || fields.Contains("id")) data["id"] = obj.Id.ToString();
+            if (fields == null || fields.Contains("name")) data["name"] = obj.Name ?? "(unnamed)";
+            if (fields == null || fields.Contains("type")) data["type"] = obj.ObjectType.ToString();
+            if (fields == null || fields.Contains("layer")) data["layer"] = doc.Layers[obj.Attributes.LayerIndex].Name;
+            if (fields == null || fields.Contains("color")) data["color"] = SerializeColor(obj.Attributes.ObjectColor);
+            if (fields == null || fields.Contains("bounding_box")) data["bounding_box"] = SerializeBBox(obj.Geometry.GetBoundingBox(true));
+            return data;
+        }
+
+        public static JObject LayerSummary(Layer layer)
+        {
+            return new JObject
+            {
+                ["id"] = layer.Id.ToString(),
+                ["name"] = layer.Name,
+                ["color"] = layer.Color.ToString(),
+                ["visible"] = layer.IsVisible,
+                ["locked"] = layer.IsLocked
+            };
+        }
+
         public static JObject RhinoObjectAttributes(RhinoObject obj)
         {
             var attributes = obj.Attributes.GetUserStrings();
@@ -0,0 +1,281 @@
+"""End-to-end throughput and latency of commands and MCP tools.
+
+Runs against the in-process FakeRhinoServer, so no Rhino is needed:
+
+    python benchmarks/bench_commands.py --output before.json
+    python benchmarks/bench_commands.py --output after.json
+    python benchmarks/compare.py before.json after.json
+
+Every scenario is measured for each document or batch size and each number
+of concurrent callers. ``command:*`` scenarios call ``send_command`` on the
+pool the tools use, ``tool:*`` scenarios go through ``FastMCP.call_tool``
+including argument validation and result formatting.
+
+Each case runs in a fresh process, so its peak RSS belongs to that case
+alone; the fake server lives in this process and is not counted. The JSON
+report has p50/p95/p99 latency, operations and objects per second, bytes on
+the wire and peak RSS per case, in a stable order that diffs well.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List
+
+from rhinomcp.fake_rhino import FakeRhinoServer
+
+DEFAULT_SIZES = [1, 100, 10000, 100000]
+DEFAULT_CONCURRENCY = [1, 8, 64]
+
+
+@dataclass
+class Scenario:
+    """One kind of operation; ``run`` performs it once and returns the number of objects it covered"""
+    name: str
+    run: Callable[[int, str], Awaitable[int]]
+    seeded: bool = False  # whether the document starts with ``size`` objects
+    sized: bool = True  # whether ``size`` changes the operation at all
+
+
+def _points(size: int, prefix: str) -> Dict[str, Dict[str, Any]]:
+    return {f"{prefix}-{i}": {"type": "POINT", "name": f"{prefix}-{i}", "params": {"x": i, "y": 0, "z": 0}} for i in range(size)}
+
+
+async def _command(command_type: str, params: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    from rhinomcp.pool import get_async_rhino_connection
+
+    rhino = await get_async_rhino_connection()
+    return await rhino.send_command(command_type, params or {})
+
+
+async def _tool(name: str, arguments: Dict[str, Any]) -> str:
+    from rhinomcp.server import mcp
+
+    content = await mcp.call_tool(name, arguments)
+    text = "".join(getattr(item, "text", "") for item in content)
+    if text.startswith("Error") or '"success": false' in text:
+        # The tools report failures as text instead of raising
+        raise RuntimeError(text[:200])
+    return text
+
+
+async def _get_document_info(size: int, tag: str) -> int:
+    return len((await _command("get_document_info"))["objects"])
+
+
+async def _get_document_objects(size: int, tag: str) -> int:
+    from rhinomcp.documents import iter_document_objects
+    from rhinomcp.pool import get_async_rhino_connection
+
+    count = 0
+    async for _obj in iter_document_objects(await get_async_rhino_connection()):
+        count += 1
+    return count
+
+
+async def _create_objects_command(size: int, tag: str) -> int:
+    return len(await _command("create_objects", _points(size, tag)))
+
+
+async def _create_object_tool(size: int, tag: str) -> int:
+    await _tool("create_object", {"type": "BOX", "name": tag, "params": {"width": 1, "length": 1, "height": 1}})
+    return 1
+
+
+async def _create_objects_tool(size: int, tag: str) -> int:
+    await _tool("create_objects", {"objects": list(_points(size, tag).values())})
+    return size
+
+
+async def _modify_objects_tool(size: int, tag: str) -> int:
+    # The fake's starting objects have predictable ids
+    objects = [{"id": str(uuid.UUID(int=i)), "translation": [0, 0, 1]} for i in range(size)]
+    await _tool("modify_objects", {"objects": objects})
+    return size
+
+
+async def _select_objects_tool(size: int, tag: str) -> int:
+    await _tool("select_objects", {"filters": {"name": ["Object 0"]}, "filters_type": "or"})
+    return size
+
+
+async def _get_document_info_tool(size: int, tag: str) -> int:
+    await _tool("get_document_info", {})
+    return min(size, 30)
+
+
+async def _execute_rhinoscript_tool(size: int, tag: str) -> int:
+    await _tool("execute_rhinoscript_python_code", {"code": "import rhinoscriptsyntax as rs\nrs.AddPoint(0, 0, 0)"})
+    return 0
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario("command:get_document_info", _get_document_info, seeded=True),
+        Scenario("command:get_document_objects", _get_document_objects, seeded=True),
+        Scenario("command:create_objects", _create_objects_command),
+        Scenario("tool:create_object", _create_object_tool, sized=False),
+        Scenario("tool:create_objects", _create_objects_tool),
+        Scenario("tool:modify_objects", _modify_objects_tool, seeded=True),
+        Scenario("tool:select_objects", _select_objects_tool, seeded=True),
+        Scenario("tool:get_document_info", _get_document_info_tool, seeded=True),
+        Scenario("tool:execute_rhinoscript_python_code", _execute_rhinoscript_tool, sized=False),
+    ]
+}
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    if not samples:
+        return 0.0
+    return samples[min(int(fraction * len(samples)), len(samples) - 1)]
+
+
+async def _measure(scenario: Scenario, size: int, concurrency: int, operations: int, cache: bool) -> Dict[str, Any]:
+    from rhinomcp.pool import get_async_rhino_connection
+
+    rhino = await get_async_rhino_connection()
+    if not cache:
+        # Repeated reads would otherwise measure the cache instead of the round trip
+        rhino.cache.ttl = 0
+        rhino.coalesce = False
+    await scenario.run(size, "warmup")
+    before = rhino.transfer.as_dict()
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    objects = 0
+    remaining = iter(range(operations))
+
+    async def worker(index: int):
+        nonlocal objects
+        for operation in remaining:
+            started = time.perf_counter()
+            try:
+                objects += await scenario.run(size, f"w{index}-{operation}")
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    after = rhino.transfer.as_dict()
+    latencies.sort()
+    return {
+        "operations": operations,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "elapsed_s": round(elapsed, 4),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        "operations_per_s": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "objects_per_s": round(objects / elapsed, 2) if elapsed else 0.0,
+        "bytes": {key: after[key] - before[key] for key in ("bytes_sent_wire", "bytes_received_wire", "bytes_sent_raw", "bytes_received_raw")},
+        "pool": {key: value for key, value in rhino.stats().items() if key in ("created", "wait_max_s", "retries")},
+    }
+
+
+def _run_case(address, scenario_name: str, size: int, concurrency: int, operations: int, cache: bool) -> Dict[str, Any]:
+    """Measure one case, in a process of its own"""
+    logging.getLogger("RhinoMCPServer").setLevel(logging.WARNING)
+    import rhinomcp.pool
+
+    # The tools connect to the plugin's address, point them at the fake instead
+    rhinomcp.pool.RHINO_HOST, rhinomcp.pool.RHINO_PORT = address
+    result = asyncio.run(_measure(SCENARIOS[scenario_name], size, concurrency, operations, cache))
+    result["peak_rss_bytes"] = peak_rss()
+    return result
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes"""
+    try:
+        # Linux carries ru_maxrss over from the parent, the high water mark of our own memory is in here
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="objects in the document or batch")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY, help="concurrent callers")
+    parser.add_argument("--operations", type=int, default=20, help="operations per case, at least one per caller")
+    parser.add_argument("--max-objects", type=int, default=1_000_000, help="skip cases that would touch more objects than this")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of simulated UI-thread work per command")
+    parser.add_argument("--cache", action="store_true", help="keep the response cache and read coalescing on")
+    parser.add_argument("--output", help="write the report here instead of to stdout")
+    args = parser.parse_args()
+
+    logging.getLogger("RhinoMCPServer").setLevel(logging.WARNING)
+    spawn = multiprocessing.get_context("spawn")
+
+    results = []
+    for name in args.scenarios:
+        scenario = SCENARIOS[name]
+        sizes = sorted(set(args.sizes)) if scenario.sized else [1]
+        for size in sizes:
+            for concurrency in sorted(set(args.concurrency)):
+                operations = max(args.operations, concurrency)
+                case = {"scenario": name, "size": size, "concurrency": concurrency}
+                if size * operations > args.max_objects:
+                    results.append(dict(case, skipped=f"more than {args.max_objects} objects"))
+                    continue
+                print(f"{name} size={size} concurrency={concurrency}", file=sys.stderr)
+                document = size if scenario.seeded else 0
+                with FakeRhinoServer(object_count=document, latency=args.latency) as server:
+                    with spawn.Pool(1, maxtasksperchild=1) as pool:
+                        measured = pool.apply(_run_case, (server.address, name, size, concurrency, operations, args.cache))
+                results.append(dict(case, **measured))
+
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency_s": args.latency,
+            "cache": args.cache,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
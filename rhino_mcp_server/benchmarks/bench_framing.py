@@ -0,0 +1,88 @@
+"""Compare legacy and length framing on large get_document_info responses.
+
+Runs against the in-process FakeRhinoServer, so no Rhino is needed:
+
+    python benchmarks/bench_framing.py --objects 1000 10000 100000
+
+For every payload size it reports the end-to-end round trip with each
+framing, plus the client-side receive cost of splitting the response into
+8 KB chunks the way it arrives from the socket: the old "json.loads after
+every chunk" loop versus the incremental decoders.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+
+from rhinomcp.fake_rhino import FakeRhinoServer
+from rhinomcp.framing import FrameDecoder, LegacyDecoder, encode_frame
+from rhinomcp.server import RhinoConnection
+
+CHUNK_SIZE = 8192
+
+
+def reparse_every_chunk(payload: bytes) -> float:
+    """The receive loop used before framing: join and parse after each chunk"""
+    start = time.perf_counter()
+    chunks = []
+    for offset in range(0, len(payload), CHUNK_SIZE):
+        chunks.append(payload[offset:offset + CHUNK_SIZE])
+        try:
+            json.loads(b"".join(chunks).decode("utf-8"))
+            break
+        except json.JSONDecodeError:
+            continue
+    return time.perf_counter() - start
+
+
+def decode_chunks(decoder, payload: bytes) -> float:
+    start = time.perf_counter()
+    for offset in range(0, len(payload), CHUNK_SIZE):
+        for message in decoder.feed(payload[offset:offset + CHUNK_SIZE]):
+            json.loads(message[-1] if isinstance(message, tuple) else message)
+    return time.perf_counter() - start
+
+
+def round_trip(server: FakeRhinoServer, framing: str, repeat: int) -> float:
+    rhino = RhinoConnection(*server.address, framing=framing, cache_ttl=0)
+    rhino.connect()
+    timings = []
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rhino.send_command("get_document_info")
+            timings.append(time.perf_counter() - start)
+    finally:
+        rhino.disconnect()
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.getLogger("RhinoMCPServer").setLevel(logging.WARNING)
+
+    results = []
+    for count in args.objects:
+        with FakeRhinoServer(object_count=count, document_info_limit=None) as server:
+            payload = json.dumps(server.execute_command({"type": "get_document_info"})).encode("utf-8")
+            results.append({
+                "objects": count,
+                "bytes": len(payload),
+                "round_trip_legacy_s": round_trip(server, "legacy", args.repeat),
+                "round_trip_length_s": round_trip(server, "auto", args.repeat),
+                "receive_reparse_s": reparse_every_chunk(payload),
+                "receive_legacy_decoder_s": decode_chunks(LegacyDecoder(), payload),
+                "receive_length_decoder_s": decode_chunks(FrameDecoder(), encode_frame(payload)),
+            })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
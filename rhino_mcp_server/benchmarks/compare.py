@@ -0,0 +1,64 @@
+"""Compare two reports of bench_commands.py case by case.
+
+    python benchmarks/compare.py before.json after.json
+
+Prints latency percentiles, objects per second, bytes on the wire and peak
+RSS of both runs with the relative change; cases found in only one report
+are listed as such.
+"""
+
+import argparse
+import json
+from typing import Any, Dict, Tuple
+
+# (label, path into a case, whether bigger is better)
+METRICS = [
+    ("p50 ms", ("latency_ms", "p50"), False),
+    ("p95 ms", ("latency_ms", "p95"), False),
+    ("p99 ms", ("latency_ms", "p99"), False),
+    ("objects/s", ("objects_per_s",), True),
+    ("bytes received", ("bytes", "bytes_received_wire"), False),
+    ("bytes sent", ("bytes", "bytes_sent_wire"), False),
+    ("peak RSS", ("peak_rss_bytes",), False),
+]
+
+
+def load(path: str) -> Dict[Tuple[str, int, int], Dict[str, Any]]:
+    with open(path) as f:
+        report = json.load(f)
+    return {(case["scenario"], case["size"], case["concurrency"]): case for case in report["results"]}
+
+
+def lookup(case: Dict[str, Any], path: Tuple[str, ...]) -> float | None:
+    value: Any = case
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    before, after = load(args.before), load(args.after)
+    for key in sorted(set(before) | set(after)):
+        scenario, size, concurrency = key
+        print(f"{scenario} size={size} concurrency={concurrency}")
+        if key not in before or key not in after:
+            print(f"  only in {args.before if key in before else args.after}")
+            continue
+        for label, path, bigger_is_better in METRICS:
+            old, new = lookup(before[key], path), lookup(after[key], path)
+            if old is None or new is None:
+                continue
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            better = old and (new > old) == bigger_is_better and new != old
+            print(f"  {label:<15} {old:>14,.2f} {new:>14,.2f} {change:>9}{'  better' if better else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,30 @@ __version__ = "0.1.0"
 # Expose key classes and functions for easier imports
 from .static.rhinoscriptsyntax import rhinoscriptsyntax_json
 from .server import RhinoConnection, get_rhino_connection, mcp, logger
+from .errors import RhinoConnectionError, RhinoTimeoutError
+from .async_connection import AsyncRhinoConnection, run_sync
+from .retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+from .cache import ResponseCache
+from .timeouts import COMMAND_TIMEOUTS, deadline
+from .scheduler import CommandScheduler, bulk_allowance
+from .pool import RhinoConnectionPool, get_async_rhino_connection
+from .documents import iter_document_objects
+from .spatial import iter_objects_in_box, iter_objects_within_radius
+from .bulk import create_objects_in_chunks
+from .transforms import transform_matrices
+from .mirror import DocumentMirror
+from .recorder import TrafficRecorder, start_recording, stop_recording
 
 from .prompts.assert_general_strategy import asset_general_strategy
 
 from .tools.create_object import create_object
 from .tools.create_objects import create_objects
+from .tools.create_objects_columnar import create_objects_columnar
+from .tools.create_block_instances import create_block_instances
+from .tools.create_array import create_array
 from .tools.delete_object import delete_object
 from .tools.get_document_info import get_document_info
+from .tools.get_document_objects import get_document_objects
 from .tools.get_object_info import get_object_info
 from .tools.get_selected_objects_info import get_selected_objects_info
 from .tools.modify_object import modify_object
@@ -20,6 +37,10 @@ from .tools.execute_rhinoscript_python_code import execute_rhinoscript_python_co
 from .tools.get_rhinoscript_python_function_names import get_rhinoscript_python_function_names
 from .tools.get_rhinoscript_python_code_guide import get_rhinoscript_python_code_guide
 from .tools.select_objects import select_objects
+from .tools.query_objects_in_box import query_objects_in_box
+from .tools.query_objects_within_radius import query_objects_within_radius
+from .tools.nearest_objects import nearest_objects
 from .tools.create_layer import create_layer
 from .tools.get_or_set_current_layer import get_or_set_current_layer
-from .tools.delete_layer import delete_layer
\ No newline at end of file
+from .tools.delete_layer import delete_layer
+from .tools.get_server_metrics import get_server_metrics
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""Compact encoding of point arrays on the plugin socket.
+
+Point lists are the bulk of geometry payloads, and as nested JSON float lists
+they cost several times their binary size and most of the parse time on
+both ends. When the plugin grants the ``binary_arrays`` feature a point list
+travels as a base64 block of little-endian floats with its shape instead:
+
+    {"__ndarray__": "AAAAAAAA8D8...", "dtype": "<f8", "shape": [1000, 3]}
+
+The per-object columns of ``create_objects_columnar`` are packed the same
+way, one-dimensional columns included.
+
+NumPy arrays can be passed anywhere a list is expected. NumPy itself is
+optional: without it packing and unpacking fall back to the ``array`` module,
+and connections that did not negotiate the feature get plain lists.
+"""
+
+import base64
+import sys
+from array import array
+from typing import Any, Dict
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+ARRAY_KEY = "__ndarray__"
+
+# Parameters holding point lists, packed even when given as plain lists
+POINT_KEYS = {"points"}
+
+# Parameters holding a mapping of per-object columns, see ``create_objects_columnar``
+COLUMN_KEYS = {"columns"}
+
+# Columns of whole numbers below 256, exact at half the size as float32
+SMALL_COLUMNS = {"color"}
+
+# Only lists this long are worth packing, a few points read just as well as JSON
+MIN_PACKED_LENGTH = 8
+
+_TYPECODES = {"<f8": "d", "<f4": "f"}
+
+
+def pack_array(values: Any, dtype: str = "<f8") -> Dict[str, Any]:
+    """Pack a NumPy array or a rectangular nested list of numbers.
+
+    ``dtype`` is ``"<f8"`` (float64) or ``"<f4"`` (float32, half the bytes
+    at about seven significant digits).
+    """
+    if dtype not in _TYPECODES:
+        raise ValueError(f"Unsupported dtype {dtype}, expected one of {sorted(_TYPECODES)}")
+
+    if np is not None:
+        data = np.ascontiguousarray(values, dtype=dtype)
+        return {ARRAY_KEY: base64.b64encode(data.tobytes()).decode("ascii"), "dtype": dtype, "shape": list(data.shape)}
+
+    rows = list(values)
+    if rows and isinstance(rows[0], (list, tuple)):
+        shape = [len(rows), len(rows[0])]
+        if any(len(row) != shape[1] for row in rows):
+            raise ValueError("Cannot pack a ragged list")
+        flat = array(_TYPECODES[dtype], (value for row in rows for value in row))
+    else:
+        shape = [len(rows)]
+        flat = array(_TYPECODES[dtype], rows)
+    if sys.byteorder != "little":
+        flat.byteswap()
+    return {ARRAY_KEY: base64.b64encode(flat.tobytes()).decode("ascii"), "dtype": dtype, "shape": shape}
+
+
+def unpack_array(packed: Dict[str, Any], as_numpy: bool = False) -> Any:
+    """Turn a packed array back into nested lists, or a NumPy array with ``as_numpy``"""
+    dtype = packed.get("dtype", "<f8")
+    if dtype not in _TYPECODES:
+        raise ValueError(f"Unsupported dtype {dtype}")
+    raw = base64.b64decode(packed[ARRAY_KEY])
+    shape = packed.get("shape") or [len(raw) // array(_TYPECODES[dtype]).itemsize]
+
+    if as_numpy:
+        if np is None:
+            raise ImportError("as_numpy requires numpy to be installed")
+        return np.frombuffer(raw, dtype=dtype).reshape(shape)
+
+    flat = array(_TYPECODES[dtype])
+    flat.frombytes(raw)
+    if sys.byteorder != "little":
+        flat.byteswap()
+    values = flat.tolist()
+    if len(shape) == 1:
+        return values
+    width = shape[1]
+    return [values[i:i + width] for i in range(0, len(values), width)]
+
+
+def _is_point_list(value: Any) -> bool:
+    if not isinstance(value, list) or len(value) < MIN_PACKED_LENGTH:
+        return False
+    width = len(value[0]) if isinstance(value[0], (list, tuple)) else -1
+    return width > 0 and all(
+        isinstance(row, (list, tuple)) and len(row) == width
+        and all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in row)
+        for row in value
+    )
+
+
+def _is_number_column(value: Any) -> bool:
+    if isinstance(value, list) and len(value) >= MIN_PACKED_LENGTH and not isinstance(value[0], (list, tuple)):
+        return all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in value)
+    return _is_point_list(value)
+
+
+def _encode_columns(columns: Dict[str, Any]) -> Dict[str, Any]:
+    encoded = {}
+    for key, column in columns.items():
+        if np is not None and isinstance(column, np.ndarray):
+            numeric = column.ndim in (1, 2) and column.dtype.kind in "fiu"
+        else:
+            numeric = _is_number_column(column)
+        if numeric:
+            encoded[key] = pack_array(column, "<f4" if key in SMALL_COLUMNS else "<f8")
+        else:
+            encoded[key] = encode_arrays(column, True)
+    return encoded
+
+
+def encode_arrays(value: Any, binary: bool) -> Any:
+    """Prepare command parameters for the wire.
+
+    With ``binary`` NumPy arrays, long point lists and numeric columns are
+    packed; without it NumPy arrays become plain lists so they can be
+    serialized as JSON.
+    The parameters passed in are not modified.
+    """
+    if isinstance(value, dict):
+        encoded = {}
+        for key, item in value.items():
+            if binary and key in POINT_KEYS and _is_point_list(item):
+                encoded[key] = pack_array(item)
+            elif binary and key in COLUMN_KEYS and isinstance(item, dict):
+                encoded[key] = _encode_columns(item)
+            else:
+                encoded[key] = encode_arrays(item, binary)
+        return encoded
+    if isinstance(value, (list, tuple)):
+        return [encode_arrays(item, binary) for item in value]
+    if np is not None and isinstance(value, np.ndarray):
+        # Only point lists are read back as packed arrays by the plugin
+        if binary and value.ndim == 2 and value.dtype.kind in "fiu":
+            return pack_array(value)
+        return value.tolist()
+    if np is not None and isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def unpack_hook(obj: Dict[str, Any]) -> Any:
+    """``json.loads`` object hook that unpacks arrays into nested lists while parsing"""
+    if ARRAY_KEY in obj:
+        return unpack_array(obj)
+    return obj
+
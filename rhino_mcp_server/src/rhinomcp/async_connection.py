@@ -0,0 +1,478 @@
+"""Non-blocking connection to the Rhino plugin.
+
+The MCP tools run inside FastMCP's event loop, so talking to Rhino must never
+block it: a slow ``execute_rhinoscript_python_code`` would otherwise freeze
+every other request the server is handling. ``AsyncRhinoConnection`` speaks
+the same protocol as the plugin socket server on top of asyncio streams.
+
+Synchronous callers (the example scripts, ``RhinoConnection``) go through
+``run_sync``, which runs coroutines on a private background event loop.
+The tools do not use this class directly but a ``RhinoConnectionPool`` of
+them, see ``rhinomcp.pool``.
+"""
+
+import asyncio
+import atexit
+import contextvars
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Tuple, TypeVar
+
+from rhinomcp.arrays import encode_arrays, unpack_hook
+from rhinomcp.errors import RhinoConnectionError, RhinoTimeoutError
+from rhinomcp.framing import (
+    FEATURE_BINARY_ARRAYS,
+    FEATURE_EVENTS,
+    FEATURE_REQUEST_ID,
+    FEATURE_ZLIB,
+    FLAG_COMPRESSED,
+    FRAMING_LEGACY,
+    FRAMING_LENGTH,
+    HEADER,
+    HELLO_COMMAND,
+    LegacyDecoder,
+    decode_message,
+    encode_message,
+    frame_payload,
+    hello_params,
+    unpack_payload,
+)
+from rhinomcp.logs import lazy_summary, log
+from rhinomcp.metrics import METRICS
+from rhinomcp.timeouts import command_timeout
+
+logger = logging.getLogger("RhinoMCPServer")
+
+RHINO_HOST = "127.0.0.1"
+RHINO_PORT = 1999
+
+T = TypeVar("T")
+
+
+@dataclass
+class TransferStats:
+    """Byte counters of the traffic with Rhino.
+
+    ``*_raw`` counts serialized JSON, ``*_wire`` what actually crossed the
+    socket, so their ratio shows what compression saves.
+    """
+    messages_sent: int = 0
+    messages_received: int = 0
+    bytes_sent_raw: int = 0
+    bytes_sent_wire: int = 0
+    bytes_received_raw: int = 0
+    bytes_received_wire: int = 0
+    compressed_sent: int = 0
+    compressed_received: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class AsyncRhinoConnection:
+    """A connection to the Rhino plugin with awaitable commands.
+
+    Replies are read by a background task and matched to their command
+    through a table of pending futures. When the plugin grants the
+    ``request_id`` feature every command carries an id and any number of
+    callers can have commands in flight at once; otherwise commands are sent
+    one at a time and replies are matched in order.
+    """
+
+    def __init__(self, host: str, port: int, framing: str = "auto", transfer: TransferStats | None = None):
+        self.host = host
+        self.port = port
+        self.framing = framing  # "auto" asks the plugin for length framing, "legacy" never does
+        self.transfer = transfer or TransferStats()  # may be shared, e.g. by every connection of a pool
+        self.negotiated_framing = FRAMING_LEGACY
+        self.features: List[str] = []
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task | None = None
+        self._decoder = LegacyDecoder()
+        self._inbox: Deque[bytes] = deque()
+        self._pending: Dict[int | None, asyncio.Future] = {}
+        # Command type of each pending command, its reply is counted against it in ``METRICS``
+        self._pending_types: Dict[int | None, str] = {}
+        # Called with every document event the plugin pushes after a subscription
+        self.event_handlers: List[Callable[[Dict[str, Any]], None]] = []
+        self._request_ids = itertools.count(1)
+        self._connect_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        # Without request ids nothing correlates replies, so only one command may be in flight
+        self._serial_lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    @property
+    def multiplexed(self) -> bool:
+        """Whether replies carry the id of the command they answer"""
+        return FEATURE_REQUEST_ID in self.features
+
+    @property
+    def binary_arrays(self) -> bool:
+        """Whether point lists travel packed, see ``rhinomcp.arrays``"""
+        return FEATURE_BINARY_ARRAYS in self.features
+
+    @property
+    def compressed(self) -> bool:
+        """Whether large messages may be zlib compressed"""
+        return FEATURE_ZLIB in self.features
+
+    @property
+    def in_flight(self) -> int:
+        """Number of commands sent that have not been answered yet"""
+        return len(self._pending)
+
+    async def connect(self) -> bool:
+        """Connect to the Rhino addon socket server"""
+        async with self._connect_lock:
+            if self._writer is not None:
+                return True
+
+            try:
+                self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+                self._use_framing(FRAMING_LEGACY, [])
+                logger.info(f"Connected to Rhino at {self.host}:{self.port}")
+            except Exception as e:
+                logger.error(f"Failed to connect to Rhino: {str(e)}")
+                self._reader = self._writer = None
+                return False
+
+            if self.framing != FRAMING_LEGACY:
+                try:
+                    await asyncio.wait_for(self._negotiate_framing(), timeout=15.0)
+                except Exception as e:
+                    logger.error(f"Failed to negotiate framing with Rhino: {str(e)}")
+                    await self._close(ConnectionError(str(e)))
+                    return False
+
+            self._reader_task = asyncio.create_task(self._read_responses())
+            return True
+
+    async def disconnect(self):
+        """Disconnect from the Rhino addon"""
+        await self._close(ConnectionError("Disconnected from Rhino"))
+
+    async def _close(self, error: Exception):
+        """Close the socket and fail every command still waiting for a reply"""
+        writer, self._reader, self._writer = self._writer, None, None
+        reader_task, self._reader_task = self._reader_task, None
+        self._use_framing(FRAMING_LEGACY, [])
+
+        pending, self._pending = self._pending, {}
+        self._pending_types = {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+        if reader_task is not None and reader_task is not asyncio.current_task():
+            reader_task.cancel()
+        if writer is None:
+            return
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except Exception as e:
+            logger.error(f"Error disconnecting from Rhino: {str(e)}")
+
+    def _use_framing(self, mode: str, features: List[str]):
+        """Switch the receive side to the given framing, dropping anything buffered"""
+        self.negotiated_framing = mode
+        self.features = list(features)
+        self._decoder = LegacyDecoder()
+        self._inbox.clear()
+
+    async def _negotiate_framing(self):
+        """Ask the plugin for length framing and request ids.
+
+        Plugins that predate framing answer the hello command with an
+        "Unknown command type" error, in which case we stay on legacy framing.
+        """
+        hello = {"type": HELLO_COMMAND, "params": hello_params(
+            [FRAMING_LENGTH], [FEATURE_REQUEST_ID, FEATURE_BINARY_ARRAYS, FEATURE_ZLIB, FEATURE_EVENTS]
+        )}
+        data = encode_message(hello, FRAMING_LEGACY)
+        self._writer.write(data)
+        await self._writer.drain()
+        self.transfer.messages_sent += 1
+        self.transfer.bytes_sent_raw += len(data)
+        self.transfer.bytes_sent_wire += len(data)
+        response = decode_message(await self._receive_message())
+        if response.get("status") == "success":
+            result = response.get("result", {})
+            self._use_framing(result.get("framing", FRAMING_LEGACY), result.get("features", []))
+        logger.info(f"Using {self.negotiated_framing} framing with Rhino, features: {self.features}")
+
+    async def _receive_message(self) -> bytes:
+        """Receive the next complete message"""
+        try:
+            if self.negotiated_framing == FRAMING_LENGTH:
+                length, flags = HEADER.unpack(await self._reader.readexactly(HEADER.size))
+                payload = unpack_payload(flags, await self._reader.readexactly(length))
+                self._count_received(HEADER.size + length, len(payload), flags)
+                return payload
+
+            while not self._inbox:
+                chunk = await self._reader.read(65536)
+                if not chunk:
+                    if self._decoder.pending:
+                        raise ConnectionError("Incomplete JSON response received")
+                    raise ConnectionError("Connection closed before receiving any data")
+                self._inbox.extend(self._decoder.feed(chunk))
+            payload = self._inbox.popleft()
+            self._count_received(len(payload), len(payload), 0)
+            return payload
+        except asyncio.IncompleteReadError:
+            raise ConnectionError("Connection closed in the middle of a response")
+
+    def _count_received(self, wire: int, raw: int, flags: int):
+        self.transfer.messages_received += 1
+        self.transfer.bytes_received_wire += wire
+        self.transfer.bytes_received_raw += raw
+        if flags & FLAG_COMPRESSED:
+            self.transfer.compressed_received += 1
+
+    async def _read_responses(self):
+        """Resolve pending commands as their replies arrive"""
+        try:
+            while True:
+                response_data = await self._receive_message()
+                started = time.perf_counter()
+                try:
+                    response = decode_message(response_data, unpack_hook if self.binary_arrays else None)
+                except ValueError as e:
+                    logger.error(f"Invalid JSON response from Rhino: {str(e)}")
+                    logger.error(f"Raw response (first 200 bytes): {response_data[:200]}")
+                    raise ConnectionError(f"Invalid response from Rhino: {str(e)}")
+
+                if "event" in response:
+                    # Pushed by the plugin rather than a reply to anything
+                    self._dispatch_event(response)
+                    continue
+
+                request_id = response.pop("id", None)
+                if request_id is None and self._pending:
+                    # Old plugins do not echo ids but answer strictly in order
+                    request_id = next(iter(self._pending))
+                log(logger, logging.INFO, "Received %d bytes of data", len(response_data),
+                    id=request_id, bytes=len(response_data), status=response.get("status"))
+                future = self._pending.pop(request_id, None)
+                command_type = self._pending_types.pop(request_id, None)
+                if command_type is not None:
+                    metrics = METRICS.command(command_type)
+                    metrics.decode_seconds += time.perf_counter() - started
+                    metrics.response_bytes.observe(len(response_data))
+                if future is None:
+                    # The caller gave up waiting (timeout or cancellation)
+                    logger.warning(f"Dropping reply to abandoned command {request_id}")
+                elif not future.done():
+                    future.set_result(response)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Socket connection error: {str(e)}")
+            await self._close(ConnectionError(str(e)))
+
+    def _dispatch_event(self, event: Dict[str, Any]):
+        for handler in list(self.event_handlers):
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"Error handling {event.get('event')} event: {str(e)}")
+
+    async def _submit(
+        self, command_type: str, params: Dict[str, Any] | None, timeout: float
+    ) -> Tuple[int | None, asyncio.Future]:
+        """Write one command and register the future its reply will resolve.
+
+        With request ids the timeout travels along with the command, so the
+        plugin can skip a command that is no longer awaited when it gets to it.
+        """
+        if self._writer is None and not await self.connect():
+            raise RhinoConnectionError("Not connected to Rhino")
+
+        started = time.perf_counter()
+        command: Dict[str, Any] = {
+            "type": command_type,
+            "params": encode_arrays(params or {}, self.binary_arrays)
+        }
+        request_id = None
+        if self.multiplexed:
+            request_id = next(self._request_ids)
+            command["id"] = request_id
+            command["timeout"] = timeout
+
+        payload = json.dumps(command).encode("utf-8")
+        data = frame_payload(payload, self.negotiated_framing, self.compressed)
+        metrics = METRICS.command(command_type)
+        metrics.encode_seconds += time.perf_counter() - started
+        metrics.request_bytes.observe(len(payload))
+        future = asyncio.get_running_loop().create_future()
+        log(logger, logging.INFO, "Sending command: %s with params: %s", command_type, lazy_summary(params),
+            command=command_type, id=request_id, bytes=len(payload))
+        async with self._write_lock:
+            self._pending[request_id] = future
+            self._pending_types[request_id] = command_type
+            try:
+                self._writer.write(data)
+                await self._writer.drain()
+                self.transfer.messages_sent += 1
+                self.transfer.bytes_sent_raw += len(payload)
+                self.transfer.bytes_sent_wire += len(data)
+                if self.negotiated_framing == FRAMING_LENGTH and data[HEADER.size - 1] & FLAG_COMPRESSED:
+                    self.transfer.compressed_sent += 1
+            except (ConnectionError, OSError) as e:
+                self._pending.pop(request_id, None)
+                self._pending_types.pop(request_id, None)
+                logger.error(f"Socket connection error: {str(e)}")
+                await self._close(ConnectionError(str(e)))
+                raise RhinoConnectionError(f"Connection to Rhino lost: {str(e)}")
+        logger.debug("Command sent, waiting for response...")
+        return request_id, future
+
+    async def _wait(self, request_id: int | None, future: asyncio.Future, timeout: float) -> Dict[str, Any]:
+        """Wait for the reply to a submitted command and unwrap its result"""
+        try:
+            response = await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"No response from Rhino within {timeout:.1f}s")
+            self._pending_types.pop(request_id, None)
+            if self._pending.pop(request_id, None) is not None and not self.multiplexed:
+                # A late reply would be read as the answer to the next command, so start over
+                await self._close(ConnectionError("Timed out"))
+            raise RhinoTimeoutError(
+                f"Timeout waiting for Rhino response after {timeout:.1f}s - try simplifying your request"
+            )
+        except asyncio.CancelledError:
+            self._pending_types.pop(request_id, None)
+            if self._pending.pop(request_id, None) is not None and not self.multiplexed:
+                await self._close(ConnectionError("Cancelled"))
+            raise
+        except ConnectionError as e:
+            raise RhinoConnectionError(f"Connection to Rhino lost: {str(e)}")
+
+        logger.debug("Response parsed, status: %s", response.get("status", "unknown"))
+        if response.get("status") == "error":
+            logger.error(f"Rhino error: {response.get('message')}")
+            raise Exception(response.get("message", "Unknown error from Rhino"))
+
+        return response.get("result", {})
+
+    async def send_command(
+        self, command_type: str, params: Dict[str, Any] = {}, timeout: float | None = None
+    ) -> Dict[str, Any]:
+        """Send a command to Rhino and return the response.
+
+        ``timeout`` overrides the command's entry in ``COMMAND_TIMEOUTS``; an
+        enclosing ``deadline`` shortens either.
+        """
+        if self.multiplexed:
+            timeout = command_timeout(command_type, timeout)
+            return await self._wait(*await self._submit(command_type, params, timeout), timeout)
+
+        async with self._serial_lock:
+            # Time spent queued behind other callers counts against the deadline
+            timeout = command_timeout(command_type, timeout)
+            result = await self._wait(*await self._submit(command_type, params, timeout), timeout)
+        return result
+
+    async def send_commands(self, commands: Iterable[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any] | Exception]:
+        """Pipeline several commands and return their results in order.
+
+        All commands are written before waiting for the first reply, so a loop
+        of N commands pays the round trip latency once instead of N times. A
+        failed command yields its exception in place of a result rather than
+        aborting the others.
+        """
+        if not self.multiplexed:
+            results: List[Dict[str, Any] | Exception] = []
+            for command_type, params in commands:
+                try:
+                    results.append(await self.send_command(command_type, params))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+        submitted = []
+        for command_type, params in commands:
+            # A command that cannot be sent, say after the deadline or with the
+            # connection lost, fails in its place; those sent before it are still awaited
+            try:
+                timeout = command_timeout(command_type)
+                submitted.append((*await self._submit(command_type, params, timeout), timeout))
+            except Exception as e:
+                submitted.append(e)
+        return list(await asyncio.gather(
+            *(self._wait(*item) if isinstance(item, tuple) else _raise(item) for item in submitted),
+            return_exceptions=True,
+        ))
+
+
+async def _raise(error: Exception):
+    raise error
+
+
+_background_loop: asyncio.AbstractEventLoop | None = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(target=_background_loop.run_forever, name="rhinomcp-sync", daemon=True).start()
+            atexit.register(_stop_background_loop)
+        return _background_loop
+
+
+def _stop_background_loop():
+    """Cancel the connections' reader tasks so interpreter shutdown stays quiet"""
+    loop = _background_loop
+    if loop is None or not loop.is_running():
+        return
+
+    async def _cancel_tasks():
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    try:
+        asyncio.run_coroutine_threadsafe(_cancel_tasks(), loop).result(timeout=5)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+
+
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """Block until an awaitable, such as an async tool call, has finished.
+
+    For scripts that are not running an event loop of their own:
+
+        result = run_sync(create_object(Context(), type="BOX"))
+    """
+    loop = _get_background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        raise RuntimeError("run_sync cannot be called from the loop it runs on")
+
+    # Carry the caller's context variables over, so a ``deadline`` set around run_sync applies
+    context = contextvars.copy_context()
+
+    async def _await():
+        for variable, value in context.items():
+            variable.set(value)
+        return await awaitable
+
+    return asyncio.run_coroutine_threadsafe(_await(), loop).result()
@@ -0,0 +1,528 @@
+"""Creation of large numbers of objects in chunks.
+
+A single ``create_objects`` command with 100000 objects has to be built,
+sent and executed as a whole, and times out as a whole.
+``create_objects_in_chunks`` instead takes the objects from any iterable,
+generators included, cuts them into chunks of at most ``max_objects`` objects and ``max_bytes`` bytes
+of JSON, and keeps up to ``max_in_flight`` chunks on their way to Rhino:
+
+    async def grid():
+        for i in range(100000):
+            yield {"type": "POINT", "params": {"x": i % 100, "y": i // 100, "z": 0}}
+
+    results = await create_objects_in_chunks(pool, grid(), progress=report)
+
+The result of every object comes back in input order, as the object's
+information or ``{"error": ...}``. A chunk that fails as a whole, say by
+timing out, fails its own objects and not the others. Each chunk carries a
+``client_token``, so the pool can safely retry it after a lost reply.
+
+Chunks are sent with the object list form of ``create_objects``. Plugins
+that predate it get the objects keyed by their position instead, since
+keying them by name dropped unnamed and duplicate-named objects.
+
+Many objects of one type that only differ in a few numbers are cheaper to
+send as columns. ``create_objects_columnar`` takes those numbers as parallel
+arrays, one row per object, and sends the values all objects share once:
+
+    results = await create_objects_columnar(
+        pool, "SPHERE", params={"radius": radii}, translations=centers, colors=[255, 0, 0]
+    )
+
+Columns travel as packed binary arrays, so an object costs a few dozen bytes
+on the wire instead of a few hundred of JSON, and the plugin parses one array
+per column rather than a JSON object per object.
+
+Identical objects are cheaper still as instances of a block:
+``create_block_instances`` defines the block's geometry once and then only
+sends a transform per instance, in the same columns.
+"""
+
+import asyncio
+import json
+import uuid
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from rhinomcp.arrays import POINT_KEYS
+from rhinomcp.retry import CLIENT_TOKEN
+from rhinomcp.scheduler import BULK, bulk_allowance
+
+MAX_CHUNK_OBJECTS = 500
+MAX_CHUNK_BYTES = 1024 * 1024
+
+# A columnar object costs a few dozen bytes, so its chunks can be much longer
+MAX_COLUMNAR_CHUNK = 5000
+
+# create_object params holding one [x, y, z] point
+VECTOR_PARAMS = {"start", "end", "center"}
+
+Progress = Callable[[int, int | None], Awaitable[None]]
+
+
+async def _aiter(items: Iterable[Any] | AsyncIterable[Any]) -> AsyncIterator[Any]:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def chunk_specs(
+    specs: Iterable[Dict[str, Any]] | AsyncIterable[Dict[str, Any]],
+    max_objects: int = MAX_CHUNK_OBJECTS,
+    max_bytes: int = MAX_CHUNK_BYTES,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Group object specs into lists of at most ``max_objects`` and ``max_bytes`` of JSON.
+
+    An object larger than ``max_bytes`` on its own gets a chunk of its own.
+    """
+    chunk: List[Dict[str, Any]] = []
+    size = 0
+    async for spec in _aiter(specs):
+        spec_size = len(json.dumps(spec)) + 1
+        if chunk and (len(chunk) >= max_objects or size + spec_size > max_bytes):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(spec)
+        size += spec_size
+    if chunk:
+        yield chunk
+
+
+def _unpack(chunk: List[Dict[str, Any]], result: Dict[str, Any]) -> List[Dict[str, Any]] | None:
+    """The per-object results of a list form reply, or None if the plugin does not know that form"""
+    results = result.get("objects")
+    if isinstance(results, list) and len(results) == len(chunk):
+        return results
+    return None
+
+
+def _is_legacy_error(message: Any) -> bool:
+    """Whether an error is that of a plugin without the list form, which
+    casts the list to the parameters of a single object and fails"""
+    return isinstance(message, str) and "Unable to cast" in message and "JArray" in message
+
+
+async def _create_chunk(rhino, chunk: List[Dict[str, Any]], timeout: float | None, legacy: List[bool]) -> List[Dict[str, Any]]:
+    if not legacy[0]:
+        try:
+            result = await rhino.send_command(
+                "create_objects", {"objects": chunk, CLIENT_TOKEN: uuid.uuid4().hex}, timeout=timeout, priority=BULK
+            )
+        except Exception as e:
+            if not _is_legacy_error(str(e)):
+                raise
+            result = {"objects": {"error": str(e)}}
+        results = _unpack(chunk, result)
+        if results is not None:
+            return results
+        # An older plugin answers the object it failed to create as "objects",
+        # having created nothing, and gets the objects keyed by position instead
+        answer = result.get("objects")
+        if not (isinstance(answer, dict) and _is_legacy_error(answer.get("error"))):
+            raise Exception(f"Rhino did not answer each of the {len(chunk)} objects")
+        legacy[0] = True
+
+    params: Dict[str, Any] = {str(index): spec for index, spec in enumerate(chunk)}
+    params[CLIENT_TOKEN] = uuid.uuid4().hex
+    result = await rhino.send_command("create_objects", params, timeout=timeout, priority=BULK)
+    return [result.get(str(index), {"error": "No result from Rhino"}) for index in range(len(chunk))]
+
+
+async def _pipeline(
+    chunks: Iterable[Tuple[int, Any]] | AsyncIterable[Tuple[int, Any]],
+    create: Callable[[Any], Awaitable[List[Dict[str, Any]]]],
+    max_in_flight: int,
+    total: int | None,
+    progress: Progress | None,
+) -> List[Dict[str, Any]]:
+    """Send ``(size, chunk)`` pairs through ``create``, keeping ``max_in_flight`` of them
+    unanswered, and return the per-object results in input order.
+
+    The chunks are bulk commands, which the pool's scheduler sends one at a
+    time unless told otherwise, so they are sent inside a ``bulk_allowance``
+    of ``max_in_flight``.
+    """
+    results: List[Dict[str, Any] | None] = []
+    done = 0
+    slots = asyncio.Semaphore(max_in_flight)
+    tasks: List[asyncio.Task] = []
+
+    async def send(start: int, size: int, chunk: Any):
+        nonlocal done
+        try:
+            chunk_results = await create(chunk)
+        except Exception as e:
+            chunk_results = [{"error": str(e)} for _index in range(size)]
+        finally:
+            slots.release()
+        results[start:start + size] = chunk_results
+        done += size
+        if progress is not None:
+            await progress(done, total)
+
+    try:
+        async for size, chunk in _aiter(chunks):
+            await slots.acquire()
+            start = len(results)
+            results.extend([None] * size)
+            with bulk_allowance(max_in_flight):
+                # The task takes the allowance along in its copy of the context
+                tasks.append(asyncio.create_task(send(start, size, chunk)))
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return results
+
+
+async def create_objects_in_chunks(
+    rhino,
+    specs: Iterable[Dict[str, Any]] | AsyncIterable[Dict[str, Any]],
+    max_objects: int = MAX_CHUNK_OBJECTS,
+    max_bytes: int = MAX_CHUNK_BYTES,
+    max_in_flight: int = 4,
+    timeout: float | None = None,
+    progress: Progress | None = None,
+) -> List[Dict[str, Any]]:
+    """Create the objects ``specs`` describe and return their results in input order.
+
+    Parameters:
+    - rhino: The ``RhinoConnectionPool`` to send the chunks through.
+    - specs: Object specs as taken by the ``create_object`` command.
+    - max_objects, max_bytes: Budget of a chunk.
+    - max_in_flight: Chunks sent and not answered yet at any time.
+    - timeout: Seconds to wait for each chunk, see ``rhinomcp.timeouts``.
+    - progress: Awaited with the number of objects done and the total, when
+      known, after every chunk.
+    """
+    total = len(specs) if hasattr(specs, "__len__") else None
+    legacy = [False]
+
+    async def create(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await _create_chunk(rhino, chunk, timeout, legacy)
+
+    chunks = ((len(chunk), chunk) async for chunk in chunk_specs(specs, max_objects, max_bytes))
+    return await _pipeline(chunks, create, max_in_flight, total, progress)
+
+
+def _ndim(value: Any) -> int:
+    """Dimensions of a NumPy array, number, or nested list judged by its first items"""
+    ndim = getattr(value, "ndim", None)
+    if ndim is not None:
+        return ndim
+    depth = 0
+    while isinstance(value, (list, tuple)):
+        depth += 1
+        if not value:
+            break
+        value = value[0]
+    return depth
+
+
+def _split_rows(
+    values: Dict[str, Any], shared: Dict[str, Any], columns: Dict[str, Sequence[Any]], row_ndim: Callable[[str], int]
+):
+    """Put each value in ``columns`` if it has one row per object, in ``shared`` otherwise.
+
+    ``row_ndim`` gives the dimensions of one object's value, 0 for a number
+    and 1 for ``[x, y, z]``.
+    """
+    for key, value in values.items():
+        if value is None:
+            continue
+        if _ndim(value) > row_ndim(key):
+            columns[key] = value
+        else:
+            shared[key] = value
+
+
+def _row_count(
+    command: Dict[str, Any], columns: Dict[str, Sequence[Any]], names: str | Sequence[str] | None, count: int | None
+) -> Tuple[Sequence[str] | None, int]:
+    """Check that every column has ``count`` rows, or take the count from them.
+
+    A single name is shared, it is moved into ``command`` and None is returned in place of the names.
+    """
+    if isinstance(names, str):
+        command["name"] = names
+        names = None
+
+    lengths = {key: len(column) for key, column in columns.items()}
+    if names is not None:
+        lengths["names"] = len(names)
+    if count is None:
+        if not lengths:
+            raise ValueError("count is required when no parameter differs between objects")
+        count = next(iter(lengths.values()))
+    for key, length in lengths.items():
+        if length != count:
+            raise ValueError(f"{key} has {length} rows for {count} objects")
+    return names, count
+
+
+def _column_chunks(
+    command: Dict[str, Any], columns: Dict[str, Sequence[Any]], count: int, chunk_size: int, **lists: Sequence[Any] | None
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Slice the columns, and ``lists`` such as the names, into commands of ``chunk_size`` rows"""
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        chunk = dict(command, count=stop - start, columns={key: column[start:stop] for key, column in columns.items()})
+        for key, values in lists.items():
+            if values is not None:
+                chunk[key] = list(values[start:stop])
+        yield stop - start, chunk
+
+
+async def _create_columnar_chunk(
+    rhino, command_type: str, command: Dict[str, Any], timeout: float | None, replies: List[Dict[str, Any]] | None = None
+) -> List[Dict[str, Any]]:
+    result = await rhino.send_command(
+        command_type, dict(command, **{CLIENT_TOKEN: uuid.uuid4().hex}), timeout=timeout, priority=BULK
+    )
+    ids = result.get("ids")
+    if not isinstance(ids, list) or len(ids) != command["count"]:
+        raise ValueError(f"Rhino returned no ids for {command['count']} objects")
+    if replies is not None:
+        replies.append(result)
+    results: List[Dict[str, Any]] = [{"id": object_id} for object_id in ids]
+    for error in result.get("errors") or []:
+        results[error["index"]] = {"error": error["error"]}
+    return results
+
+
+async def create_objects_columnar(
+    rhino,
+    object_type: str,
+    params: Dict[str, Any] | None = None,
+    translations: Any = None,
+    rotations: Any = None,
+    scales: Any = None,
+    colors: Any = None,
+    names: str | Sequence[str] | None = None,
+    count: int | None = None,
+    chunk_size: int = MAX_COLUMNAR_CHUNK,
+    max_in_flight: int = 4,
+    timeout: float | None = None,
+    progress: Progress | None = None,
+) -> List[Dict[str, Any]]:
+    """Create ``count`` objects of one type from parallel arrays, and return their
+    results in input order as ``{"id": ...}`` or ``{"error": ...}``.
+
+    Every argument is either shared by all objects or has one row per object,
+    as a NumPy array or a list:
+
+    - params: The ``create_object`` params of ``object_type``. A number is
+      shared and a list of numbers has one per object; ``start``, ``end`` and
+      ``center`` are shared as ``[x, y, z]`` and per object as ``[[x, y, z], ...]``.
+      ``points`` is always shared.
+    - translations, rotations, scales: ``[x, y, z]`` or one per object.
+    - colors: ``[r, g, b]`` or one per object.
+    - names: One name for all objects or one per object.
+    - count: Number of objects, only needed when nothing differs between them.
+
+    The rows are sent in chunks of ``chunk_size`` objects, packed as binary
+    arrays when the plugin supports them. Other parameters are as for
+    ``create_objects_in_chunks``.
+    """
+    command: Dict[str, Any] = {"type": object_type, "params": {}}
+    columns: Dict[str, Sequence[Any]] = {}
+    params = dict(params or {})
+    for key in POINT_KEYS & params.keys():
+        if _ndim(params[key]) > 2:
+            raise ValueError(f"{key} cannot differ between objects, create them with create_objects_in_chunks")
+        command["params"][key] = params.pop(key)
+    _split_rows(params, command["params"], columns, lambda key: 1 if key in VECTOR_PARAMS else 0)
+    transforms = {"translation": translations, "rotation": rotations, "scale": scales, "color": colors}
+    _split_rows(transforms, command, columns, lambda key: 1)
+    names, count = _row_count(command, columns, names, count)
+
+    async def create(chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return await _create_columnar_chunk(rhino, "create_objects_columnar", chunk, timeout)
+
+    return await _pipeline(_column_chunks(command, columns, count, chunk_size, names=names), create, max_in_flight, count, progress)
+
+
+async def create_block_instances(
+    rhino,
+    block: str,
+    objects: List[Dict[str, Any]] | None = None,
+    replace: bool = False,
+    translations: Any = None,
+    rotations: Any = None,
+    scales: Any = None,
+    colors: Any = None,
+    names: str | Sequence[str] | None = None,
+    count: int | None = None,
+    chunk_size: int = MAX_COLUMNAR_CHUNK,
+    max_in_flight: int = 4,
+    timeout: float | None = None,
+    progress: Progress | None = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Place instances of a block and return their results in input order, as
+    for ``create_objects_columnar``, along with the block's description.
+
+    With ``objects``, object specs as taken by ``create_object``, the block
+    is defined first; an existing block of that name is an error unless
+    ``replace`` is set, which also updates its placed instances. Without
+    them ``block`` must already exist. Without ``count`` or any value per
+    instance the block is only defined.
+
+    The geometry is sent once, and each instance only costs its transform:
+    ``translations``, ``rotations`` and ``scales`` are ``[x, y, z]`` or one
+    per instance, applied relative to the block's bounding box like
+    ``modify_object`` does. ``colors`` apply to block objects whose color
+    is by parent. The description has the instances of the block in the
+    document and Rhino's memory estimates of its definition and of one
+    instance, see ``instancing_savings``.
+    """
+    command: Dict[str, Any] = {"block": block}
+    columns: Dict[str, Sequence[Any]] = {}
+    transforms = {"translation": translations, "rotation": rotations, "scale": scales, "color": colors}
+    _split_rows(transforms, command, columns, lambda key: 1)
+    if count is None and objects is not None and not columns and (names is None or isinstance(names, str)):
+        # Only the definition is asked for
+        count = 0
+    names, count = _row_count(command, columns, names, count)
+
+    replies: List[Dict[str, Any]] = []
+    description: Dict[str, Any] = {}
+    if objects is not None:
+        description = await rhino.send_command(
+            "create_block_definition",
+            {"name": block, "objects": objects, "replace": replace, CLIENT_TOKEN: uuid.uuid4().hex},
+            timeout=timeout,
+        )
+
+    async def create(chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return await _create_columnar_chunk(rhino, "create_block_instances", chunk, timeout, replies)
+
+    results = await _pipeline(_column_chunks(command, columns, count, chunk_size, names=names), create, max_in_flight, count, progress)
+    # Chunks finish in any order, the last state of the block has the most instances
+    for reply in replies:
+        if reply.get("block", {}).get("instance_count", -1) >= description.get("instance_count", -1):
+            description = reply["block"]
+    return results, description
+
+
+def instancing_savings(description: Dict[str, Any]) -> int:
+    """Bytes the block's instances save over as many copies of its geometry, by Rhino's estimates"""
+    instances = description.get("instance_count", 0)
+    definition = description.get("definition_bytes", 0)
+    instance = description.get("instance_bytes", 0)
+    return max(0, instances * definition - (definition + instances * instance))
+
+
+def _matrix_rows(xforms: Any) -> Tuple[List[float] | None, Any]:
+    """Split ``xforms`` into one matrix for every object or one per object, as
+    rows of 16 values or of 12 when every matrix is affine"""
+    if hasattr(xforms, "reshape"):
+        if xforms.ndim == 1 or xforms.shape == (4, 4):
+            return [float(x) for x in xforms.reshape(-1)], None
+        if xforms.ndim == 3:
+            xforms = xforms.reshape(-1, 16)
+        if xforms.shape[1] == 16 and (xforms[:, 12:] == (0.0, 0.0, 0.0, 1.0)).all():
+            xforms = xforms[:, :12]
+        return None, xforms
+
+    depth = _ndim(xforms)
+    if depth == 1:
+        return [float(x) for x in xforms], None
+    if depth == 2 and len(xforms) == 4 and len(xforms[0]) == 4:
+        return [float(x) for row in xforms for x in row], None
+    rows = [[float(x) for row in matrix for x in row] for matrix in xforms] if depth == 3 else [list(row) for row in xforms]
+    if all(row[12:16] == [0.0, 0.0, 0.0, 1.0] for row in rows):
+        rows = [row[:12] for row in rows]
+    return None, rows
+
+
+def _translation_rows(rows: Any) -> Any:
+    """The translations of matrix rows that only translate, None if any does more"""
+    if hasattr(rows, "reshape"):
+        if (rows[:, [0, 1, 2, 4, 5, 6, 8, 9, 10]] == (1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)).all():
+            return rows[:, [3, 7, 11]]
+        return None
+    if all(row[0:3] == [1.0, 0.0, 0.0] and row[4:7] == [0.0, 1.0, 0.0] and row[8:11] == [0.0, 0.0, 1.0] for row in rows):
+        return [[row[3], row[7], row[11]] for row in rows]
+    return None
+
+
+async def _transform_chunk(rhino, command: Dict[str, Any], timeout: float | None) -> List[Dict[str, Any]]:
+    # Moving an object twice is not the same as once; the token lets the pool retry
+    # the chunk after a lost reply, since the plugin answers a repeated token
+    # with the first result
+    result = await rhino.send_command(
+        "modify_objects", dict(command, **{CLIENT_TOKEN: uuid.uuid4().hex}), timeout=timeout, priority=BULK
+    )
+    results: List[Dict[str, Any]] = [{"modified": True} for _index in range(command.get("count", 0))]
+    for error in result.get("errors") or []:
+        results[error["index"]] = {"error": error["error"]}
+    return results
+
+
+async def transform_objects(
+    rhino,
+    ids: Sequence[str] | None = None,
+    selected: bool = False,
+    all: bool = False,
+    xforms: Any = None,
+    translations: Any = None,
+    rotations: Any = None,
+    scales: Any = None,
+    chunk_size: int = MAX_COLUMNAR_CHUNK,
+    max_in_flight: int = 4,
+    timeout: float | None = None,
+    progress: Progress | None = None,
+) -> Dict[str, Any]:
+    """Transform many objects with one ``modify_objects`` command per chunk.
+
+    The objects are given by ``ids``, or are the ``selected`` or ``all``
+    objects of the document. Each is moved either by ``xforms``, 4x4
+    matrices applied as they are (see ``rhinomcp.transforms``), or by
+    ``translations``, ``rotations`` and ``scales`` applied like
+    ``modify_object`` does, relative to the object's bounding box. Every one
+    of them is shared by all objects or has one row per id; without ids
+    only shared values can be given, and the whole document or selection is
+    transformed by one small command.
+
+    Returns ``{"modified": n, "errors": [{"index": i, "error": ...}]}``.
+    Other parameters are as for ``create_objects_columnar``.
+    """
+    if xforms is not None and (translations is not None or rotations is not None or scales is not None):
+        raise ValueError("Give either xforms or translations, rotations and scales")
+    if ids is None and not selected and not all:
+        raise ValueError("Give the ids of the objects to transform, selected or all")
+
+    command: Dict[str, Any] = {}
+    columns: Dict[str, Sequence[Any]] = {}
+    if xforms is not None:
+        shared, rows = _matrix_rows(xforms)
+        moves = _translation_rows(rows) if shared is None and len(rows) and len(rows[0]) == 12 else None
+        if shared is not None:
+            command["xform"] = shared
+        elif moves is not None:
+            # Offsets alone are a quarter of the size, and Rhino applies them the same way
+            columns["translation"] = moves
+        else:
+            columns["xform"] = rows
+    transforms = {"translation": translations, "rotation": rotations, "scale": scales}
+    _split_rows(transforms, command, columns, lambda key: 1)
+
+    if ids is None:
+        if columns:
+            raise ValueError("Values per object need the ids of the objects")
+        command["selected" if selected else "all"] = True
+        command[CLIENT_TOKEN] = uuid.uuid4().hex
+        result = await rhino.send_command("modify_objects", command, timeout=timeout, priority=BULK)
+        return {"modified": result.get("modified", 0), "errors": result.get("errors") or []}
+
+    _names, count = _row_count(command, columns, None, len(ids))
+
+    async def create(chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return await _transform_chunk(rhino, chunk, timeout)
+
+    results = await _pipeline(_column_chunks(command, columns, count, chunk_size, ids=ids), create, max_in_flight, count, progress)
+    errors = [{"index": index, "error": result["error"]} for index, result in enumerate(results) if "error" in result]
+    return {"modified": len(results) - len(errors), "errors": errors}
@@ -0,0 +1,129 @@
+"""Client-side cache of read-only command results.
+
+Agents tend to call ``get_document_info`` and ``get_object_info`` between
+every edit, and each call waits for Rhino's UI thread. ``ResponseCache``
+answers repeats of such reads locally:
+
+- Entries are keyed by command type and parameters and expire after
+  ``ttl`` seconds, which bounds how long edits made by hand in Rhino go
+  unnoticed.
+- Any command that may change the document clears the cache, both when
+  it is sent and when it completes.
+- At most ``max_entries`` results are kept, least recently used first out.
+- A page with a ``next_cursor`` is never kept: the cursor refers to a
+  snapshot the plugin drops after its last page, so a repeat of the page
+  could hand out a cursor that has already expired.
+
+A ``ttl`` of 0 turns caching off.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+# Reads whose results are worth keeping. Selection info is left out since
+# the selection changes with every click in Rhino.
+CACHEABLE_COMMANDS = {
+    "get_document_info",
+    "get_document_objects",
+    "get_object_info",
+    "query_objects_in_box",
+    "query_objects_within_radius",
+    "nearest_objects",
+}
+
+# Reads that do not follow the "get_" naming
+_READ_COMMANDS = {"ping", "query_objects_in_box", "query_objects_within_radius", "nearest_objects"}
+
+# Commands starting with "get_" that can nevertheless change the document
+_MUTATING_GETTERS = {"get_or_set_current_layer"}
+
+
+def is_read_only(command_type: str) -> bool:
+    """Whether a command leaves the document as it is"""
+    if command_type in _READ_COMMANDS:
+        return True
+    return command_type.startswith("get_") and command_type not in _MUTATING_GETTERS
+
+
+class ResponseCache:
+    """TTL and LRU bounded map from ``(command, params)`` to results.
+
+    Parameters:
+    - max_entries: Number of results kept before the least recently used is dropped.
+    - ttl: Seconds a result is served from the cache.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 5.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Results are kept serialized: callers are free to modify what they get
+        # back, and parsing is much cheaper than a deep copy of a large result
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+        # Bumped by every invalidation, so a read that raced with a write is not stored
+        self.generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    @staticmethod
+    def key(command_type: str, params: Dict[str, Any] | None) -> Tuple[str, str]:
+        return command_type, json.dumps(params or {}, sort_keys=True, default=str)
+
+    def get(self, command_type: str, params: Dict[str, Any] | None) -> Dict[str, Any] | None:
+        """The cached result of a read, or ``None``"""
+        if command_type not in CACHEABLE_COMMANDS or not self.enabled:
+            return None
+        key = self.key(command_type, params)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            self._expired += 1
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return json.loads(result)
+
+    def put(self, command_type: str, params: Dict[str, Any] | None, result: Dict[str, Any], generation: int):
+        """Store the result of a read that was sent while ``generation`` was current"""
+        if command_type not in CACHEABLE_COMMANDS or not self.enabled or generation != self.generation:
+            return
+        if result.get("next_cursor") is not None:
+            return
+        key = self.key(command_type, params)
+        self._entries[key] = (time.monotonic(), json.dumps(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self):
+        """Forget every result, the document may have changed"""
+        self.generation += 1
+        if self._entries:
+            self._invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "expired": self._expired,
+            "evictions": self._evictions,
+            "invalidations": self._invalidations,
+        }
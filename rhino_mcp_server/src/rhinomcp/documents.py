@@ -0,0 +1,90 @@
+"""Paged enumeration of the objects in the Rhino document.
+
+``get_document_info`` only returns the first few objects so a model is not
+flooded with data. Code that needs every object pages through
+``get_document_objects`` instead:
+
+    async for obj in iter_document_objects(rhino, fields=["id", "layer"]):
+        ...
+
+The next page is requested as soon as the previous one arrives, so it is on
+its way while the caller works through the current one.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, Iterable
+
+from rhinomcp.async_connection import AsyncRhinoConnection
+from rhinomcp.pool import RhinoConnectionPool
+
+GET_DOCUMENT_OBJECTS = "get_document_objects"
+
+# What the plugin can project each object to
+DOCUMENT_OBJECT_FIELDS = ("id", "name", "type", "layer", "color", "bounding_box")
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+
+def page_params(cursor: str | None, page_size: int, fields: Iterable[str] | None) -> Dict[str, Any]:
+    """Parameters of one ``get_document_objects`` request"""
+    params: Dict[str, Any] = {"limit": page_size}
+    if cursor is not None:
+        params["cursor"] = cursor
+    if fields is not None:
+        params["fields"] = list(fields)
+    return params
+
+
+async def iter_document_objects(
+    rhino: RhinoConnectionPool | AsyncRhinoConnection,
+    fields: Iterable[str] | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield every object of the document, one page of ``page_size`` at a time.
+
+    Parameters:
+    - rhino: A connection or connection pool.
+    - fields: Keys to include for each object, out of ``DOCUMENT_OBJECT_FIELDS``.
+      All of them by default; leaving out ``bounding_box`` makes pages much cheaper.
+    - page_size: Objects per request, at most ``MAX_PAGE_SIZE``.
+    """
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+    if fields is not None:
+        fields = list(fields)
+        unknown = set(fields) - set(DOCUMENT_OBJECT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    params = page_params(None, page_size, fields)
+    async for obj in iter_pages(rhino, GET_DOCUMENT_OBJECTS, params, lambda page: page.get("objects", [])):
+        yield obj
+
+
+async def iter_pages(
+    rhino: RhinoConnectionPool | AsyncRhinoConnection,
+    command_type: str,
+    params: Dict[str, Any],
+    items: Callable[[Dict[str, Any]], Iterable[Any]],
+) -> AsyncIterator[Any]:
+    """Yield the ``items`` of every page of a command paged by ``cursor`` and ``next_cursor``.
+
+    The next page is requested as soon as the previous one arrives.
+    """
+    request = asyncio.ensure_future(rhino.send_command(command_type, params))
+    try:
+        while request is not None:
+            page = await request
+            cursor = page.get("next_cursor")
+            request = None
+            if cursor is not None:
+                request = asyncio.ensure_future(rhino.send_command(command_type, dict(params, cursor=cursor)))
+            for item in items(page):
+                yield item
+    finally:
+        # The consumer stopped early, the prefetched page is not needed
+        if request is not None:
+            request.cancel()
+            if request.done() and not request.cancelled():
+                request.exception()
@@ -0,0 +1,15 @@
+"""Exceptions raised by the connection layer.
+
+Errors that Rhino itself reports (a reply with ``"status": "error"``) are
+raised as plain ``Exception`` with Rhino's message, as they always were.
+These types are for failures where the command may not have reached Rhino
+or its reply was lost, which is what decides whether a retry is safe.
+"""
+
+
+class RhinoConnectionError(ConnectionError):
+    """The command may not have reached Rhino, or its reply was lost on the way back"""
+
+
+class RhinoTimeoutError(RhinoConnectionError):
+    """Rhino did not answer within the timeout"""
@@ -0,0 +1,1049 @@
+"""A Python stand-in for the Rhino plugin socket server.
+
+It speaks the same wire protocol as ``RhinoMCPServer.HandleClient`` in the
+plugin, so ``RhinoConnection`` and the MCP tools can be exercised and
+benchmarked without a running Rhino:
+
+    with FakeRhinoServer(object_count=50000) as server:
+        rhino = RhinoConnection(*server.address)
+        rhino.send_command("get_document_info")
+
+or, for the example scripts and an MCP client, on the plugin's port:
+
+    python -m rhinomcp.fake_rhino --objects 1000 --latency 0.01
+
+Like the plugin, each client is read on its own thread while every command
+runs on a single "UI thread", one at a time and in arrival order; ``ping``
+is answered on the client's thread. The plugin's quirks are kept on
+purpose: legacy framing only understands one JSON document per read
+buffer, ``get_document_info`` lists at most 30 objects and layers,
+``modify_objects`` with ``all`` also applies the first entry on its own,
+and ``select_objects`` matches colors like the plugin does.
+
+Objects live in a table keyed by runtime serial number like in Rhino, with
+their bounding box and control points kept up to date by the creation and
+transform commands. Paged commands hand out ``snapshot:offset`` cursors
+that expire like the plugin's. Changes made by commands or through ``add_object``,
+``modify_object`` and ``delete_object`` are pushed to subscribed clients as
+document events.
+
+To measure the client rather than Rhino, ``latency`` and ``jitter`` add
+seconds of UI-thread work to every command, ``points_per_object`` makes
+the starting objects polylines with that many points, and ``padding`` adds
+that many bytes to every result.
+"""
+
+import argparse
+import json
+import logging
+import math
+import queue
+import random
+import socketserver
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+
+from rhinomcp.arrays import encode_arrays, unpack_hook
+from rhinomcp.async_connection import RHINO_PORT
+from rhinomcp.framing import (
+    FEATURE_BINARY_ARRAYS,
+    FEATURE_EVENTS,
+    FEATURE_REQUEST_ID,
+    FEATURE_ZLIB,
+    FRAMING_LEGACY,
+    FRAMING_LENGTH,
+    HELLO_COMMAND,
+    SUBSCRIBE_COMMAND,
+    FrameDecoder,
+    decode_message,
+    encode_message,
+    negotiate,
+    unpack_payload,
+)
+from rhinomcp.documents import DEFAULT_PAGE_SIZE, DOCUMENT_OBJECT_FIELDS, MAX_PAGE_SIZE
+from rhinomcp.retry import CLIENT_TOKEN
+from rhinomcp.query import from_filters, matches, object_keys, validate_query
+from rhinomcp.spatial import DEFAULT_NEAREST_COUNT, box_contains, box_distance, boxes_intersect, normalize_box
+
+logger = logging.getLogger("RhinoMCPServer")
+
+Point = List[float]
+
+
+class _ClientHandler(socketserver.BaseRequestHandler):
+    server: "_ThreadingServer"
+
+    def handle(self):
+        fake: FakeRhinoServer = self.server.fake
+        frames = FrameDecoder()
+        pending = b""
+        self.mode = FRAMING_LEGACY
+        self.binary_arrays = False
+        self.compress = False
+        self.events = False
+        self.send_lock = threading.Lock()
+
+        while True:
+            try:
+                chunk = self.request.recv(65536)
+            except OSError:
+                break
+            if not chunk:
+                break
+
+            if self.mode == FRAMING_LENGTH:
+                for flags, payload in frames.feed(chunk):
+                    self._receive(fake, decode_message(unpack_payload(flags, payload), unpack_hook))
+                continue
+
+            # Like the plugin, parse everything received so far as one document and
+            # wait for more when that fails, which also means a second command sent
+            # before the first was answered is never understood
+            pending += chunk
+            try:
+                command = json.loads(pending, object_hook=unpack_hook)
+            except ValueError:
+                continue
+            pending = b""
+            if command.get("type") == HELLO_COMMAND and fake.framing:
+                # Answered in the old framing, the switch applies from the next message on
+                result = negotiate(command.get("params") or {}, [FRAMING_LENGTH], SUPPORTED_FEATURES)
+                self.send({"status": "success", "result": result})
+                self.binary_arrays = FEATURE_BINARY_ARRAYS in result["features"]
+                self.compress = FEATURE_ZLIB in result["features"]
+                self.events = FEATURE_EVENTS in result["features"]
+                self.mode = result["framing"]
+                continue
+            self._receive(fake, command)
+        fake.unsubscribe(self)
+
+    def _receive(self, fake: "FakeRhinoServer", command: Dict[str, Any]):
+        if command.get("type") == "ping":
+            # Answered right away, without waiting for the UI thread
+            response = {"status": "success", "result": {"pong": True}}
+            if "id" in command:
+                response["id"] = command["id"]
+            self.send(response)
+            return
+        fake.dispatch(self, command)
+
+    def send(self, message: Dict[str, Any]):
+        if self.binary_arrays:
+            message = encode_arrays(message, True)
+        data = encode_message(message, self.mode, self.compress)
+        with self.send_lock:
+            self.request.sendall(data)
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    fake: "FakeRhinoServer"
+
+
+class _PageSnapshots:
+    """The results of paged commands from their first page to their last, as ``PageSnapshots`` keeps them in the plugin"""
+
+    def __init__(self):
+        # Least recently used first
+        self._snapshots: Dict[str, List[Any]] = {}
+
+    def get(self, cursor: str | None, limit: int, take: Callable[[], List[Any]]) -> Tuple[List[Any], str | None, int]:
+        """The items of the page starting at ``cursor``, the next cursor and the size of the snapshot"""
+        if not cursor:
+            key, offset = uuid.uuid4().hex, 0
+            items = self._snapshots[key] = take()
+            while len(self._snapshots) > MAX_PAGE_SNAPSHOTS:
+                del self._snapshots[next(iter(self._snapshots))]
+        else:
+            key, _sep, offset_text = str(cursor).partition(":")
+            items = self._snapshots.pop(key, None)
+            if items is None or not offset_text.isdigit() or int(offset_text) > len(items):
+                raise ValueError(_EXPIRED_CURSOR)
+            offset = int(offset_text)
+            self._snapshots[key] = items
+        end = min(offset + limit, len(items))
+        if end < len(items):
+            return items[offset:end], f"{key}:{end}", len(items)
+        del self._snapshots[key]
+        return items[offset:end], None, len(items)
+
+
+SUPPORTED_FEATURES = [FEATURE_REQUEST_ID, FEATURE_BINARY_ARRAYS, FEATURE_ZLIB, FEATURE_EVENTS]
+
+DEFAULT_LAYER = {"id": str(uuid.UUID(int=0)), "name": "Default", "color": {"r": 0, "g": 0, "b": 0}, "parent": str(uuid.UUID(int=0)), "visible": True, "locked": False}
+
+# What GetDocumentInfo lists of each table
+DOCUMENT_INFO_LIMIT = 30
+
+# Made up memory estimate of a block instance, see _memory_estimate
+INSTANCE_BYTES = 200
+
+_EMPTY_ID = str(uuid.UUID(int=0))
+# Columnar commands read these from the top level rather than from the params
+_TRANSFORM_KEYS = ("translation", "rotation", "scale", "color")
+_NULL_REFERENCE = "Object reference not set to an instance of an object."
+_EXPIRED_CURSOR = "The cursor has expired, start again from the first page"
+
+# Paged results kept at once, as in the plugin
+MAX_PAGE_SNAPSHOTS = 8
+
+
+class FakeRhinoServer:
+    """In-process stand-in for the plugin's socket server.
+
+    Parameters:
+    - host, port: Where to listen. Port 0 picks a free port, see ``address``.
+    - framing: Whether to answer the ``hello`` handshake. With ``False`` the
+      server behaves like a plugin that predates framing negotiation.
+    - object_count: Number of objects the document starts with.
+    - points_per_object: Make the starting objects polylines with this many
+      points instead of boxes, to grow the payloads.
+    - latency: Seconds each command keeps the UI thread busy, either for
+      every command or per command type.
+    - jitter: Up to this many seconds are added to ``latency`` at random.
+    - padding: Bytes of filler added to every result.
+    - document_info_limit: Objects and layers listed by ``get_document_info``,
+      ``None`` lists all of them.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        framing: bool = True,
+        object_count: int = 0,
+        points_per_object: int = 0,
+        latency: float | Dict[str, float] = 0.0,
+        jitter: float = 0.0,
+        padding: int = 0,
+        document_info_limit: int | None = DOCUMENT_INFO_LIMIT,
+    ):
+        self.framing = framing
+        self.latency = latency
+        self.jitter = jitter
+        self.padding = padding
+        self.document_info_limit = document_info_limit
+        # Held while a command runs, like Rhino's UI thread
+        self.lock = threading.RLock()
+        self.objects: Dict[int, Dict[str, Any]] = {}
+        self.layers: Dict[str, Dict[str, Any]] = {DEFAULT_LAYER["id"]: dict(DEFAULT_LAYER)}
+        self.current_layer = DEFAULT_LAYER["id"]
+        self.selected: Set[str] = set()
+        self.user_strings: Dict[str, Dict[str, str]] = {}
+        # Control points of curves, and degree, by object id
+        self._curves: Dict[str, Tuple[List[Point], int]] = {}
+        # Block definitions by name, and the ids of each block's instances
+        self.blocks: Dict[str, Dict[str, Any]] = {}
+        self._instances: Dict[str, Set[str]] = {}
+        # Kept apart as in the plugin, a cursor of one command is not one of the other
+        self._pages = _PageSnapshots()
+        self._spatial_pages = _PageSnapshots()
+        self._ids: Dict[str, int] = {}
+        self._next_serial = 1
+        self._subscribers: List[_ClientHandler] = []
+        for i in range(object_count):
+            self._insert(self._object(i, points_per_object))
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "ping": self.ping,
+            "get_document_info": self.get_document_info,
+            "get_document_objects": self.get_document_objects,
+            "create_object": self.create_object,
+            "create_objects": self.create_objects,
+            "create_objects_columnar": self.create_objects_columnar,
+            "create_block_definition": self.create_block_definition,
+            "create_block_instances": self.create_block_instances,
+            "get_object_info": self.get_object_info,
+            "get_selected_objects_info": self.get_selected_objects_info,
+            "delete_object": self.delete_object_command,
+            "modify_object": self.modify_object_command,
+            "modify_objects": self.modify_objects,
+            "execute_rhinoscript_python_code": self.execute_rhinoscript,
+            "select_objects": self.select_objects,
+            "query_objects_in_box": self.query_objects_in_box,
+            "query_objects_within_radius": self.query_objects_within_radius,
+            "nearest_objects": self.nearest_objects,
+            "create_layer": self.create_layer,
+            "get_or_set_current_layer": self.get_or_set_current_layer,
+            "delete_layer": self.delete_layer,
+            "open_grasshopper": self._no_grasshopper,
+            "import_grasshopper_definition": self._no_grasshopper,
+            "export_grasshopper_definition": self._no_grasshopper,
+        }
+        self._completed_tokens: Dict[str, Dict[str, Any]] = {}
+        self._commands: "queue.Queue[Tuple[_ClientHandler, Dict[str, Any], float] | None]" = queue.Queue()
+        self._ui_thread: threading.Thread | None = None
+        self._server = _ThreadingServer((host, port), _ClientHandler, bind_and_activate=True)
+        self._server.fake = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """The ``(host, port)`` the server is listening on"""
+        host, port = self._server.server_address[:2]
+        return host, port
+
+    def start(self) -> "FakeRhinoServer":
+        self._ui_thread = threading.Thread(target=self._run_ui_thread, daemon=True)
+        self._ui_thread.start()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._ui_thread is not None:
+            self._commands.put(None)
+            self._ui_thread.join()
+            self._ui_thread = None
+
+    def __enter__(self) -> "FakeRhinoServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def dispatch(self, client: _ClientHandler, command: Dict[str, Any]):
+        """Queue a command for the UI thread, as ``DispatchCommand`` does"""
+        self._commands.put((client, command, time.monotonic()))
+
+    def _run_ui_thread(self):
+        while True:
+            item = self._commands.get()
+            if item is None:
+                return
+            client, command, received = item
+            # The reply is sent before the next command runs, so replies and events stay in order
+            with self.lock:
+                timeout = command.get("timeout")
+                if timeout is not None and time.monotonic() - received > timeout:
+                    response = {"status": "error", "message": f"Command {command.get('type')} timed out before execution"}
+                    if "id" in command:
+                        response["id"] = command["id"]
+                elif command.get("type") == SUBSCRIBE_COMMAND:
+                    response = self.subscribe(client, command)
+                else:
+                    response = self.execute_command(command)
+                try:
+                    client.send(response)
+                except OSError:
+                    logger.info("Fake Rhino: failed to send response - client disconnected")
+
+    def _work(self, command_type: str):
+        latency = self.latency.get(command_type, 0.0) if isinstance(self.latency, dict) else self.latency
+        if self.jitter:
+            latency += random.uniform(0, self.jitter)
+        if latency > 0:
+            time.sleep(latency)
+
+    def execute_command(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one command and build the response envelope, as ``ExecuteCommand`` does"""
+        command_type = command.get("type")
+        params = dict(command.get("params") or {})
+        client_token = params.pop(CLIENT_TOKEN, None)
+        handler = self.handlers.get(command_type)
+        with self.lock:
+            if handler is None:
+                response = {"status": "error", "message": f"Unknown command type: {command_type}"}
+            elif client_token is not None and client_token in self._completed_tokens:
+                # A retried command returns the original result instead of running twice
+                response = json.loads(json.dumps(self._completed_tokens[client_token]))
+            else:
+                self._work(command_type)
+                try:
+                    result = handler(params)
+                    if self.padding:
+                        result["padding"] = "x" * self.padding
+                    response = {"status": "success", "result": result}
+                    if client_token is not None:
+                        self._completed_tokens[client_token] = json.loads(json.dumps(response))
+                except Exception as e:
+                    response = {"status": "error", "message": str(e)}
+        if "id" in command:
+            response["id"] = command["id"]
+        return response
+
+    def ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"pong": True}
+
+    # The object table
+
+    @property
+    def object_count(self) -> int:
+        return len(self.objects)
+
+    def _object(self, i: int, points: int = 0) -> Dict[str, Any]:
+        obj = {
+            "id": str(uuid.UUID(int=i)),
+            "name": f"Object {i}",
+            "type": "Brep",
+            "layer": "Default",
+            "material": "-1",
+            "color": {"r": 0, "g": 0, "b": 0},
+            "bounding_box": [[i, 0.0, 0.0], [i + 1.0, 1.0, 1.0]],
+        }
+        if points:
+            obj["type"] = "POLYLINE"
+            self._curves[obj["id"]] = ([[i + k / points, float(k % 2), 0.0] for k in range(points)], 1)
+            obj["bounding_box"] = _bounds(self._curves[obj["id"]][0])
+        return obj
+
+    def _insert(self, obj: Dict[str, Any]) -> int:
+        serial = self._next_serial
+        self._next_serial += 1
+        self.objects[serial] = obj
+        self._ids[obj["id"]] = serial
+        return serial
+
+    def _remove(self, object_id: str):
+        del self.objects[self._ids.pop(object_id)]
+        self.selected.discard(object_id)
+        self.user_strings.pop(object_id, None)
+        self._curves.pop(object_id, None)
+        for instances in self._instances.values():
+            instances.discard(object_id)
+        self.emit("object_deleted", {"id": object_id})
+
+    def _find(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Look an object up by id or else by name, as ``getObjectByIdOrName`` does"""
+        object_id = params.get("id")
+        name = params.get("name")
+        obj = None
+        if object_id:
+            try:
+                object_id = str(uuid.UUID(str(object_id)))
+            except ValueError:
+                raise ValueError("Guid should contain 32 digits with 4 dashes (xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx).")
+            serial = self._ids.get(object_id)
+            obj = self.objects.get(serial) if serial is not None else None
+        elif name:
+            matches = [obj for obj in self.objects.values() if obj["name"] == name]
+            if len(matches) > 1:
+                raise ValueError(f"Multiple objects with name {name} found.")
+            if not matches:
+                raise ValueError("Index was out of range. Must be non-negative and less than the size of the collection. (Parameter 'index')")
+            obj = matches[0]
+        if obj is None:
+            raise ValueError(f"Object with ID {object_id or ''} not found")
+        return obj
+
+    def _serialize(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        """The object as ``Serializer.RhinoObject`` describes it"""
+        data = dict(obj)
+        curve = self._curves.get(obj["id"])
+        if obj["type"] == "POINT":
+            data["geometry"] = _round(obj["bounding_box"][0])
+        elif curve is not None:
+            points, degree = curve
+            if obj["type"] == "LINE":
+                data["geometry"] = {"start": _round(points[0]), "end": _round(points[-1])}
+            elif obj["type"] == "POLYLINE":
+                data["geometry"] = {"points": [_round(point) for point in points]}
+            else:
+                data["geometry"] = {"points": [_round(point) for point in points], "degree": str(degree)}
+        return data
+
+    # Commands
+
+    def get_document_info(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        limit = self.document_info_limit
+        objects = self.objects.values() if limit is None else list(self.objects.values())[:limit]
+        layers = list(self.layers.values())
+        if limit is not None:
+            layers = layers[:limit]
+        return {
+            "meta_data": {"name": "fake.3dm", "units": "Millimeters"},
+            "object_count": self.object_count,
+            "objects": [self._serialize(obj) for obj in objects],
+            "layer_count": len(self.layers),
+            "layers": [_layer_summary(layer) for layer in layers],
+        }
+
+    def get_document_objects(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        # The first page takes the ids in serial number order, objects deleted since are left out
+        limit = min(max(int(params.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        fields = params.get("fields") or DOCUMENT_OBJECT_FIELDS
+        ids, next_cursor, _count = self._pages.get(
+            params.get("cursor"), limit, lambda: [obj["id"] for _serial, obj in sorted(self.objects.items())]
+        )
+        objects = []
+        for object_id in ids:
+            serial = self._ids.get(object_id)
+            if serial is not None and serial in self.objects:
+                objects.append(_project(self.objects[serial], fields))
+        return {
+            "objects": objects,
+            "next_cursor": next_cursor,
+            "object_count": self.object_count,
+        }
+
+    def create_object(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        object_type = params.get("type")
+        geometry = params.get("params") or {}
+        points, degree, kind = _shape(object_type, geometry)
+        color = params.get("color")
+        obj = {
+            "id": str(uuid.uuid4()),
+            "name": params.get("name") or "(unnamed)",
+            "type": kind,
+            "layer": self.layers[self.current_layer]["name"],
+            "material": "-1",
+            "color": {"r": int(color[0]), "g": int(color[1]), "b": int(color[2])} if color else {"r": 0, "g": 0, "b": 0},
+            "bounding_box": _bounds(points),
+        }
+        if kind != "POINT" and kind != "Brep" and kind != "Surface":
+            self._curves[obj["id"]] = (points, degree)
+        self._insert(obj)
+        self.emit("object_added", _project(obj, DOCUMENT_OBJECT_FIELDS))
+        # The creation parameters' translation, rotation and scale are applied as a modification
+        return self.modify_object_command(dict(params, id=obj["id"]))
+
+    def _create_each(self, object_params: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return self.create_object(object_params)
+        except Exception as e:
+            return {"error": str(e)}
+
+    def create_objects(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if isinstance(params.get("objects"), list):
+            return {"objects": [self._create_each(object_params) for object_params in params["objects"]]}
+        return {key: self._create_each(object_params) for key, object_params in params.items()}
+
+    def create_objects_columnar(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        ids: List[str | None] = []
+        errors = []
+        for index, row in enumerate(_rows(params)):
+            object_params = {"type": params.get("type"), "params": dict(params.get("params") or {}), "name": row.pop("name")}
+            for key, value in row.items():
+                if key in _TRANSFORM_KEYS:
+                    object_params[key] = value
+                else:
+                    object_params["params"][key] = value
+            result = self._create_each(object_params)
+            ids.append(result.get("id"))
+            if "error" in result:
+                errors.append({"index": index, "error": result["error"]})
+        return {"ids": ids, "errors": errors}
+
+    def create_block_definition(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        name = params.get("name")
+        specs = params.get("objects") or []
+        if not name:
+            raise ValueError("Block name is required")
+        if not specs:
+            raise ValueError("A block needs at least one object")
+        if name in self.blocks and not params.get("replace"):
+            raise ValueError(f"Block {name} already exists")
+        points: List[Point] = []
+        definition_bytes = 0
+        for spec in specs:
+            shape, _degree, _kind = _shape(spec.get("type"), spec.get("params") or {})
+            transform = _transform(spec, _bounds(shape))
+            if transform is not None:
+                shape = [transform(point) for point in shape]
+            points.extend(shape)
+            definition_bytes += _memory_estimate(shape)
+        # Unlike Rhino, replacing a block leaves the boxes of its placed instances as they were
+        index = self.blocks[name]["index"] if name in self.blocks else len(self.blocks)
+        self.blocks[name] = {
+            "name": name,
+            "index": index,
+            "object_count": len(specs),
+            "bounding_box": _bounds(points),
+            "definition_bytes": definition_bytes,
+        }
+        self._instances.setdefault(name, set())
+        return self._describe_block(name)
+
+    def create_block_instances(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        name = params.get("block")
+        block = self.blocks.get(name)
+        if block is None:
+            raise ValueError(f"Block {name} not found")
+        box = block["bounding_box"]
+        ids: List[str | None] = []
+        errors = []
+        for index, row in enumerate(_rows(params)):
+            try:
+                transform = _transform(row, box) or (lambda point: point)
+                color = row.get("color")
+                corners = [[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)]
+                obj = {
+                    "id": str(uuid.uuid4()),
+                    "name": row.get("name") or "(unnamed)",
+                    "type": "InstanceReference",
+                    "layer": self.layers[self.current_layer]["name"],
+                    "material": "-1",
+                    "color": {"r": int(color[0]), "g": int(color[1]), "b": int(color[2])} if color else {"r": 0, "g": 0, "b": 0},
+                    "bounding_box": _bounds([transform([box[i][0], box[j][1], box[k][2]]) for i, j, k in corners]),
+                }
+            except Exception as e:
+                ids.append(None)
+                errors.append({"index": index, "error": str(e)})
+                continue
+            self._insert(obj)
+            self._instances[name].add(obj["id"])
+            self.emit("object_added", _project(obj, DOCUMENT_OBJECT_FIELDS))
+            ids.append(obj["id"])
+        return {"ids": ids, "errors": errors, "block": self._describe_block(name)}
+
+    def _describe_block(self, name: str) -> Dict[str, Any]:
+        block = self.blocks[name]
+        instances = len(self._instances[name])
+        return {
+            "name": name,
+            "index": block["index"],
+            "object_count": block["object_count"],
+            "instance_count": instances,
+            "definition_bytes": block["definition_bytes"],
+            "instance_bytes": INSTANCE_BYTES if instances else 0,
+            "bounding_box": block["bounding_box"],
+        }
+
+    def get_object_info(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        obj = self._find(params)
+        data = self._serialize(obj)
+        data["attributes"] = dict(self.user_strings.get(obj["id"], {}))
+        return data
+
+    def get_selected_objects_info(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        include_attributes = bool(params.get("include_attributes"))
+        selected = []
+        for obj in self.objects.values():
+            if obj["id"] in self.selected:
+                data = self._serialize(obj)
+                if include_attributes:
+                    data["attributes"] = dict(self.user_strings.get(obj["id"], {}))
+                selected.append(data)
+        return {"selected_objects": selected}
+
+    def delete_object_command(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if "all" in params:
+            for object_id in list(self._ids):
+                self._remove(object_id)
+            return {"deleted": True}
+        obj = self._find(params)
+        self._remove(obj["id"])
+        return {"id": obj["id"], "name": obj["name"], "deleted": True}
+
+    def modify_object_command(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        obj = self._find(params)
+        modified = False
+        if params.get("new_name") is not None:
+            obj["name"] = str(params["new_name"])
+            modified = True
+        if params.get("new_color") is not None:
+            red, green, blue = params["new_color"][:3]
+            obj["color"] = {"r": red, "g": green, "b": blue}
+            modified = True
+        transform = _transform(params, obj["bounding_box"])
+        if transform is not None:
+            self._apply(obj, transform)
+        elif modified:
+            self.emit("object_modified", _project(obj, DOCUMENT_OBJECT_FIELDS))
+        return self._serialize(obj)
+
+    def _apply(self, obj: Dict[str, Any], transform: Callable[[Point], Point]):
+        corners = [[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)]
+        box = obj["bounding_box"]
+        obj["bounding_box"] = _bounds([transform([box[i][0], box[j][1], box[k][2]]) for i, j, k in corners])
+        curve = self._curves.get(obj["id"])
+        if curve is not None:
+            self._curves[obj["id"]] = ([transform(point) for point in curve[0]], curve[1])
+            obj["bounding_box"] = _bounds(self._curves[obj["id"]][0])
+        self.emit("object_modified", _project(obj, DOCUMENT_OBJECT_FIELDS))
+
+    def modify_objects(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if "objects" not in params:
+            return self._transform_objects(params)
+        modifications = list(params.get("objects") or [])
+        if "all" in params and len(modifications) == 1:
+            # The plugin appends a copy per object and keeps the first entry as well
+            for object_id in list(self._ids):
+                modifications.append(dict(modifications[0], id=object_id))
+        modified = 0
+        for modification in modifications:
+            if "id" in modification:
+                self.modify_object_command(modification)
+                modified += 1
+        return {"modified": modified}
+
+    def _transform_objects(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if params.get("ids") is not None:
+            ids = list(params["ids"])
+        elif params.get("selected"):
+            ids = [object_id for object_id in self._ids if object_id in self.selected]
+        elif "all" in params:
+            ids = list(self._ids)
+        else:
+            raise ValueError("Give the ids of the objects to transform, selected or all")
+
+        modified = 0
+        errors = []
+        for index, row in enumerate(_rows(dict(params, count=len(ids)))):
+            try:
+                if ids[index] not in self._ids:
+                    raise ValueError(f"Object with ID {ids[index]} not found")
+                obj = self.objects[self._ids[ids[index]]]
+                matrix = row.get("xform", params.get("xform"))
+                transform = _matrix_transform(matrix) if matrix is not None else _transform(row, obj["bounding_box"])
+                if transform is not None:
+                    self._apply(obj, transform)
+                modified += 1
+            except Exception as e:
+                errors.append({"index": index, "error": str(e)})
+        return {"modified": modified, "errors": errors}
+
+    def execute_rhinoscript(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if not params.get("code"):
+            raise ValueError("Code is required")
+        # There is no Python engine to run the script in, it succeeds without output
+        return {"success": True, "result": "Script successfully executed! Print output: "}
+
+    def select_objects(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        query = params.get("query")
+        if query is None:
+            if params.get("filters") is None:
+                raise ValueError("Give filters or a query")
+            query = from_filters(params["filters"], params.get("filters_type"))
+        if query is None:
+            # No filter means all are selected
+            self.selected = set(self._ids)
+            return {"count": len(self.selected)}
+
+        # The plugin looks the objects up in its index, scanning them all gives the same answer
+        validate_query(query)
+        self.selected = {
+            obj["id"] for obj in self.objects.values() if matches(query, object_keys(obj, self.user_strings.get(obj["id"])))
+        }
+        return {"count": len(self.selected)}
+
+    # The layer table
+
+    def _find_layer(self, params: Dict[str, Any]) -> Dict[str, Any] | None:
+        layer = None
+        if "name" in params:
+            layer = next((layer for layer in self.layers.values() if layer["name"] == params["name"]), None)
+        if "guid" in params:
+            layer = self.layers.get(str(uuid.UUID(str(params["guid"]))))
+        return layer
+
+    # Spatial queries, answered by scanning every bounding box where the plugin searches its R-tree
+
+    def _spatial_page(
+        self, query: Callable[[], List[Tuple[int, str, float]]], params: Dict[str, Any], distances: bool
+    ) -> Dict[str, Any]:
+        # The first page runs the query and keeps its hits in serial number order, later pages are slices of them
+        limit = min(max(int(params.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        page, next_cursor, count = self._spatial_pages.get(params.get("cursor"), limit, lambda: sorted(query()))
+        result = {"ids": [hit[1] for hit in page], "next_cursor": next_cursor, "count": count}
+        if distances:
+            result["distances"] = [hit[2] for hit in page]
+        return result
+
+    def query_objects_in_box(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if params.get("min") is None or params.get("max") is None:
+            raise ValueError("A box needs min and max corners")
+        box = normalize_box(params["min"], params["max"])
+        test = box_contains if params.get("contained") else boxes_intersect
+
+        def query() -> List[Tuple[int, str, float]]:
+            return [(serial, obj["id"], 0.0) for serial, obj in self.objects.items() if test(box, obj["bounding_box"])]
+
+        return self._spatial_page(query, params, False)
+
+    def query_objects_within_radius(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if params.get("center") is None or params.get("radius") is None:
+            raise ValueError("A sphere needs a center and a radius")
+        radius = float(params["radius"])
+        if radius < 0:
+            raise ValueError("radius cannot be negative")
+
+        def query() -> List[Tuple[int, str, float]]:
+            hits = []
+            for serial, obj in self.objects.items():
+                distance = box_distance(obj["bounding_box"], params["center"])
+                if distance <= radius:
+                    hits.append((serial, obj["id"], distance))
+            return hits
+
+        return self._spatial_page(query, params, True)
+
+    def nearest_objects(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if params.get("point") is None:
+            raise ValueError("point is required")
+        count = min(max(int(params.get("count", DEFAULT_NEAREST_COUNT)), 1), MAX_PAGE_SIZE)
+        max_distance = params.get("max_distance")
+        hits = sorted((box_distance(obj["bounding_box"], params["point"]), obj["id"]) for obj in self.objects.values())
+        hits = [hit for hit in hits if max_distance is None or hit[0] <= max_distance][:count]
+        return {"ids": [object_id for _distance, object_id in hits], "distances": [distance for distance, _object_id in hits]}
+
+    def create_layer(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        name = params.get("name")
+        if name is None or any(layer["name"] == name for layer in self.layers.values()):
+            # Rhino refuses the layer and the plugin serializes the missing result
+            raise ValueError(_NULL_REFERENCE)
+        color = params.get("color")
+        parent = _EMPTY_ID
+        if "parent" in params:
+            parent_layer = self._find_layer({"name": params["parent"]})
+            if parent_layer is not None:
+                parent = parent_layer["id"]
+        layer = {
+            "id": str(uuid.uuid4()),
+            "name": name,
+            "color": {"r": color[0], "g": color[1], "b": color[2]} if color else {"r": 0, "g": 0, "b": 0},
+            "parent": parent,
+            "visible": True,
+            "locked": False,
+        }
+        self.layers[layer["id"]] = layer
+        self.emit("layer_added", _layer_summary(layer))
+        return _serialize_layer(layer)
+
+    def get_or_set_current_layer(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        layer = self._find_layer(params)
+        if layer is not None:
+            self.current_layer = layer["id"]
+        else:
+            layer = self.layers[self.current_layer]
+        return _serialize_layer(layer)
+
+    def delete_layer(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        layer = self._find_layer(params)
+        if layer is None:
+            return {"success": False, "message": "Layer not found"}
+        # Rhino does not delete the current layer or one with objects on it,
+        # but the plugin reports success either way
+        in_use = any(obj["layer"] == layer["name"] for obj in self.objects.values())
+        if layer["id"] != self.current_layer and not in_use:
+            del self.layers[layer["id"]]
+            self.emit("layer_deleted", {"id": layer["id"]})
+        return {"success": True, "message": f"Layer {layer['name']} deleted"}
+
+    def _no_grasshopper(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        raise ValueError("Grasshopper is not available in the fake Rhino server")
+
+    # Document events
+
+    def subscribe(self, client: _ClientHandler, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Start pushing document events to a client, as the plugin's subscribe command does"""
+        if not client.events:
+            response = {"status": "error", "message": "Document events were not negotiated"}
+        else:
+            if client not in self._subscribers:
+                self._subscribers.append(client)
+            response = {"status": "success", "result": {"layers": [_layer_summary(layer) for layer in self.layers.values()]}}
+        if "id" in command:
+            response["id"] = command["id"]
+        return response
+
+    def unsubscribe(self, client: _ClientHandler):
+        with self.lock:
+            if client in self._subscribers:
+                self._subscribers.remove(client)
+
+    def emit(self, event: str, data: Dict[str, Any]):
+        """Push a document event to every subscribed client"""
+        with self.lock:
+            for client in list(self._subscribers):
+                try:
+                    client.send({"event": event, "data": data})
+                except OSError:
+                    self._subscribers.remove(client)
+
+    def add_object(self, **attributes: Any) -> str:
+        """Add an object as if it was drawn in Rhino and return its id"""
+        with self.lock:
+            obj = self._object(self._next_serial)
+            obj["id"] = str(uuid.uuid4())
+            obj.update(attributes)
+            self._insert(obj)
+            self.emit("object_added", _project(obj, DOCUMENT_OBJECT_FIELDS))
+            return obj["id"]
+
+    def modify_object(self, object_id: str, **attributes: Any):
+        with self.lock:
+            obj = self.objects[self._ids[object_id]]
+            obj.update(attributes)
+            self.emit("object_modified", _project(obj, DOCUMENT_OBJECT_FIELDS))
+
+    def delete_object(self, object_id: str):
+        with self.lock:
+            self._remove(object_id)
+
+
+def _project(obj: Dict[str, Any], fields) -> Dict[str, Any]:
+    return {key: value for key, value in obj.items() if key in fields}
+
+
+def _round(point: Point) -> Point:
+    return [round(value, 2) for value in point]
+
+
+def _bounds(points: Iterable[Point]) -> List[Point]:
+    points = list(points)
+    return [[min(point[axis] for point in points) for axis in range(3)], [max(point[axis] for point in points) for axis in range(3)]]
+
+
+def _shape(object_type: str, params: Dict[str, Any]) -> Tuple[List[Point], int, str]:
+    """Points spanning the geometry a creation would add, its degree and the type Rhino reports"""
+    def point(value) -> Point:
+        return [float(value[0]), float(value[1]), float(value[2])]
+
+    def ring(center: Point, radius_x: float, radius_y: float, angle: float = 2 * math.pi) -> List[Point]:
+        steps = 8
+        return [[center[0] + radius_x * math.cos(angle * k / steps), center[1] + radius_y * math.sin(angle * k / steps), center[2]] for k in range(steps + 1)]
+
+    if object_type == "POINT":
+        return [[float(params.get("x", 0)), float(params.get("y", 0)), float(params.get("z", 0))]], 0, "POINT"
+    if object_type == "LINE":
+        return [point(params["start"]), point(params["end"])], 1, "LINE"
+    if object_type == "POLYLINE":
+        return [point(value) for value in params["points"]], 1, "POLYLINE"
+    if object_type == "CIRCLE":
+        radius = float(params["radius"])
+        return ring(point(params["center"]), radius, radius), 2, "Curve"
+    if object_type == "ARC":
+        radius = float(params["radius"])
+        return ring(point(params["center"]), radius, radius, math.radians(float(params["angle"]))), 2, "Curve"
+    if object_type == "ELLIPSE":
+        return ring(point(params["center"]), float(params["radius_x"]), float(params["radius_y"])), 2, "Curve"
+    if object_type == "CURVE":
+        points = [point(value) for value in params["points"]]
+        degree = int(params.get("degree") or 0)
+        if len(points) <= degree or degree < 1:
+            raise ValueError("unable to create control point curve from given points")
+        return points, degree, "Curve"
+    if object_type == "BOX":
+        half = [float(params["width"]) / 2, float(params["length"]) / 2, float(params["height"]) / 2]
+        return [[-half[0], -half[1], -half[2]], half], 0, "Brep"
+    if object_type == "SPHERE":
+        radius = float(params["radius"])
+        return [[-radius] * 3, [radius] * 3], 0, "Brep"
+    if object_type in ("CONE", "CYLINDER"):
+        radius = float(params["radius"])
+        return [[-radius, -radius, 0.0], [radius, radius, float(params["height"])]], 0, "Brep"
+    if object_type == "SURFACE":
+        return [point(value) for value in params["points"]], 0, "Surface"
+    raise ValueError("Invalid object type")
+
+
+def _rows(params: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    """The per-object values of a columnar command, with the shared transforms and name filled in"""
+    count = int(params.get("count") or 0)
+    columns = params.get("columns") or {}
+    names = params.get("names")
+    for key, column in columns.items():
+        if len(column) != count:
+            raise ValueError(f"Column has {len(column)} rows for {count} objects")
+    if names is not None and len(names) != count:
+        raise ValueError(f"Got {len(names)} names for {count} objects")
+
+    shared = {key: params[key] for key in _TRANSFORM_KEYS if key in params}
+    for index in range(count):
+        row = dict(shared, name=names[index] if names is not None else params.get("name"))
+        for key, column in columns.items():
+            value = column[index]
+            # One-dimensional columns arrive as numbers, as rows of one when sent as lists of lists
+            row[key] = value[0] if isinstance(value, list) and len(value) == 1 else value
+        yield row
+
+
+def _memory_estimate(points: List[Point]) -> int:
+    """A made up size for geometry spanning ``points``, standing in for ``RhinoObject.MemoryEstimate``"""
+    return 1024 + 64 * len(points)
+
+
+def _transform(params: Dict[str, Any], box: List[Point]) -> Callable[[Point], Point] | None:
+    """The point mapping of a modification, in the order ``ModifyObject`` combines them.
+
+    Rotation turns around the bounding box center and scaling is anchored at
+    its minimum, both taken before the modification.
+    """
+    rotation, scale, translation = params.get("rotation"), params.get("scale"), params.get("translation")
+    if rotation is None and scale is None and translation is None:
+        return None
+    center = [(box[0][axis] + box[1][axis]) / 2 for axis in range(3)]
+    anchor = box[0]
+
+    def apply(point: Point) -> Point:
+        x, y, z = point
+        if rotation is not None:
+            x, y, z = x - center[0], y - center[1], z - center[2]
+            angle_x, angle_y, angle_z = rotation
+            # The plugin multiplies X, Y and Z rotations in that order, so Z turns first
+            x, y = x * math.cos(angle_z) - y * math.sin(angle_z), x * math.sin(angle_z) + y * math.cos(angle_z)
+            x, z = x * math.cos(angle_y) + z * math.sin(angle_y), -x * math.sin(angle_y) + z * math.cos(angle_y)
+            y, z = y * math.cos(angle_x) - z * math.sin(angle_x), y * math.sin(angle_x) + z * math.cos(angle_x)
+            x, y, z = x + center[0], y + center[1], z + center[2]
+        if scale is not None:
+            x, y, z = (anchor[0] + (x - anchor[0]) * scale[0], anchor[1] + (y - anchor[1]) * scale[1], anchor[2] + (z - anchor[2]) * scale[2])
+        if translation is not None:
+            x, y, z = x + translation[0], y + translation[1], z + translation[2]
+        return [x, y, z]
+
+    return apply
+
+
+def _matrix_transform(matrix: List[float]) -> Callable[[Point], Point]:
+    """The point mapping of a row-major 4x4 matrix, or of its first three rows"""
+    rows = [matrix[0:4], matrix[4:8], matrix[8:12], matrix[12:16] or [0.0, 0.0, 0.0, 1.0]]
+
+    def apply(point: Point) -> Point:
+        x, y, z, w = (row[0] * point[0] + row[1] * point[1] + row[2] * point[2] + row[3] for row in rows)
+        return [x / w, y / w, z / w]
+
+    return apply
+
+
+def _color_name(color: Dict[str, int]) -> str:
+    # What System.Drawing.Color.ToString() gives for the layer colors Rhino hands out
+    if (color["r"], color["g"], color["b"]) == (0, 0, 0):
+        return "Color [Black]"
+    return f"Color [A=255, R={color['r']}, G={color['g']}, B={color['b']}]"
+
+
+def _layer_summary(layer: Dict[str, Any]) -> Dict[str, Any]:
+    """The layer as ``Serializer.LayerSummary`` describes it"""
+    return {"id": layer["id"], "name": layer["name"], "color": _color_name(layer["color"]), "visible": layer["visible"], "locked": layer["locked"]}
+
+
+def _serialize_layer(layer: Dict[str, Any]) -> Dict[str, Any]:
+    """The layer as ``Serializer.SerializeLayer`` describes it"""
+    return {"id": layer["id"], "name": layer["name"], "color": dict(layer["color"]), "parent": layer["parent"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake Rhino document on the plugin's port")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=RHINO_PORT)
+    parser.add_argument("--objects", type=int, default=0, help="objects the document starts with")
+    parser.add_argument("--points-per-object", type=int, default=0, help="make the objects polylines with this many points")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of UI-thread work per command")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many seconds added to the latency")
+    parser.add_argument("--padding", type=int, default=0, help="bytes of filler added to every result")
+    parser.add_argument("--legacy", action="store_true", help="behave like a plugin without framing negotiation")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    server = FakeRhinoServer(
+        args.host, args.port, framing=not args.legacy, object_count=args.objects,
+        points_per_object=args.points_per_object, latency=args.latency, jitter=args.jitter, padding=args.padding,
+    )
+    with server:
+        logger.info(f"Fake Rhino listening on {server.address[0]}:{server.address[1]}, Ctrl+C to stop")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
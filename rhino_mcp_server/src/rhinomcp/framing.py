@@ -0,0 +1,211 @@
+"""Wire framing shared by the Rhino connection and the stand-in plugin server.
+
+Two framings are spoken on the plugin socket:
+
+- ``legacy``: bare UTF-8 JSON documents written back to back. This is what
+  every plugin release understands and what a connection starts in.
+- ``length``: every message is prefixed with a 5 byte header, a big-endian
+  ``uint32`` payload length followed by a ``uint8`` flags field.
+
+A client that prefers ``length`` sends a ``hello`` command in legacy framing
+right after connecting. A plugin that knows about framing replies with the
+framing it picked and both sides switch after that reply; an older plugin
+answers with an "Unknown command type" error and the connection simply stays
+on legacy framing.
+
+The hello also negotiates optional protocol features. With ``request_id`` a
+command may carry an ``id`` that the plugin echoes in its reply, which lets a
+client keep several commands in flight on one socket. With ``binary_arrays``
+point lists may travel packed as base64 blocks, see ``rhinomcp.arrays``.
+With ``zlib`` either side may compress a large frame's payload, which it
+marks with the ``FLAG_COMPRESSED`` bit in the header's flags field.
+With ``events`` a client may send ``subscribe_document_events``, after which
+the plugin pushes ``{"event": ..., "data": ...}`` messages whenever the
+document changes, see ``rhinomcp.mirror``.
+"""
+
+import json
+import re
+import struct
+import zlib
+from typing import Any, Callable, Dict, List, Tuple
+
+PROTOCOL_VERSION = 1
+
+FRAMING_LEGACY = "legacy"
+FRAMING_LENGTH = "length"
+
+# ">IB": payload length, flags
+HEADER = struct.Struct(">IB")
+MAX_FRAME_SIZE = 1 << 31
+
+HELLO_COMMAND = "hello"
+SUBSCRIBE_COMMAND = "subscribe_document_events"
+
+FEATURE_REQUEST_ID = "request_id"
+FEATURE_BINARY_ARRAYS = "binary_arrays"
+FEATURE_ZLIB = "zlib"
+FEATURE_EVENTS = "events"
+
+FLAG_COMPRESSED = 0x01
+
+# Smaller payloads gain little from compression and would only cost CPU time
+COMPRESSION_THRESHOLD = 4096
+# Level 1 already shrinks the repetitive JSON of document dumps by around 90%
+COMPRESSION_LEVEL = 1
+
+
+def encode_frame(payload: bytes, flags: int = 0) -> bytes:
+    """Prefix a payload with the length framing header"""
+    if len(payload) >= MAX_FRAME_SIZE:
+        raise ValueError(f"Frame too large ({len(payload)} bytes)")
+    return HEADER.pack(len(payload), flags) + payload
+
+
+def hello_params(framings: List[str], features: List[str] = []) -> Dict[str, Any]:
+    """Parameters of the ``hello`` command sent when a connection is opened"""
+    return {"protocol": PROTOCOL_VERSION, "framing": list(framings), "features": list(features)}
+
+
+def negotiate(params: Dict[str, Any], supported: List[str], features: List[str] = []) -> Dict[str, Any]:
+    """Pick the framing and features for a ``hello`` request, as the plugin does.
+
+    The first framing the client asked for that we also support wins; legacy
+    is always acceptable. Features are only granted on length framing, since
+    legacy framing cannot carry more than one command in flight.
+    """
+    framing = FRAMING_LEGACY
+    for candidate in params.get("framing") or []:
+        if candidate in supported:
+            framing = candidate
+            break
+    granted = []
+    if framing != FRAMING_LEGACY:
+        granted = [feature for feature in params.get("features") or [] if feature in features]
+    return {"protocol": PROTOCOL_VERSION, "framing": framing, "features": granted}
+
+
+class FrameDecoder:
+    """Incrementally split a byte stream into length-prefixed frames"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[Tuple[int, bytes]]:
+        """Add received bytes and return every ``(flags, payload)`` frame completed by them"""
+        self._buffer += data
+        frames = []
+        offset = 0
+        while len(self._buffer) - offset >= HEADER.size:
+            length, flags = HEADER.unpack_from(self._buffer, offset)
+            end = offset + HEADER.size + length
+            if len(self._buffer) < end:
+                break
+            frames.append((flags, bytes(self._buffer[offset + HEADER.size:end])))
+            offset = end
+        if offset:
+            del self._buffer[:offset]
+        return frames
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered bytes that do not form a complete frame yet"""
+        return len(self._buffer)
+
+
+# Outside a string only brackets and quotes matter, inside a string only quotes
+# and escapes do, so the scanner can skip everything else in a single regex step.
+_STRUCTURAL = re.compile(rb'[{}\[\]"]')
+_IN_STRING = re.compile(rb'["\\]')
+
+
+class LegacyDecoder:
+    """Incrementally split a stream of concatenated JSON documents.
+
+    Instead of re-parsing the whole buffer after every ``recv`` this keeps
+    track of bracket depth and string state across calls, so every byte is
+    scanned once and ``json.loads`` only runs on complete documents.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._scanned = 0
+        self._start = 0
+        self._depth = 0
+        self._in_string = False
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Add received bytes and return every JSON document completed by them"""
+        self._buffer += data
+        documents = []
+        pos = self._scanned
+        buffer = self._buffer
+        while True:
+            if self._in_string:
+                match = _IN_STRING.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == b"\\":
+                    if match.end() >= len(buffer):
+                        # Escape split across reads, look at it again next time
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                continue
+
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            char = match.group()
+            pos = match.end()
+            if char == b'"':
+                self._in_string = True
+            elif char in (b"{", b"["):
+                if self._depth == 0:
+                    self._start = match.start()
+                self._depth += 1
+            elif self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    documents.append(bytes(buffer[self._start:pos]))
+                    del buffer[:pos]
+                    pos = 0
+                    self._start = 0
+        self._scanned = pos
+        return documents
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered bytes that do not form a complete document yet"""
+        return len(self._buffer)
+
+
+def encode_message(message: Dict[str, Any], framing: str, compress: bool = False) -> bytes:
+    """Serialize a message and frame it for the given framing"""
+    return frame_payload(json.dumps(message).encode("utf-8"), framing, compress)
+
+
+def frame_payload(payload: bytes, framing: str, compress: bool = False) -> bytes:
+    """Frame a serialized message, compressing it if allowed and worth it"""
+    if framing != FRAMING_LENGTH:
+        return payload
+    if compress and len(payload) >= COMPRESSION_THRESHOLD:
+        return encode_frame(zlib.compress(payload, COMPRESSION_LEVEL), FLAG_COMPRESSED)
+    return encode_frame(payload)
+
+
+def unpack_payload(flags: int, payload: bytes) -> bytes:
+    """Undo what the header flags say was applied to a frame's payload"""
+    if flags & FLAG_COMPRESSED:
+        return zlib.decompress(payload)
+    return payload
+
+
+def decode_message(payload: bytes, object_hook: Callable[[Dict[str, Any]], Any] | None = None) -> Dict[str, Any]:
+    """Parse a complete message payload received from the wire"""
+    return json.loads(payload.decode("utf-8"), object_hook=object_hook)
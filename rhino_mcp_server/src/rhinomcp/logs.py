@@ -0,0 +1,153 @@
+"""Logging of the traffic with Rhino that stays cheap on the hot path.
+
+Command parameters can be a 50000 point surface or a long script, so they
+are never put into a log message as they are:
+
+- ``summarize`` replaces long lists, strings and mappings by their size and
+  a few leading items.
+- ``Lazy`` defers that work until a handler actually writes the record, so
+  a disabled level costs nothing but the level check.
+- Structured fields travel in the record's ``fields`` attribute, the
+  ``JsonLinesFormatter`` writes them as keys of their own.
+
+``configure_logging`` sets the level of the ``RhinoMCPServer`` logger,
+samples the chatty records and optionally adds a rotating JSON lines file:
+
+    configure_logging("DEBUG", file="rhinomcp.jsonl", sample_rate=0.1)
+"""
+
+import json
+import logging
+import logging.handlers
+import random
+from typing import Any, Callable, Dict
+
+LOGGER_NAME = "RhinoMCPServer"
+
+# What survives of a large value in a summary
+MAX_ITEMS = 3
+MAX_STRING = 200
+MAX_DEPTH = 4
+
+
+def summarize(value: Any, depth: int = 0) -> Any:
+    """A small JSON compatible stand-in for ``value``.
+
+    Lists longer than ``MAX_ITEMS`` keep their first items and their length,
+    strings are cut at ``MAX_STRING`` characters, nesting below
+    ``MAX_DEPTH`` is reduced to the type and size.
+    """
+    if isinstance(value, str):
+        if len(value) <= MAX_STRING:
+            return value
+        return f"{value[:MAX_STRING]}... ({len(value)} chars)"
+    if isinstance(value, (bytes, bytearray)):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, dict):
+        if depth >= MAX_DEPTH:
+            return f"<dict of {len(value)} keys>"
+        if len(value) <= MAX_ITEMS * 4:
+            return {str(key): summarize(item, depth + 1) for key, item in value.items()}
+        summary = {str(key): summarize(item, depth + 1) for key, item in list(value.items())[:MAX_ITEMS]}
+        summary["..."] = f"{len(value) - MAX_ITEMS} more keys"
+        return summary
+    if isinstance(value, (list, tuple)):
+        if depth >= MAX_DEPTH:
+            return f"<list of {len(value)} items>"
+        if len(value) <= MAX_ITEMS:
+            return [summarize(item, depth + 1) for item in value]
+        return [summarize(item, depth + 1) for item in value[:MAX_ITEMS]] + [f"... {len(value) - MAX_ITEMS} more items"]
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return summarize(str(value), depth)
+
+
+class Lazy:
+    """A value computed only when a log record is formatted, and then only once"""
+
+    __slots__ = ("_compute", "_value", "_done")
+
+    def __init__(self, compute: Callable[[], Any]):
+        self._compute = compute
+        self._value = None
+        self._done = False
+
+    @property
+    def value(self) -> Any:
+        if not self._done:
+            self._value = self._compute()
+            self._done = True
+        return self._value
+
+    def __str__(self) -> str:
+        value = self.value
+        return value if isinstance(value, str) else json.dumps(value, default=str)
+
+
+def lazy_summary(value: Any) -> Lazy:
+    """``summarize(value)``, computed when the record is written"""
+    return Lazy(lambda: summarize(value))
+
+
+def log(logger: logging.Logger, level: int, message: str, *args: Any, **fields: Any):
+    """Log a %-style message with structured fields, doing nothing at all when ``level`` is disabled"""
+    if logger.isEnabledFor(level):
+        logger.log(level, message, *args, extra={"fields": fields})
+
+
+class SamplingFilter(logging.Filter):
+    """Lets through a ``rate`` fraction of the records below ``keep_level``, and every record at or above it"""
+
+    def __init__(self, rate: float = 1.0, keep_level: int = logging.WARNING):
+        super().__init__()
+        self.rate = rate
+        self.keep_level = keep_level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= self.keep_level or self.rate >= 1.0 or random.random() < self.rate
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, structured fields included"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in getattr(record, "fields", {}).items():
+            entry[key] = value.value if isinstance(value, Lazy) else value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(
+    level: int | str = logging.INFO,
+    file: str | None = None,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    sample_rate: float = 1.0,
+) -> logging.Logger:
+    """Set up the ``RhinoMCPServer`` logger.
+
+    Parameters:
+    - level: Records below it are dropped before any formatting.
+    - file: Also write JSON lines to this file, rotated at ``max_bytes``
+      with ``backup_count`` old files kept.
+    - sample_rate: Fraction of the records below WARNING that are written.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    for existing in list(logger.filters):
+        if isinstance(existing, SamplingFilter):
+            logger.removeFilter(existing)
+    if sample_rate < 1.0:
+        logger.addFilter(SamplingFilter(sample_rate))
+    if file:
+        handler = logging.handlers.RotatingFileHandler(file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        handler.setFormatter(JsonLinesFormatter())
+        logger.addHandler(handler)
+    return logger
@@ -0,0 +1,210 @@
+"""Counters and histograms of the traffic with Rhino and of the MCP tools.
+
+Every command sent through a ``RhinoConnectionPool`` records its calls,
+errors and latency, retries and cache hits included. The connections add the
+size of each request and response and the time spent encoding and decoding
+their JSON. Every tool call records its calls, errors and latency. All of it
+lands in the process-wide ``METRICS``:
+
+    METRICS.as_dict()                      # what the get_server_metrics tool returns
+    METRICS.write_prometheus("rhinomcp.prom")  # text format, e.g. for node_exporter
+
+Latencies are in seconds and sizes in bytes. Histograms have fixed buckets,
+so recording is a bisect and two additions and percentiles are estimates
+within a bucket.
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Sequence
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+
+class Histogram:
+    """Counts of observations at or below each bucket bound, plus their sum"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, fraction: float) -> float:
+        """Upper bound of the bucket the given fraction of observations falls in"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class CommandMetrics:
+    """What was recorded for one command type"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.request_bytes = Histogram(SIZE_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+        self.encode_seconds = 0.0
+        self.decode_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency_s": self.latency.as_dict(),
+            "request_bytes": self.request_bytes.as_dict(),
+            "response_bytes": self.response_bytes.as_dict(),
+            "encode_s": self.encode_seconds,
+            "decode_s": self.decode_seconds,
+        }
+
+
+class ToolMetrics:
+    """What was recorded for one MCP tool"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "errors": self.errors, "latency_s": self.latency.as_dict()}
+
+
+class Metrics:
+    """Registry of the command and tool metrics of the process"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.commands: Dict[str, CommandMetrics] = {}
+        self.tools: Dict[str, ToolMetrics] = {}
+        # Where get_server_metrics also writes the Prometheus text, set by the operator and never by a tool call
+        self.prometheus_file: str | None = None
+
+    def command(self, command_type: str) -> CommandMetrics:
+        metrics = self.commands.get(command_type)
+        if metrics is None:
+            metrics = self.commands.setdefault(command_type, CommandMetrics())
+        return metrics
+
+    def tool(self, name: str) -> ToolMetrics:
+        metrics = self.tools.get(name)
+        if metrics is None:
+            metrics = self.tools.setdefault(name, ToolMetrics())
+        return metrics
+
+    @contextmanager
+    def time_command(self, command_type: str) -> Iterator[None]:
+        """Count a call of a command and its latency, and an error if the block raises"""
+        metrics = self.command(command_type)
+        metrics.calls += 1
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            metrics.errors += 1
+            raise
+        finally:
+            metrics.latency.observe(time.perf_counter() - started)
+
+    def count_tool(self, name: str, seconds: float, failed: bool):
+        """Count one call of a tool"""
+        metrics = self.tool(name)
+        metrics.calls += 1
+        if failed:
+            metrics.errors += 1
+        metrics.latency.observe(seconds)
+
+    def reset(self):
+        self.started = time.time()
+        self.commands.clear()
+        self.tools.clear()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "uptime_s": time.time() - self.started,
+            "commands": {name: metrics.as_dict() for name, metrics in sorted(self.commands.items())},
+            "tools": {name: metrics.as_dict() for name, metrics in sorted(self.tools.items())},
+        }
+
+    def prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+
+        def counter(name: str, help_text: str, label: str, values: Dict[str, float]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in values.items():
+                lines.append(f'{name}{{{label}="{_escape(key)}"}} {_number(value)}')
+
+        def histogram(name: str, help_text: str, label: str, values: Dict[str, Histogram]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, hist in values.items():
+                labels = f'{label}="{_escape(key)}"'
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{_number(bound)}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+                lines.append(f"{name}_sum{{{labels}}} {_number(hist.sum)}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+        commands = dict(sorted(self.commands.items()))
+        tools = dict(sorted(self.tools.items()))
+        counter("rhinomcp_command_calls_total", "Commands sent to Rhino.", "command", {k: m.calls for k, m in commands.items()})
+        counter("rhinomcp_command_errors_total", "Commands that failed.", "command", {k: m.errors for k, m in commands.items()})
+        histogram("rhinomcp_command_latency_seconds", "Time until a command's result, retries included.", "command", {k: m.latency for k, m in commands.items()})
+        histogram("rhinomcp_command_request_bytes", "Size of the serialized requests.", "command", {k: m.request_bytes for k, m in commands.items()})
+        histogram("rhinomcp_command_response_bytes", "Size of the serialized responses.", "command", {k: m.response_bytes for k, m in commands.items()})
+        counter("rhinomcp_command_encode_seconds_total", "Time spent encoding requests.", "command", {k: m.encode_seconds for k, m in commands.items()})
+        counter("rhinomcp_command_decode_seconds_total", "Time spent decoding responses.", "command", {k: m.decode_seconds for k, m in commands.items()})
+        counter("rhinomcp_tool_calls_total", "MCP tool calls.", "tool", {k: m.calls for k, m in tools.items()})
+        counter("rhinomcp_tool_errors_total", "MCP tool calls that failed.", "tool", {k: m.errors for k, m in tools.items()})
+        histogram("rhinomcp_tool_latency_seconds", "Duration of MCP tool calls.", "tool", {k: m.latency for k, m in tools.items()})
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Write ``prometheus()`` to a file, replacing it atomically so scrapers never see half of it"""
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "w") as f:
+            f.write(self.prometheus())
+        os.replace(temporary, path)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+METRICS = Metrics()
@@ -0,0 +1,187 @@
+"""An in-process replica of the Rhino document's object and layer tables.
+
+``DocumentMirror`` keeps a dedicated connection to the plugin subscribed to
+document events. It loads the object table once through
+``get_document_objects`` and from then on applies the add, modify and delete
+events the plugin pushes, so lookups by id or name and counts are answered
+locally instead of waiting for Rhino's UI thread:
+
+    mirror = DocumentMirror(RHINO_HOST, RHINO_PORT)
+    await mirror.start()
+    mirror.get_object(object_id)
+    mirror.find_by_name("Box 1")
+    mirror.count(layer="Walls")
+    mirror.find({"and": [{"field": "layer", "eq": "Walls"}, {"field": "name", "prefix": "Panel"}]})
+
+The mirror is a library for scripts for now: the MCP server does not start
+one and its tools still ask Rhino. ``get_object_info`` returns geometry and
+user attributes the mirror does not hold, and ``select_objects`` has to
+select in Rhino anyway. A script that also reads through a connection pool
+should drop the pool's cached reads on every change it is told about:
+
+    mirror = DocumentMirror(RHINO_HOST, RHINO_PORT, on_change=lambda event: pool.cache.invalidate())
+
+The plugin writes events and replies on the same connection from the UI
+thread, so a page of the snapshot already includes every change whose event
+arrived before it, and events after it are newer. Either way the state an
+event carries is at least as recent as what a page says about the same
+object, so while loading, objects an event already touched are skipped.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Set
+
+from rhinomcp.async_connection import AsyncRhinoConnection
+from rhinomcp.documents import DOCUMENT_OBJECT_FIELDS, iter_document_objects
+from rhinomcp.errors import RhinoConnectionError
+from rhinomcp.framing import FEATURE_EVENTS, SUBSCRIBE_COMMAND
+from rhinomcp.query import FIELDS, AttributeIndex, object_keys
+
+logger = logging.getLogger("RhinoMCPServer")
+
+SNAPSHOT_PAGE_SIZE = 2000
+
+
+class DocumentMirror:
+    """Local copy of the document's objects and layers, kept current by push events.
+
+    Objects are stored with the fields of ``DOCUMENT_OBJECT_FIELDS``; geometry
+    and user attributes still need ``get_object_info``. ``on_change`` is
+    called with each applied event; nothing is connected to it by default,
+    pass one to invalidate a ``ResponseCache``.
+    """
+
+    def __init__(self, host: str, port: int, on_change: Callable[[Dict[str, Any]], None] | None = None):
+        self.host = host
+        self.port = port
+        self.on_change = on_change
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self.layers: Dict[str, Dict[str, Any]] = {}
+        self._index = AttributeIndex()
+        self._connection: AsyncRhinoConnection | None = None
+        self._loaded = False
+        self._events_applied = 0
+        self._resyncs = 0
+        self._reload_task: asyncio.Task | None = None
+        # Objects changed by events while a snapshot is loading
+        self._touched: Set[str] | None = None
+
+    @property
+    def synced(self) -> bool:
+        """Whether the mirror holds the whole document and is receiving its changes"""
+        return self._loaded and self._connection is not None and self._connection.connected
+
+    async def start(self):
+        """Connect, subscribe to document events and load the snapshot"""
+        connection = AsyncRhinoConnection(self.host, self.port)
+        if not await connection.connect():
+            raise RhinoConnectionError("Could not connect to Rhino. Make sure the Rhino addon is running.")
+        if FEATURE_EVENTS not in connection.features:
+            await connection.disconnect()
+            raise RhinoConnectionError("The Rhino plugin does not support document events, update it to use the mirror")
+
+        self._connection = connection
+        connection.event_handlers.append(self._on_event)
+        await self._load()
+
+    async def stop(self):
+        if self._reload_task is not None:
+            self._reload_task.cancel()
+            self._reload_task = None
+        if self._connection is not None:
+            await self._connection.disconnect()
+            self._connection = None
+        self._loaded = False
+
+    async def resync(self):
+        """Start over from a fresh snapshot, e.g. after the connection was lost"""
+        await self.stop()
+        self._resyncs += 1
+        await self.start()
+
+    async def _load(self):
+        """Subscribe and load the snapshot, events may arrive as soon as the subscription is sent"""
+        self._loaded = False
+        self.objects.clear()
+        self._index.clear()
+        self._touched = set()
+        try:
+            subscription = await self._connection.send_command(SUBSCRIBE_COMMAND)
+            self.layers = {layer["id"]: layer for layer in subscription.get("layers", [])}
+            async for obj in iter_document_objects(self._connection, DOCUMENT_OBJECT_FIELDS, SNAPSHOT_PAGE_SIZE):
+                # Pages are prefetched, so an event may have been applied after this page arrived
+                if obj["id"] not in self._touched:
+                    self._put(obj)
+        finally:
+            self._touched = None
+        self._loaded = True
+        logger.info(f"Document mirror loaded {len(self.objects)} objects and {len(self.layers)} layers")
+
+    def _put(self, obj: Dict[str, Any]):
+        self._drop(obj["id"])
+        self.objects[obj["id"]] = obj
+        self._index.add(obj["id"], object_keys(obj))
+
+    def _drop(self, object_id: str):
+        if self.objects.pop(object_id, None) is not None:
+            self._index.remove(object_id)
+
+    def _on_event(self, message: Dict[str, Any]):
+        event, data = message.get("event"), message.get("data") or {}
+        if self._touched is not None and event in ("object_added", "object_modified", "object_deleted"):
+            self._touched.add(data["id"])
+        if event in ("object_added", "object_modified"):
+            self._put(data)
+        elif event == "object_deleted":
+            self._drop(data["id"])
+        elif event in ("layer_added", "layer_modified"):
+            self.layers[data["id"]] = data
+        elif event == "layer_deleted":
+            self.layers.pop(data["id"], None)
+        elif event == "document_reset":
+            # Another document was opened, the tables have to be loaded again
+            self._reload_task = asyncio.ensure_future(self._reload())
+        else:
+            logger.warning(f"Ignoring unknown document event {event}")
+            return
+        self._events_applied += 1
+        if self.on_change is not None:
+            self.on_change(message)
+
+    async def _reload(self):
+        try:
+            await self._load()
+        except Exception as e:
+            logger.error(f"Failed to reload the document mirror: {str(e)}")
+
+    def get_object(self, object_id: str) -> Dict[str, Any] | None:
+        return self.objects.get(object_id)
+
+    def find_by_name(self, name: str) -> List[Dict[str, Any]]:
+        return self.find({"field": "name", "eq": name})
+
+    def find(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Objects matching an attribute query, see ``rhinomcp.query``.
+
+        User strings are not mirrored, so fields other than name, layer,
+        color and type match nothing.
+        """
+        return [self.objects[object_id] for object_id in self._index.find(query)]
+
+    def count(self, **filters: Any) -> int:
+        """Number of objects whose fields equal all the given values, e.g. ``count(layer="Walls")``"""
+        if not filters:
+            return len(self.objects)
+        if set(filters) <= set(FIELDS):
+            return len(self._index.find({"and": [{"field": key, "eq": value} for key, value in filters.items()]}))
+        return sum(1 for obj in self.objects.values() if all(obj.get(key) == value for key, value in filters.items()))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "synced": self.synced,
+            "objects": len(self.objects),
+            "layers": len(self.layers),
+            "events_applied": self._events_applied,
+            "resyncs": self._resyncs,
+        }
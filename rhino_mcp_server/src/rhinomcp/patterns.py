@@ -0,0 +1,284 @@
+"""Procedural arrays of objects from a compact pattern spec.
+
+Instead of working out every position itself, a caller describes the
+arrangement and how size and color change across it:
+
+    columns = array_columns(
+        {"kind": "grid", "count": [6, 6, 6], "spacing": 15},
+        params={"width": 1, "length": 1, "height": 1},
+        size={"along": "radial", "from": 10, "to": 0, "range": [0, 75]},
+        color={"along": "radial", "from": [0, 0, 255], "to": [255, 0, 0], "range": [0, 75]},
+    )
+    results = await create_objects_columnar(pool, "BOX", **columns)
+
+The pattern is expanded here and sent to Rhino as the columns of one
+``create_objects_columnar`` command per chunk.
+
+Patterns, all around ``center`` (default the origin):
+
+- ``grid``: ``count`` as ``n`` or ``[nx, ny, nz]``, ``spacing`` as a number
+  or ``[sx, sy, sz]``, centered on ``center``.
+- ``polar``: ``count`` objects on a circle of ``radius``, from
+  ``start_angle`` over ``sweep`` degrees (360), ``rise`` higher each for a helix.
+- ``spiral``: ``count`` objects on a golden-angle (Fibonacci) spiral, the
+  n-th at ``spacing * sqrt(n)`` from the center and ``angle`` degrees
+  (137.508) on from the previous one, ``rise`` higher each.
+- ``curve``: ``count`` objects evenly spaced along the curve through the
+  control ``points`` of ``degree`` (3), as the ``CURVE`` type draws it.
+
+A gradient maps a coordinate of each object to a value:
+``{"along": "x" | "y" | "z" | "radial" | "index", "from": a, "to": b}``.
+The coordinate runs over ``range``, by default its extent over the array,
+and is eased by ``function``: ``linear`` (default), ``smooth``, ``ease_in``
+or ``ease_out``. ``size`` is a number, a gradient or a list of gradients
+that multiply, and scales the size params (``width``, ``radius``, ...).
+``color`` is ``[r, g, b]`` or a gradient between two colors.
+"""
+
+import math
+from typing import Any, Callable, Dict, List, Sequence
+
+Point = List[float]
+
+KINDS = ("grid", "polar", "spiral", "curve")
+
+# Params of create_object that are lengths, and scale with an object's size
+SIZE_PARAMS = ("width", "length", "height", "radius", "radius_x", "radius_y")
+
+GOLDEN_ANGLE = 180.0 * (3.0 - math.sqrt(5.0))
+
+EASINGS: Dict[str, Callable[[float], float]] = {
+    "linear": lambda t: t,
+    "smooth": lambda t: t * t * (3.0 - 2.0 * t),
+    "ease_in": lambda t: t * t,
+    "ease_out": lambda t: 1.0 - (1.0 - t) * (1.0 - t),
+}
+
+# A spec can ask for any number of objects, this keeps a typo from filling the document
+MAX_ARRAY_OBJECTS = 1_000_000
+
+# Samples per object when measuring a curve's length
+_CURVE_SAMPLES = 32
+
+
+def _vector(value: Any, default: float) -> Point:
+    if value is None:
+        return [default] * 3
+    if isinstance(value, (int, float)):
+        return [float(value)] * 3
+    values = [float(x) for x in value]
+    return values + [default] * (3 - len(values))
+
+
+def _count(value: Any) -> int:
+    count = int(value or 0)
+    if count < 0 or count > MAX_ARRAY_OBJECTS:
+        raise ValueError(f"count must be between 0 and {MAX_ARRAY_OBJECTS}")
+    return count
+
+
+def grid_positions(pattern: Dict[str, Any]) -> List[Point]:
+    counts = pattern.get("count", 1)
+    if isinstance(counts, (int, float)):
+        counts = [counts]
+    counts = [int(n) for n in counts] + [1] * (3 - len(counts))
+    _count(counts[0] * counts[1] * counts[2])
+    spacing = _vector(pattern.get("spacing"), 1.0)
+    center = _vector(pattern.get("center"), 0.0)
+    # Centered like the example scripts: index minus half the count
+    offsets = [[(i - (n - 1) / 2) * step for i in range(n)] for n, step in zip(counts, spacing)]
+    return [
+        [center[0] + x, center[1] + y, center[2] + z]
+        for x in offsets[0] for y in offsets[1] for z in offsets[2]
+    ]
+
+
+def polar_angles(pattern: Dict[str, Any]) -> List[float]:
+    """Angle of every object of a polar pattern, in radians"""
+    count = _count(pattern.get("count"))
+    start = math.radians(float(pattern.get("start_angle", 0.0)))
+    sweep = math.radians(float(pattern.get("sweep", 360.0)))
+    # A full circle would put the last object on top of the first
+    steps = count if math.isclose(abs(sweep), 2 * math.pi) else max(count - 1, 1)
+    return [start + sweep * i / steps for i in range(count)]
+
+
+def polar_positions(pattern: Dict[str, Any]) -> List[Point]:
+    radius = float(pattern.get("radius", 1.0))
+    rise = float(pattern.get("rise", 0.0))
+    center = _vector(pattern.get("center"), 0.0)
+    return [
+        [center[0] + radius * math.cos(angle), center[1] + radius * math.sin(angle), center[2] + rise * i]
+        for i, angle in enumerate(polar_angles(pattern))
+    ]
+
+
+def spiral_angles(pattern: Dict[str, Any]) -> List[float]:
+    """Angle of every object of a spiral pattern, in radians"""
+    count = _count(pattern.get("count"))
+    step = math.radians(float(pattern.get("angle", GOLDEN_ANGLE)))
+    return [step * i for i in range(count)]
+
+
+def spiral_positions(pattern: Dict[str, Any]) -> List[Point]:
+    spacing = float(pattern.get("spacing", 1.0))
+    rise = float(pattern.get("rise", 0.0))
+    center = _vector(pattern.get("center"), 0.0)
+    positions = []
+    for i, angle in enumerate(spiral_angles(pattern)):
+        radius = spacing * math.sqrt(i)
+        positions.append([center[0] + radius * math.cos(angle), center[1] + radius * math.sin(angle), center[2] + rise * i])
+    return positions
+
+
+def _clamped_knots(count: int, degree: int) -> List[float]:
+    # Uniform and clamped, like Curve.CreateControlPointCurve
+    inner = count - degree - 1
+    return [0.0] * (degree + 1) + [i / (inner + 1) for i in range(1, inner + 1)] + [1.0] * (degree + 1)
+
+
+def _de_boor(points: List[Point], knots: List[float], degree: int, t: float) -> Point:
+    span = degree
+    while span < len(points) - 1 and knots[span + 1] <= t:
+        span += 1
+    d = [list(points[j + span - degree]) for j in range(degree + 1)]
+    for r in range(1, degree + 1):
+        for j in range(degree, r - 1, -1):
+            left, right = knots[j + span - degree], knots[j + 1 + span - r]
+            alpha = 0.0 if right == left else (t - left) / (right - left)
+            d[j] = [(1.0 - alpha) * a + alpha * b for a, b in zip(d[j - 1], d[j])]
+    return d[degree]
+
+
+def curve_positions(pattern: Dict[str, Any]) -> List[Point]:
+    count = _count(pattern.get("count"))
+    points = [_vector(point, 0.0) for point in pattern.get("points") or []]
+    if len(points) < 2:
+        raise ValueError("A curve pattern needs at least two points")
+    degree = max(1, min(int(pattern.get("degree", 3)), len(points) - 1))
+    knots = _clamped_knots(len(points), degree)
+
+    # Sample the curve densely and walk it by length, so objects are evenly spaced
+    samples = max(count, 1) * _CURVE_SAMPLES
+    sampled = [_de_boor(points, knots, degree, i / samples) for i in range(samples + 1)]
+    lengths = [0.0]
+    for a, b in zip(sampled, sampled[1:]):
+        lengths.append(lengths[-1] + math.dist(a, b))
+    positions = []
+    j = 0
+    for i in range(count):
+        target = lengths[-1] * (i / (count - 1) if count > 1 else 0.0)
+        while j < samples - 1 and lengths[j + 1] < target:
+            j += 1
+        segment = lengths[j + 1] - lengths[j]
+        alpha = 0.0 if segment == 0 else (target - lengths[j]) / segment
+        positions.append([(1.0 - alpha) * a + alpha * b for a, b in zip(sampled[j], sampled[j + 1])])
+    return positions
+
+
+def _headings(positions: List[Point]) -> List[float]:
+    """Direction of travel of every position in the XY plane, in radians"""
+    headings = []
+    for i in range(len(positions)):
+        a = positions[max(i - 1, 0)]
+        b = positions[min(i + 1, len(positions) - 1)]
+        headings.append(math.atan2(b[1] - a[1], b[0] - a[0]))
+    return headings
+
+
+def expand_pattern(pattern: Dict[str, Any]) -> List[Point]:
+    """The position of every object of ``pattern``, see the module documentation"""
+    kind = pattern.get("kind")
+    if kind == "grid":
+        return grid_positions(pattern)
+    if kind == "polar":
+        return polar_positions(pattern)
+    if kind == "spiral":
+        return spiral_positions(pattern)
+    if kind == "curve":
+        return curve_positions(pattern)
+    raise ValueError(f"Unknown pattern kind {kind}, expected one of {', '.join(KINDS)}")
+
+
+def _orientations(pattern: Dict[str, Any], positions: List[Point]) -> List[float]:
+    """Turn about Z of every object so it faces along the pattern"""
+    kind = pattern.get("kind")
+    if kind == "polar":
+        return polar_angles(pattern)
+    if kind == "spiral":
+        return spiral_angles(pattern)
+    if kind == "curve":
+        return _headings(positions)
+    return [0.0] * len(positions)
+
+
+def _coordinates(along: str, positions: List[Point], center: Point) -> List[float]:
+    if along in ("x", "y", "z"):
+        axis = "xyz".index(along)
+        return [position[axis] for position in positions]
+    if along == "radial":
+        return [math.dist(position, center) for position in positions]
+    if along == "index":
+        return [float(i) for i in range(len(positions))]
+    raise ValueError(f"Unknown gradient axis {along}, expected x, y, z, radial or index")
+
+
+def gradient(spec: Dict[str, Any], positions: List[Point], center: Point | None = None) -> List[Any]:
+    """The value of a gradient at every position, a number or a list like its ``from`` and ``to``"""
+    ease = EASINGS.get(spec.get("function", "linear"))
+    if ease is None:
+        raise ValueError(f"Unknown gradient function {spec.get('function')}, expected one of {', '.join(EASINGS)}")
+    coordinates = _coordinates(spec.get("along", "index"), positions, center or [0.0, 0.0, 0.0])
+    low, high = spec.get("range") or (min(coordinates, default=0.0), max(coordinates, default=0.0))
+    start, end = spec.get("from", 0.0), spec.get("to", 1.0)
+
+    values = []
+    for coordinate in coordinates:
+        t = 0.0 if high == low else min(max((coordinate - low) / (high - low), 0.0), 1.0)
+        t = ease(t)
+        if isinstance(start, (int, float)):
+            values.append(start + (end - start) * t)
+        else:
+            values.append([a + (b - a) * t for a, b in zip(start, end)])
+    return values
+
+
+def _sizes(size: Any, positions: List[Point], center: Point) -> List[float]:
+    if isinstance(size, (int, float)):
+        return [float(size)] * len(positions)
+    factors = [1.0] * len(positions)
+    for spec in [size] if isinstance(size, dict) else size:
+        factors = [factor * value for factor, value in zip(factors, gradient(spec, positions, center))]
+    return factors
+
+
+def array_columns(
+    pattern: Dict[str, Any],
+    params: Dict[str, Any] | None = None,
+    size: float | Dict[str, Any] | Sequence[Dict[str, Any]] | None = None,
+    color: Sequence[int] | Dict[str, Any] | None = None,
+    orient: bool = False,
+) -> Dict[str, Any]:
+    """Expand ``pattern`` into the keyword arguments of ``create_objects_columnar``.
+
+    Every object is created from ``params`` and moved to its position, with
+    its size params scaled by ``size`` and, with ``orient``, turned about Z
+    to face along the pattern.
+    """
+    positions = expand_pattern(pattern)
+    center = _vector(pattern.get("center"), 0.0)
+    params = dict(params or {})
+    columns: Dict[str, Any] = {"params": params, "translations": positions, "count": len(positions)}
+
+    if size is not None:
+        factors = _sizes(size, positions, center)
+        for key in SIZE_PARAMS:
+            if key in params:
+                params[key] = [float(params[key]) * factor for factor in factors]
+    if isinstance(color, dict):
+        columns["colors"] = [[min(max(int(round(c)), 0), 255) for c in rgb] for rgb in gradient(color, positions, center)]
+    elif color is not None:
+        columns["colors"] = list(color)
+    if orient:
+        columns["rotations"] = [[0.0, 0.0, angle] for angle in _orientations(pattern, positions)]
+    return columns
@@ -0,0 +1,527 @@
+"""A bounded pool of connections to the Rhino plugin.
+
+Each pooled connection is used by one caller at a time: ``connection()``
+checks one out under its lock and checks it back in when the block exits.
+Connections that sat idle for too long are closed, and a connection that
+has been idle for a little while is pinged before it is handed out again so
+callers do not find out about a restarted Rhino halfway through a command.
+
+Commands sent through the pool are retried on a fresh connection after a
+transport failure when they are idempotent, see ``rhinomcp.retry``, and a
+circuit breaker makes calls fail fast while Rhino is unreachable. Repeated
+reads are answered from a ``ResponseCache`` until a command changes the
+document, see ``rhinomcp.cache``, and identical reads sent while one is
+already on its way share its response instead of queueing on Rhino's UI
+thread again. A ``CommandScheduler`` lets reads go ahead of large batches,
+which are sent in slices, see ``rhinomcp.scheduler``.
+
+    pool = RhinoConnectionPool("127.0.0.1", 1999, max_size=4)
+    async with pool.connection() as rhino:
+        await rhino.send_command("get_document_info")
+"""
+
+import asyncio
+import json
+import logging
+import time
+import weakref
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, List, Tuple
+
+from rhinomcp.async_connection import RHINO_HOST, RHINO_PORT, AsyncRhinoConnection, TransferStats
+from rhinomcp.cache import ResponseCache, is_read_only
+from rhinomcp.errors import RhinoConnectionError, RhinoTimeoutError
+from rhinomcp.metrics import METRICS
+from rhinomcp.recorder import active_recorder
+from rhinomcp.retry import CircuitBreaker, RetryPolicy, is_idempotent
+from rhinomcp.scheduler import (
+    BULK_SLICE_SIZE,
+    INTERACTIVE,
+    NORMAL,
+    CommandScheduler,
+    command_priority,
+    merge_results,
+    slice_command,
+)
+from rhinomcp.timeouts import deadline, remaining
+
+logger = logging.getLogger("RhinoMCPServer")
+
+PING_COMMAND = "ping"
+RHINO_POOL_SIZE = 4
+
+
+@dataclass
+class _PooledConnection:
+    connection: AsyncRhinoConnection
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _Flight:
+    """A read on its way to Rhino that identical reads can wait for"""
+
+    task: asyncio.Task
+    generation: int
+    waiters: int = 0
+
+
+class RhinoConnectionPool:
+    """Hands out at most ``max_size`` connections to the same plugin.
+
+    Parameters:
+    - max_size: Upper bound on open connections; further callers wait.
+    - idle_timeout: Seconds after which an unused connection is closed.
+    - ping_after: Idle seconds after which a connection is pinged before reuse.
+    - ping_timeout: Seconds a ping may take before the connection is dropped.
+    - retry: Backoff policy for idempotent commands that hit a transport failure.
+    - breaker: Circuit breaker shared by every connection of the pool.
+    - cache: Cache for the results of reads, ``ResponseCache(ttl=0)`` disables it.
+    - coalesce: Whether a read identical to one in flight waits for its response.
+    - scheduler: Decides which command goes to Rhino next, by default one
+      that lets ``max_size`` commands and a single bulk slice run at once.
+    - slice_size: Items per slice of a bulk ``create_objects`` or ``modify_objects``.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        max_size: int = 4,
+        framing: str = "auto",
+        idle_timeout: float = 300.0,
+        ping_after: float = 5.0,
+        ping_timeout: float = 2.0,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        cache: ResponseCache | None = None,
+        coalesce: bool = True,
+        scheduler: CommandScheduler | None = None,
+        slice_size: int = BULK_SLICE_SIZE,
+    ):
+        self.host = host
+        self.port = port
+        self.max_size = max_size
+        self.framing = framing
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+        self.ping_timeout = ping_timeout
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.cache = cache if cache is not None else ResponseCache()
+        self.coalesce = coalesce
+        self.scheduler = scheduler or CommandScheduler(max_in_flight=max_size)
+        self.slice_size = slice_size
+        self._in_flight: Dict[Tuple[str, str], _Flight] = {}
+        self._coalesced: Counter = Counter()
+        self._idle: List[_PooledConnection] = []
+        self._in_use = 0
+        self._slots = asyncio.Semaphore(max_size)
+        self._closed = False
+        self._checkouts = 0
+        self._created = 0
+        self._evicted = 0
+        self._ping_failures = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._retries = 0
+        self.transfer = TransferStats()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[AsyncRhinoConnection]:
+        """Check out a healthy connection for exclusive use"""
+        if self._closed:
+            raise ConnectionError("Connection pool is closed")
+
+        started = time.monotonic()
+        left = remaining()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=left)
+        except asyncio.TimeoutError:
+            raise RhinoTimeoutError(f"Deadline exceeded after waiting {left:.1f}s for a free Rhino connection")
+        try:
+            entry = await self._checkout()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        waited = time.monotonic() - started
+        self._checkouts += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        self._in_use += 1
+        try:
+            async with entry.lock:
+                yield entry.connection
+        finally:
+            self._in_use -= 1
+            self._checkin(entry)
+            self._slots.release()
+
+    async def _checkout(self) -> _PooledConnection:
+        """Reuse the most recently used healthy connection or open a new one"""
+        await self._evict_idle()
+        while self._idle:
+            entry = self._idle.pop()
+            if await self._is_alive(entry):
+                return entry
+            self._evicted += 1
+            await entry.connection.disconnect()
+
+        connection = AsyncRhinoConnection(self.host, self.port, framing=self.framing, transfer=self.transfer)
+        if not await connection.connect():
+            raise RhinoConnectionError("Could not connect to Rhino. Make sure the Rhino addon is running.")
+        self._created += 1
+        logger.info(f"Opened pooled connection to Rhino ({self._created} so far)")
+        return _PooledConnection(connection)
+
+    def _checkin(self, entry: _PooledConnection):
+        entry.last_used = time.monotonic()
+        if self._closed or not entry.connection.connected:
+            # Broken connections are dropped rather than handed to the next caller
+            self._evicted += 1
+            asyncio.ensure_future(entry.connection.disconnect())
+            return
+        self._idle.append(entry)
+
+    async def _evict_idle(self):
+        """Close connections nobody has used for ``idle_timeout`` seconds"""
+        now = time.monotonic()
+        stale = [entry for entry in self._idle if now - entry.last_used > self.idle_timeout]
+        if not stale:
+            return
+        self._idle = [entry for entry in self._idle if entry not in stale]
+        for entry in stale:
+            self._evicted += 1
+            await entry.connection.disconnect()
+        logger.info(f"Closed {len(stale)} idle Rhino connections")
+
+    async def _is_alive(self, entry: _PooledConnection) -> bool:
+        """Ping a connection that has been idle for a while.
+
+        Any reply counts, including the "Unknown command type" error of a
+        plugin that does not know the ping command.
+        """
+        connection = entry.connection
+        if not connection.connected:
+            return False
+        if time.monotonic() - entry.last_used < self.ping_after:
+            return True
+        try:
+            await connection.send_command(PING_COMMAND, timeout=self.ping_timeout)
+        except Exception as e:
+            if not connection.connected or isinstance(e, RhinoTimeoutError):
+                self._ping_failures += 1
+                logger.warning(f"Dropping unresponsive Rhino connection: {str(e) or type(e).__name__}")
+                return False
+        return connection.connected
+
+    async def send_command(
+        self,
+        command_type: str,
+        params: Dict[str, Any] = {},
+        timeout: float | None = None,
+        priority: str | None = None,
+    ) -> Dict[str, Any]:
+        """Send a command on a pooled connection and return the response.
+
+        Idempotent commands are retried with backoff after a transport
+        failure; anything else fails on the first one, since it may already
+        have been applied. Timeouts are not retried. An explicit ``timeout`` replaces the command's entry
+        in ``COMMAND_TIMEOUTS``, longer or shorter, and also bounds the whole
+        call, waiting for a connection and retries included.
+
+        ``priority`` overrides the scheduling class picked by
+        ``command_priority``. Batches of more than ``slice_size`` items are
+        sent as bulk slices one after the other, and fail with the first
+        slice that fails, leaving the slices before it applied.
+
+        Calls, errors and latency are counted per command type in
+        ``rhinomcp.metrics.METRICS``, answers from the cache included, and
+        the command is appended to the active ``rhinomcp.recorder`` if any.
+        """
+        recorder = active_recorder()
+        sent = recorder.now() if recorder is not None else 0.0
+        try:
+            with METRICS.time_command(command_type):
+                result = await self._send(command_type, params, timeout, priority)
+        except Exception as e:
+            if recorder is not None:
+                recorder.record(command_type, params, sent, error=e)
+            raise
+        if recorder is not None:
+            recorder.record(command_type, params, sent, result=result)
+        return result
+
+    async def _send(
+        self, command_type: str, params: Dict[str, Any], timeout: float | None, priority: str | None
+    ) -> Dict[str, Any]:
+        cached = self.cache.get(command_type, params)
+        if cached is not None:
+            return cached
+
+        priority = priority or command_priority(command_type, params, self.slice_size)
+        read_only = is_read_only(command_type)
+        if read_only and self.coalesce:
+            with deadline(timeout):
+                return await self._send_read(command_type, params, priority, timeout)
+
+        if not read_only:
+            self.cache.invalidate()
+        generation = self.cache.generation
+        try:
+            with deadline(timeout):
+                results = []
+                for slice_params in slice_command(command_type, params, self.slice_size):
+                    results.append(await self._send_command(command_type, slice_params, priority, timeout))
+                result = merge_results(command_type, results)
+        finally:
+            if not read_only:
+                # Reads that were answered while this ran may already reflect it, or not
+                self.cache.invalidate()
+        self.cache.put(command_type, params, result, generation)
+        return result
+
+    async def _send_read(
+        self, command_type: str, params: Dict[str, Any], priority: str, timeout: float | None = None
+    ) -> Dict[str, Any]:
+        """Send a read, or wait for the identical one already in flight.
+
+        A read only joins a flight started since the last write, since an
+        older one may have been answered before the write was applied. The
+        flight runs under the deadline of the caller that started it, and
+        is cancelled once every caller waiting for it gave up. A page with a
+        ``next_cursor`` is only for the caller that started the flight, the
+        others send the read again.
+        """
+        key = ResponseCache.key(command_type, params)
+        generation = self.cache.generation
+        flight = self._in_flight.get(key)
+        if flight is not None and flight.generation == generation:
+            self._coalesced[command_type] += 1
+            result = await self._wait_for_flight(flight)
+            if result.get("next_cursor") is not None:
+                # The cursor's snapshot ends with whichever caller pages to the end
+                # first, so this one needs a snapshot of its own
+                return await self._send_command(command_type, params, priority, timeout)
+            # Every caller gets its own copy to modify, as with cached results
+            return json.loads(json.dumps(result))
+
+        flight = _Flight(asyncio.ensure_future(self._send_command(command_type, params, priority, timeout)), generation)
+        self._in_flight[key] = flight
+        flight.task.add_done_callback(lambda _task: self._land(key, flight))
+        result = await self._wait_for_flight(flight)
+        self.cache.put(command_type, params, result, generation)
+        return result
+
+    async def _wait_for_flight(self, flight: _Flight) -> Dict[str, Any]:
+        flight.waiters += 1
+        left = remaining()
+        try:
+            return await asyncio.wait_for(asyncio.shield(flight.task), timeout=left)
+        except asyncio.TimeoutError:
+            raise RhinoTimeoutError(f"Deadline exceeded after waiting {left:.1f}s for a response from Rhino")
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()
+
+    def _land(self, key: Tuple[str, str], flight: _Flight):
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
+        if not flight.task.cancelled():
+            # Retrieved here as well in case every caller was cancelled meanwhile
+            flight.task.exception()
+
+    async def _send_command(
+        self, command_type: str, params: Dict[str, Any], priority: str = NORMAL, timeout: float | None = None
+    ) -> Dict[str, Any]:
+        retryable = is_idempotent(command_type, params)
+        attempt = 1
+        while True:
+            self.breaker.before_call()
+            try:
+                result = await self.scheduler.run(priority, lambda: self._send_once(command_type, params, timeout))
+            except RhinoConnectionError as e:
+                self._record_failure(e)
+                # A timeout means Rhino is busy or stuck, sending the same slow command again only adds to it
+                if not retryable or isinstance(e, RhinoTimeoutError) or attempt >= self.retry.max_attempts:
+                    raise
+                delay = self.retry.backoff(attempt)
+                left = remaining()
+                if left is not None and left <= delay:
+                    # The retry could not finish in time anyway
+                    raise
+                logger.warning(f"Retrying {command_type} in {delay:.2f}s after: {str(e)}")
+                self._retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            except Exception:
+                # Rhino answered, even if with an error
+                self.breaker.record_success()
+                raise
+            self.breaker.record_success()
+            return result
+
+    async def _send_once(self, command_type: str, params: Dict[str, Any], timeout: float | None = None) -> Dict[str, Any]:
+        async with self.connection() as rhino:
+            # The override replaces the table value, the deadline around the call still caps it
+            return await rhino.send_command(command_type, params, timeout=timeout)
+
+    async def send_commands(
+        self, commands: Iterable[Tuple[str, Dict[str, Any]]], timeout: float | None = None
+    ) -> List[Dict[str, Any] | Exception]:
+        """Pipeline several commands on one pooled connection, see ``AsyncRhinoConnection.send_commands``.
+
+        Idempotent commands lost to a transport failure other than a timeout
+        are sent again one by one. An explicit ``timeout`` bounds the whole batch. The pipeline is
+        scheduled as a whole, as ``interactive`` when it only reads and as
+        ``normal`` otherwise.
+        """
+        commands = list(commands)
+        read_only = all(is_read_only(command_type) for command_type, _params in commands)
+        if not read_only:
+            self.cache.invalidate()
+        recorder = active_recorder()
+        sent = recorder.now() if recorder is not None else 0.0
+        started = time.perf_counter()
+        results: List[Dict[str, Any] | Exception] | None = None
+        try:
+            with deadline(timeout):
+                results = await self._send_commands(commands, INTERACTIVE if read_only else NORMAL)
+                return results
+        finally:
+            if not read_only:
+                self.cache.invalidate()
+            self._count_pipeline(commands, results, time.perf_counter() - started)
+            if recorder is not None:
+                recorder.record_pipeline(commands, sent, results)
+
+    @staticmethod
+    def _count_pipeline(
+        commands: List[Tuple[str, Dict[str, Any]]], results: List[Dict[str, Any] | Exception] | None, elapsed: float
+    ):
+        # Every command of a pipeline waits for the whole of it
+        for index, (command_type, _params) in enumerate(commands):
+            metrics = METRICS.command(command_type)
+            metrics.calls += 1
+            if results is None or isinstance(results[index], Exception):
+                metrics.errors += 1
+            metrics.latency.observe(elapsed)
+
+    async def _send_commands(
+        self, commands: List[Tuple[str, Dict[str, Any]]], priority: str
+    ) -> List[Dict[str, Any] | Exception]:
+        self.breaker.before_call()
+
+        async def send() -> List[Dict[str, Any] | Exception]:
+            async with self.connection() as rhino:
+                return await rhino.send_commands(commands)
+
+        try:
+            results = await self.scheduler.run(priority, send)
+        except RhinoConnectionError as e:
+            self._record_failure(e)
+            raise
+
+        failures = [result for result in results if isinstance(result, RhinoConnectionError)]
+        if failures:
+            self._record_failure(failures[0])
+        else:
+            self.breaker.record_success()
+
+        for index, ((command_type, params), result) in enumerate(zip(commands, results)):
+            if (
+                isinstance(result, RhinoConnectionError)
+                and not isinstance(result, RhinoTimeoutError)
+                and is_idempotent(command_type, params)
+            ):
+                try:
+                    results[index] = await self._send_command(command_type, params, priority)
+                except Exception as e:
+                    results[index] = e
+        return results
+
+    def _record_failure(self, error: RhinoConnectionError):
+        """Count a transport failure against the circuit breaker.
+
+        Running out of a deadline the caller chose says nothing about
+        whether Rhino is healthy, so it does not open the breaker.
+        """
+        if isinstance(error, RhinoTimeoutError) and remaining() is not None:
+            return
+        self.breaker.record_failure()
+
+    async def clear(self):
+        """Close every idle connection, new ones are opened on demand"""
+        idle, self._idle = self._idle, []
+        for entry in idle:
+            await entry.connection.disconnect()
+
+    async def close(self):
+        """Close the pool; connections in use are closed when checked in"""
+        self._closed = True
+        await self.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool metrics, for sizing ``max_size`` against the actual concurrency"""
+        return {
+            "max_size": self.max_size,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "checkouts": self._checkouts,
+            "created": self._created,
+            "evicted": self._evicted,
+            "ping_failures": self._ping_failures,
+            "retries": self._retries,
+            "circuit": self.breaker.state,
+            "wait_total_s": self._wait_total,
+            "wait_max_s": self._wait_max,
+            "wait_avg_s": self._wait_total / self._checkouts if self._checkouts else 0.0,
+            "transfer": self.transfer.as_dict(),
+            "cache": self.cache.stats(),
+            "in_flight": len(self._in_flight),
+            "coalesced": sum(self._coalesced.values()),
+            "coalesced_by_command": dict(self._coalesced),
+            "scheduler": self.scheduler.stats(),
+        }
+
+
+# One pool per event loop, since asyncio streams are bound to the loop that opened them
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, RhinoConnectionPool]" = weakref.WeakKeyDictionary()
+
+
+async def get_async_rhino_connection() -> RhinoConnectionPool:
+    """Get or create the persistent Rhino connection pool of the running event loop"""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = RhinoConnectionPool(host=RHINO_HOST, port=RHINO_PORT, max_size=RHINO_POOL_SIZE)
+        try:
+            # Open the first connection now so a missing Rhino is reported right away
+            async with pool.connection():
+                pass
+        except Exception:
+            logger.error("Failed to connect to Rhino")
+            await pool.close()
+            raise RhinoConnectionError("Could not connect to Rhino. Make sure the Rhino addon is running.")
+        _pools[loop] = pool
+        logger.info("Created new persistent connection pool to Rhino")
+    return pool
+
+
+def running_pool() -> RhinoConnectionPool | None:
+    """The running event loop's persistent connection pool, without connecting if there is none yet"""
+    return _pools.get(asyncio.get_running_loop())
+
+
+async def close_async_rhino_connection():
+    """Close the running event loop's persistent connection pool, if any"""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        logger.info("Disconnecting from Rhino")
+        await pool.close()
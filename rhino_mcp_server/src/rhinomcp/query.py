@@ -0,0 +1,293 @@
+"""Attribute queries over the objects of a document.
+
+``select_objects`` takes a query, a tree of JSON objects:
+
+    {"and": [
+        {"field": "layer", "eq": "Walls"},
+        {"field": "name", "prefix": "Panel"},
+        {"not": {"field": "status", "in": ["demolished", "hidden"]}},
+        {"field": "height", "range": [2.5, None]},
+    ]}
+
+A leaf compares one field of every object: ``name``, ``layer`` (its name or
+full path), ``color`` (``[r, g, b]``), ``type`` (the object type, e.g.
+``"Brep"``) or, for any other field, the user string of that key. A user
+string named like one of these is written ``"user:name"``. The comparison is
+one of
+
+- ``eq``: equal to the value
+- ``in``: equal to one of a list of values
+- ``prefix``: starting with a string
+- ``range``: ``[low, high]``, both inclusive and either ``None``, for values
+  that read as numbers
+
+and leaves are combined by ``and`` and ``or`` with a list of queries and by
+``not`` with one.
+
+The plugin answers queries from an index of these fields that it keeps
+current with document events. An ``and`` starts from its most selective
+part and only checks the objects that one leaves; ``AttributeIndex`` does
+the same for local copies of the document like ``DocumentMirror``.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Set, Tuple
+
+# Fields that are attributes of the object, anything else is a user string key
+FIELDS = ("name", "layer", "color", "type")
+
+COMPARISONS = ("eq", "in", "prefix", "range")
+
+USER_PREFIX = "user:"
+
+
+def field_key(field: str) -> str:
+    """The name of a field in the index, user strings are prefixed to keep them apart"""
+    if field in FIELDS:
+        return field
+    return field if field.startswith(USER_PREFIX) else USER_PREFIX + field
+
+
+def value_key(field: str, value: Any) -> str:
+    """A query value as the string it is indexed by, the way the plugin writes it"""
+    if field == "color":
+        if isinstance(value, dict):
+            value = [value["r"], value["g"], value["b"]]
+        return ",".join(str(int(channel)) for channel in list(value)[:3])
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def object_keys(obj: Dict[str, Any], user_strings: Dict[str, str] | None = None) -> Dict[str, str]:
+    """The indexed values of an object given as ``get_document_objects`` describes it"""
+    keys = {"name": obj.get("name") or "", "layer": obj.get("layer") or "", "type": obj.get("type") or ""}
+    if obj.get("color") is not None:
+        keys["color"] = value_key("color", obj["color"])
+    for key, value in (user_strings or {}).items():
+        keys[USER_PREFIX + key] = str(value)
+    return keys
+
+
+def from_filters(filters: Dict[str, Any], filters_type: str = "and") -> Dict[str, Any] | None:
+    """The query of the original ``select_objects`` filters, None for all objects.
+
+    Each filter matches one of its values, as the tool has always described
+    them, and ``filters_type`` combines them. Keys other than ``name`` and
+    ``color`` are user strings.
+    """
+    if not filters:
+        return None
+    if filters_type not in ("and", "or"):
+        raise ValueError(f"filters_type must be and or or, got {filters_type}")
+    leaves = []
+    for key, values in filters.items():
+        if key == "color":
+            values = values if values and isinstance(values[0], (list, tuple)) else [values]
+        elif not isinstance(values, (list, tuple)):
+            values = [values]
+        field = key if key in ("name", "color") else USER_PREFIX + key
+        leaves.append({"field": field, "in": list(values)})
+    return {filters_type: leaves}
+
+
+def validate_query(query: Any, path: str = "query"):
+    """Raise a ``ValueError`` naming the part of ``query`` that is not a valid query"""
+    if not isinstance(query, dict):
+        raise ValueError(f"{path} must be an object")
+    for kind in ("and", "or"):
+        if kind in query:
+            if not isinstance(query[kind], list) or not query[kind]:
+                raise ValueError(f"{path}.{kind} must be a list of queries")
+            for index, item in enumerate(query[kind]):
+                validate_query(item, f"{path}.{kind}[{index}]")
+            return
+    if "not" in query:
+        validate_query(query["not"], f"{path}.not")
+        return
+    if not isinstance(query.get("field"), str) or not query["field"]:
+        raise ValueError(f"{path} needs and, or, not or a field")
+    comparisons = [name for name in COMPARISONS if name in query]
+    if len(comparisons) != 1:
+        raise ValueError(f"{path} needs one of {', '.join(COMPARISONS)}")
+    if "in" in query and not isinstance(query["in"], list):
+        raise ValueError(f"{path}.in must be a list")
+    if "prefix" in query and not isinstance(query["prefix"], str):
+        raise ValueError(f"{path}.prefix must be a string")
+    if "range" in query and (not isinstance(query["range"], list) or len(query["range"]) != 2):
+        raise ValueError(f"{path}.range must be [low, high]")
+    if "range" in query and not all(
+        bound is None or (isinstance(bound, (int, float)) and not isinstance(bound, bool)) for bound in query["range"]
+    ):
+        raise ValueError(f"{path}.range bounds must be numbers or None")
+
+
+def _number(value: str) -> float | None:
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return None if number != number else number
+
+
+def _leaf_test(leaf: Dict[str, Any]):
+    """A test of one indexed value against a leaf"""
+    field = field_key(leaf["field"])
+    if "eq" in leaf or "in" in leaf:
+        wanted = {value_key(field, value) for value in ([leaf["eq"]] if "eq" in leaf else leaf["in"])}
+        return wanted.__contains__
+    if "prefix" in leaf:
+        prefix = leaf["prefix"]
+        return lambda value: value.startswith(prefix)
+    low, high = leaf["range"]
+
+    def in_range(value: str) -> bool:
+        number = _number(value)
+        return number is not None and (low is None or number >= low) and (high is None or number <= high)
+
+    return in_range
+
+
+def matches(query: Dict[str, Any], keys: Dict[str, str]) -> bool:
+    """Whether an object with the indexed values ``keys`` matches ``query``, without an index"""
+    if "and" in query:
+        return all(matches(item, keys) for item in query["and"])
+    if "or" in query:
+        return any(matches(item, keys) for item in query["or"])
+    if "not" in query:
+        return not matches(query["not"], keys)
+    value = keys.get(field_key(query["field"]))
+    return value is not None and _leaf_test(query)(value)
+
+
+class AttributeIndex:
+    """Object ids by the value of each field, kept current with ``add`` and ``remove``.
+
+    ``find`` resolves every leaf of a query to the values it matches, and so
+    to an exact count of objects, before touching any object; ``and`` then
+    starts from its smallest part. Prefixes and ranges are looked up in the
+    sorted values of a field, sorted again the first time they are needed
+    after a value was added or went away.
+    """
+
+    def __init__(self):
+        self._fields: Dict[str, Dict[str, Set[str]]] = {}
+        self._keys: Dict[str, Dict[str, str]] = {}
+        self._sorted: Dict[str, Tuple[List[str], List[float], List[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, object_id: str, keys: Dict[str, str]):
+        self.remove(object_id)
+        self._keys[object_id] = keys
+        for field, value in keys.items():
+            values = self._fields.setdefault(field, {})
+            if value not in values:
+                values[value] = set()
+                self._sorted.pop(field, None)
+            values[value].add(object_id)
+
+    def remove(self, object_id: str):
+        keys = self._keys.pop(object_id, None)
+        for field, value in (keys or {}).items():
+            ids = self._fields[field][value]
+            ids.discard(object_id)
+            if not ids:
+                del self._fields[field][value]
+                self._sorted.pop(field, None)
+
+    def clear(self):
+        self._fields.clear()
+        self._keys.clear()
+        self._sorted.clear()
+
+    def find(self, query: Dict[str, Any]) -> Set[str]:
+        """The ids of the objects matching ``query``"""
+        validate_query(query)
+        return self._select(self._plan(query))
+
+    def explain(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """The plan of ``query``: each part with the number of objects it can match at most"""
+        validate_query(query)
+
+        def describe(node: Tuple[Any, ...]) -> Dict[str, Any]:
+            kind, estimate = node[0], node[1]
+            if kind == "leaf":
+                return {"field": node[2], "values": len(node[3]), "estimate": estimate}
+            return {kind: [describe(child) for child in node[2]], "estimate": estimate}
+
+        return describe(self._plan(query))
+
+    def _plan(self, query: Dict[str, Any]) -> Tuple[Any, ...]:
+        """``(kind, estimate, ...)``, with the children of ``and`` most selective first"""
+        for kind in ("and", "or"):
+            if kind in query:
+                children = sorted((self._plan(item) for item in query[kind]), key=lambda child: child[1])
+                if kind == "and":
+                    return ("and", children[0][1], children)
+                return ("or", min(len(self._keys), sum(child[1] for child in children)), children)
+        if "not" in query:
+            child = self._plan(query["not"])
+            # Only a leaf's estimate is exact, the complement of an upper bound says nothing
+            estimate = len(self._keys) - child[1] if child[0] == "leaf" else len(self._keys)
+            return ("not", estimate, [child])
+
+        field = field_key(query["field"])
+        values = self._fields.get(field, {})
+        if "eq" in query or "in" in query:
+            wanted = [value_key(field, value) for value in ([query["eq"]] if "eq" in query else query["in"])]
+            keys = {value for value in wanted if value in values}
+        elif "prefix" in query:
+            strings = self._sorted_values(field)[0]
+            prefix = query["prefix"]
+            keys = set()
+            for value in strings[bisect_left(strings, prefix):]:
+                if not value.startswith(prefix):
+                    break
+                keys.add(value)
+        else:
+            _strings, numbers, numeric = self._sorted_values(field)
+            low, high = query["range"]
+            start = 0 if low is None else bisect_left(numbers, low)
+            end = len(numbers) if high is None else bisect_right(numbers, high)
+            keys = set(numeric[start:end])
+        return ("leaf", sum(len(values[value]) for value in keys), field, keys)
+
+    def _sorted_values(self, field: str) -> Tuple[List[str], List[float], List[str]]:
+        """The values of a field in order, and those that are numbers by their number"""
+        if field not in self._sorted:
+            strings = sorted(self._fields.get(field, {}))
+            pairs = sorted((_number(value), value) for value in strings if _number(value) is not None)
+            self._sorted[field] = (strings, [number for number, _value in pairs], [value for _number, value in pairs])
+        return self._sorted[field]
+
+    def _select(self, node: Tuple[Any, ...]) -> Set[str]:
+        kind = node[0]
+        if kind == "leaf":
+            values = self._fields.get(node[2], {})
+            return set().union(*(values[value] for value in node[3]))
+        if kind == "or":
+            return set().union(*(self._select(child) for child in node[2]))
+        if kind == "not":
+            child = node[2][0]
+            values = self._fields.get(child[2], {}) if child[0] == "leaf" else {}
+            if child[0] == "leaf" and sum(len(ids) for ids in values.values()) == len(self._keys):
+                # Every object has the field, so the others are those holding any other value
+                return set().union(*(ids for value, ids in values.items() if value not in child[3]))
+            return set(self._keys).difference(self._select(child))
+        first, rest = node[2][0], node[2][1:]
+        return {object_id for object_id in self._select(first) if all(self._matches(child, object_id) for child in rest)}
+
+    def _matches(self, node: Tuple[Any, ...], object_id: str) -> bool:
+        kind = node[0]
+        if kind == "leaf":
+            return self._keys[object_id].get(node[2]) in node[3]
+        if kind == "and":
+            return all(self._matches(child, object_id) for child in node[2])
+        if kind == "or":
+            return any(self._matches(child, object_id) for child in node[2])
+        return not self._matches(node[2][0], object_id)
+
@@ -0,0 +1,178 @@
+"""Recording of the commands sent to Rhino, for replaying them later.
+
+While a ``TrafficRecorder`` is active every ``send_command`` and
+``send_commands`` of a ``RhinoConnectionPool`` is appended to its file as
+one JSON line, with the time it was sent, how long it took and whether it
+failed. Results are not kept, only the object ids found in the results of
+commands that change the document, which is what ``rhinomcp.replay`` needs
+to point later commands at the objects the replay created.
+
+A file name ending in ``.gz`` is compressed; it is only complete once the
+recording is stopped, while a plain file is flushed after every line.
+
+    uvx rhinomcp --record session.jsonl.gz
+
+or from Python:
+
+    start_recording("session.jsonl.gz")
+    ...
+    stop_recording()
+"""
+
+import gzip
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, List, Tuple
+
+from rhinomcp.cache import is_read_only
+
+FORMAT_VERSION = 1
+
+GUID = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+
+# Error messages are cut to this many characters
+MAX_ERROR = 500
+
+
+def find_ids(value: Any, found: List[str] | None = None) -> List[str]:
+    """Every GUID string in ``value``, in the order a depth-first walk meets them"""
+    if found is None:
+        found = []
+    if isinstance(value, str):
+        if len(value) == 36 and GUID.match(value):
+            found.append(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            find_ids(item, found)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            find_ids(item, found)
+    return found
+
+
+def _jsonable(value: Any) -> Any:
+    # NumPy arrays and numbers, as passed to create_objects_columnar
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def open_recording(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class TrafficRecorder:
+    """Appends the commands sent to Rhino to a JSON lines file.
+
+    The first line describes the recording, every other line is a
+    ``command`` or a ``pipeline`` of commands. ``t`` is when it was sent and
+    ``elapsed`` how long its result took, both in seconds.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = 0
+        self._started = time.monotonic()
+        self._lock = threading.Lock()  # the sync facade sends from a loop of its own
+        self._compressed = path.endswith(".gz")
+        self._file = open_recording(path, "w")
+        self._write({
+            "version": FORMAT_VERSION,
+            "started": datetime.now(timezone.utc).isoformat(),
+        })
+
+    def _write(self, entry: Dict[str, Any]):
+        line = json.dumps(entry, separators=(",", ":"), default=_jsonable)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            if not self._compressed:
+                # Flushing a gzip stream ends a deflate block and costs compression
+                self._file.flush()
+
+    def now(self) -> float:
+        """Seconds since the recording started"""
+        return time.monotonic() - self._started
+
+    def record(
+        self,
+        command_type: str,
+        params: Dict[str, Any] | None,
+        sent: float,
+        result: Dict[str, Any] | None = None,
+        error: Exception | None = None,
+    ):
+        """Append one command sent at ``sent`` (see ``now``)"""
+        entry: Dict[str, Any] = {
+            "kind": "command",
+            "t": round(sent, 6),
+            "elapsed": round(self.now() - sent, 6),
+            "command": command_type,
+            "params": params or {},
+        }
+        if error is not None:
+            entry["error"] = str(error)[:MAX_ERROR]
+        elif not is_read_only(command_type):
+            entry["ids"] = find_ids(result)
+        self.entries += 1
+        self._write(entry)
+
+    def record_pipeline(
+        self,
+        commands: List[Tuple[str, Dict[str, Any]]],
+        sent: float,
+        results: List[Dict[str, Any] | Exception] | None,
+    ):
+        """Append a pipeline sent at ``sent``; ``results`` is None when it failed as a whole"""
+        entry: Dict[str, Any] = {
+            "kind": "pipeline",
+            "t": round(sent, 6),
+            "elapsed": round(self.now() - sent, 6),
+            "commands": [{"command": command_type, "params": params or {}} for command_type, params in commands],
+        }
+        if results is None:
+            entry["error"] = "pipeline failed"
+        else:
+            for item, result in zip(entry["commands"], results):
+                if isinstance(result, Exception):
+                    item["error"] = str(result)[:MAX_ERROR]
+                elif not is_read_only(item["command"]):
+                    item["ids"] = find_ids(result)
+        self.entries += 1
+        self._write(entry)
+
+    def close(self):
+        with self._lock:
+            file, self._file = self._file, None
+        if file is not None:
+            file.close()
+
+
+_recorder: TrafficRecorder | None = None
+
+
+def active_recorder() -> TrafficRecorder | None:
+    """The recorder commands are currently appended to, if any"""
+    return _recorder
+
+
+def start_recording(path: str) -> TrafficRecorder:
+    """Record every command sent from now on to ``path``, replacing a recording in progress"""
+    global _recorder
+    stop_recording()
+    _recorder = TrafficRecorder(path)
+    return _recorder
+
+
+def stop_recording():
+    """Stop recording and close the file"""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    if recorder is not None:
+        recorder.close()
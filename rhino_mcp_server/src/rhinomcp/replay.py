@@ -0,0 +1,254 @@
+"""Replay of a recorded session against a plugin, see ``rhinomcp.recorder``.
+
+    python -m rhinomcp.replay session.jsonl.gz --fake --output replay.json
+    python -m rhinomcp.replay session.jsonl.gz --port 1999 --baseline replay.json
+
+The commands are sent at the moments they were recorded, so commands that
+overlapped then overlap again, or back to back with ``--speed 0``. Object
+ids in the recording are translated to the ids of the objects the replay
+created: the n-th id in a recorded result stands for the n-th id in the
+replayed one. The report has the latency percentiles of every command type
+in the recording and in the replay, and their relative change.
+
+``--fake`` replays against an in-process ``FakeRhinoServer``, which makes
+the replay deterministic, so a recording becomes a regression benchmark for
+transport and caching changes.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List
+
+from rhinomcp.async_connection import RHINO_HOST, RHINO_PORT
+from rhinomcp.cache import ResponseCache
+from rhinomcp.pool import RhinoConnectionPool
+from rhinomcp.recorder import FORMAT_VERSION, find_ids, open_recording
+from rhinomcp.retry import CLIENT_TOKEN
+
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    """The entries of a recording, in the order they were sent"""
+    with open_recording(path, "r") as f:
+        lines = iter(f)
+        header = json.loads(next(lines, "{}"))
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a recording of format version {FORMAT_VERSION}")
+        entries = [json.loads(line) for line in lines if line.strip()]
+    return sorted(entries, key=lambda entry: entry["t"])
+
+
+def _commands(entry: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    if entry["kind"] == "pipeline":
+        yield from entry["commands"]
+    else:
+        yield entry
+
+
+def _translate(value: Any, ids: Dict[str, str]) -> Any:
+    if isinstance(value, str):
+        return ids.get(value, value)
+    if isinstance(value, dict):
+        return {ids.get(key, key): _translate(item, ids) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_translate(item, ids) for item in value]
+    return value
+
+
+def _prepare(params: Dict[str, Any], ids: Dict[str, str]) -> Dict[str, Any]:
+    params = _translate(params, ids)
+    if params.get(CLIENT_TOKEN):
+        # The plugin would answer a token it has seen with the object it already created
+        params[CLIENT_TOKEN] = uuid.uuid4().hex
+    return params
+
+
+def _learn(recorded: Dict[str, Any], result: Any, ids: Dict[str, str]):
+    # Results have the same shape as the recorded ones, so their ids line up
+    for old, new in zip(recorded.get("ids", []), find_ids(result)):
+        ids[old] = new
+
+
+@dataclass
+class _Samples:
+    recorded: List[float] = field(default_factory=list)
+    replayed: List[float] = field(default_factory=list)
+    recorded_errors: int = 0
+    replayed_errors: int = 0
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    if not samples:
+        return 0.0
+    return samples[min(int(fraction * len(samples)), len(samples) - 1)]
+
+
+def _latency(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "p50": round(percentile(samples, 0.50) * 1000, 3),
+        "p95": round(percentile(samples, 0.95) * 1000, 3),
+        "max": round(samples[-1] * 1000, 3) if samples else 0.0,
+    }
+
+
+def _change(old: float, new: float) -> float | None:
+    return round((new - old) / old * 100, 1) if old else None
+
+
+async def replay(entries: List[Dict[str, Any]], pool: RhinoConnectionPool, speed: float = 1.0) -> Dict[str, Any]:
+    """Send the recorded entries through ``pool`` and report latency per command type.
+
+    ``speed`` scales the recorded timing, 2 replays twice as fast; 0 sends
+    every entry as soon as the previous one is answered.
+    """
+    ids: Dict[str, str] = {}
+    samples: Dict[str, _Samples] = {}
+
+    def sample(command_type: str) -> _Samples:
+        return samples.setdefault(command_type, _Samples())
+
+    for entry in entries:
+        for recorded in _commands(entry):
+            stats = sample(recorded["command"])
+            stats.recorded.append(entry["elapsed"])
+            stats.recorded_errors += "error" in recorded or "error" in entry
+
+    async def send(entry: Dict[str, Any]):
+        started = time.perf_counter()
+        if entry["kind"] == "pipeline":
+            commands = [(item["command"], _prepare(item["params"], ids)) for item in entry["commands"]]
+            try:
+                results = await pool.send_commands(commands)
+            except Exception:
+                results = [None] * len(commands)
+            elapsed = time.perf_counter() - started
+            for recorded, result in zip(entry["commands"], results):
+                stats = sample(recorded["command"])
+                stats.replayed.append(elapsed)
+                if result is None or isinstance(result, Exception):
+                    stats.replayed_errors += 1
+                else:
+                    _learn(recorded, result, ids)
+            return
+
+        stats = sample(entry["command"])
+        try:
+            result = await pool.send_command(entry["command"], _prepare(entry["params"], ids))
+        except Exception:
+            stats.replayed_errors += 1
+        else:
+            _learn(entry, result, ids)
+        stats.replayed.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    if speed <= 0:
+        for entry in entries:
+            await send(entry)
+    else:
+        tasks = []
+        for entry in entries:
+            delay = entry["t"] / speed - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(entry)))
+        await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    commands = {}
+    for command_type, stats in sorted(samples.items()):
+        recorded, replayed = _latency(stats.recorded), _latency(stats.replayed)
+        commands[command_type] = {
+            "count": len(stats.replayed),
+            "recorded_errors": stats.recorded_errors,
+            "replayed_errors": stats.replayed_errors,
+            "recorded_ms": recorded,
+            "replayed_ms": replayed,
+            "change_percent": {key: _change(recorded[key], replayed[key]) for key in ("p50", "p95")},
+        }
+    return {
+        "entries": len(entries),
+        "recorded_s": round(entries[-1]["t"] + entries[-1]["elapsed"], 4) if entries else 0.0,
+        "replayed_s": round(elapsed, 4),
+        "commands": commands,
+    }
+
+
+def compare(baseline: Dict[str, Any], report: Dict[str, Any]):
+    """Turn the changes of ``report`` into changes relative to an earlier replay"""
+    for command_type, stats in report["commands"].items():
+        before = baseline.get("commands", {}).get(command_type)
+        if before is None:
+            stats["change_percent"] = None
+            continue
+        stats["baseline_ms"] = before["replayed_ms"]
+        stats["change_percent"] = {
+            key: _change(before["replayed_ms"][key], stats["replayed_ms"][key]) for key in ("p50", "p95")
+        }
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    entries = load_recording(args.recording)
+    cache = ResponseCache(ttl=args.cache_ttl)
+    if args.fake:
+        from rhinomcp.fake_rhino import FakeRhinoServer
+
+        with FakeRhinoServer(object_count=args.objects, latency=args.latency) as server:
+            pool = RhinoConnectionPool(*server.address, max_size=args.connections, cache=cache)
+            try:
+                return await replay(entries, pool, args.speed)
+            finally:
+                await pool.close()
+
+    pool = RhinoConnectionPool(args.host, args.port, max_size=args.connections, cache=cache)
+    try:
+        return await replay(entries, pool, args.speed)
+    finally:
+        await pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded RhinoMCP session and report latency per command")
+    parser.add_argument("recording", help="file written with --record or start_recording()")
+    parser.add_argument("--host", default=RHINO_HOST)
+    parser.add_argument("--port", type=int, default=RHINO_PORT)
+    parser.add_argument("--fake", action="store_true", help="replay against an in-process fake plugin")
+    parser.add_argument("--objects", type=int, default=0, help="objects the fake document starts with")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of simulated UI-thread work per command of the fake")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed, 0 sends commands back to back")
+    parser.add_argument("--connections", type=int, default=4, help="size of the connection pool")
+    parser.add_argument("--cache-ttl", type=float, default=5.0, help="seconds reads are answered from the cache, 0 turns it off")
+    parser.add_argument("--baseline", help="report of an earlier replay to compare with instead of the recording")
+    parser.add_argument("--output", help="write the report here instead of to stdout")
+    args = parser.parse_args()
+
+    logging.getLogger("RhinoMCPServer").setLevel(logging.WARNING)
+    report = asyncio.run(_run(args))
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(json.load(f), report)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    for command_type, stats in report["commands"].items():
+        change = stats["change_percent"] or {}
+        print(f"{command_type:<32} {stats['count']:>6} x  p50 {stats['replayed_ms']['p50']:>10.3f} ms "
+              f"({_format_change(change.get('p50'))})  errors {stats['replayed_errors']}", file=sys.stderr)
+
+
+def _format_change(change: float | None) -> str:
+    return "n/a" if change is None else f"{change:+.1f}%"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Reconnect and retry policy for commands sent to Rhino.
+
+Only commands that are safe to run twice are retried after a transport
+failure: reads, selections, and any command that carries a
+``client_token``, which the plugin uses to answer a repeated request with
+the first result instead of running it again. Timeouts are never retried,
+that would only queue the same slow command behind itself on Rhino's UI
+thread. A circuit breaker stops a dead Rhino from holding every call for
+the full response timeout.
+"""
+
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+from rhinomcp.errors import RhinoConnectionError
+
+CLIENT_TOKEN = "client_token"
+
+# Commands that never change the document, beyond the "get_" prefix
+_IDEMPOTENT_COMMANDS = {"ping", "select_objects", "query_objects_in_box", "query_objects_within_radius", "nearest_objects"}
+
+
+def is_idempotent(command_type: str, params: Dict[str, Any] | None = None) -> bool:
+    """Whether a command may be sent again after a failure without side effects"""
+    if command_type in _IDEMPOTENT_COMMANDS or command_type.startswith("get_"):
+        return True
+    return bool((params or {}).get(CLIENT_TOKEN))
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter between attempts.
+
+    - max_attempts: Total attempts for an idempotent command, including the first.
+    - base_delay: Delay bound after the first failure, in seconds.
+    - max_delay: Upper bound for the delay, in seconds.
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before the given retry (1 for the first retry)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class CircuitOpenError(RhinoConnectionError):
+    """Raised without contacting Rhino while the circuit breaker is open"""
+
+
+@dataclass
+class CircuitBreaker:
+    """Fail fast after repeated transport failures.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    calls fail immediately. Once ``reset_timeout`` seconds have passed a
+    single trial call is let through: its success closes the breaker, its
+    failure opens it again.
+    """
+    failure_threshold: int = 3
+    reset_timeout: float = 10.0
+    state: str = field(default="closed", init=False)
+    _failures: int = field(default=0, init=False, repr=False)
+    _opened_at: float = field(default=0.0, init=False, repr=False)
+    _trial_started: float | None = field(default=None, init=False, repr=False)
+
+    def before_call(self):
+        """Raise ``CircuitOpenError`` if the call should not be attempted"""
+        if self.state == "closed":
+            return
+        now = time.monotonic()
+        remaining = self.reset_timeout - (now - self._opened_at)
+        if self.state == "open" and remaining <= 0:
+            self.state = "half_open"
+        # A trial that never reported back (e.g. it was cancelled) does not block the next one forever
+        trial_stale = self._trial_started is None or now - self._trial_started > self.reset_timeout
+        if self.state == "half_open" and trial_stale:
+            self._trial_started = now
+            return
+        raise CircuitOpenError(
+            f"Rhino is not responding, not retrying for another {max(remaining, 0):.1f}s. "
+            "Make sure the Rhino addon is running."
+        )
+
+    def record_success(self):
+        self.state = "closed"
+        self._failures = 0
+        self._trial_started = None
+
+    def record_failure(self):
+        self._failures += 1
+        self._trial_started = None
+        if self.state == "half_open" or self._failures >= self.failure_threshold:
+            self.state = "open"
+            self._opened_at = time.monotonic()
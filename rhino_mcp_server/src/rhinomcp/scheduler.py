@@ -0,0 +1,283 @@
+"""Priority scheduling of the commands sent to Rhino.
+
+The plugin runs every command on Rhino's UI thread, one at a time, so a
+10000 object ``create_objects`` keeps a user's quick
+``get_selected_objects_info`` waiting until the whole batch is done.
+``CommandScheduler`` decides which command goes to Rhino next:
+
+- Commands belong to one of three classes: ``interactive`` (reads),
+  ``normal`` (single edits) and ``bulk`` (large batches).
+- Waiting commands are released highest class first, and within a class in
+  the order they arrived.
+- At most ``bulk_in_flight`` bulk commands are sent at once, so a waiting
+  read gets in after the bulk command currently running. Inside
+  ``bulk_allowance`` more may run, as for the overlapping chunks of
+  ``rhinomcp.bulk``, but never all ``max_in_flight``.
+
+Large batches are split into slices of ``slice_size`` items with
+``slice_command`` and their results put back together with
+``merge_results``. Rhino works through one slice at a time, and reads and
+edits get to run in between.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, List, Tuple, TypeVar
+
+from rhinomcp.cache import is_read_only
+from rhinomcp.errors import RhinoTimeoutError
+from rhinomcp.retry import CLIENT_TOKEN
+from rhinomcp.timeouts import remaining
+
+INTERACTIVE = "interactive"
+NORMAL = "normal"
+BULK = "bulk"
+
+# Highest priority first
+PRIORITIES = (INTERACTIVE, NORMAL, BULK)
+
+BULK_SLICE_SIZE = 500
+
+# Latency samples kept per class for the percentiles
+_SAMPLES = 1000
+
+T = TypeVar("T")
+
+_bulk_allowance: ContextVar[int | None] = ContextVar("rhinomcp_bulk_allowance", default=None)
+
+
+@contextmanager
+def bulk_allowance(count: int) -> Iterator[None]:
+    """Let up to ``count`` bulk commands sent inside the block run at once.
+
+    Bulk commands sent elsewhere keep the scheduler's ``bulk_in_flight``, and
+    one of its ``max_in_flight`` stays free for reads and edits either way.
+    """
+    token = _bulk_allowance.set(count)
+    try:
+        yield
+    finally:
+        _bulk_allowance.reset(token)
+
+
+def _split_objects(params: Dict[str, Any], size: int) -> List[Dict[str, Any]]:
+    objects = params.get("objects") or []
+    rest = {key: value for key, value in params.items() if key not in ("objects", CLIENT_TOKEN)}
+    return [dict(rest, objects=objects[start:start + size]) for start in range(0, len(objects), size)]
+
+
+def _split_created(params: Dict[str, Any], size: int) -> List[Dict[str, Any]]:
+    if isinstance(params.get("objects"), list):
+        return _split_objects(params, size)
+    # The older form of create_objects takes the objects keyed by name
+    items = [(key, value) for key, value in params.items() if key != CLIENT_TOKEN]
+    return [dict(items[start:start + size]) for start in range(0, len(items), size)]
+
+
+def _merge_created(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    if all(isinstance(result.get("objects"), list) for result in results):
+        return {"objects": [item for result in results for item in result["objects"]]}
+    return {key: value for result in results for key, value in result.items()}
+
+
+def _batch_length(command_type: str, params: Dict[str, Any]) -> int:
+    if command_type == "create_objects":
+        if isinstance(params.get("objects"), list):
+            return len(params["objects"])
+        return sum(1 for key in params if key != CLIENT_TOKEN)
+    if command_type == "modify_objects" and not params.get("all"):
+        return len(params.get("objects") or [])
+    return 0
+
+
+# How each command that can be sliced is split and how the slices' results add up
+_SLICERS: Dict[str, Tuple[Callable[[Dict[str, Any], int], List[Dict[str, Any]]], Callable[[List[Dict[str, Any]]], Dict[str, Any]]]] = {
+    "create_objects": (_split_created, _merge_created),
+    "modify_objects": (_split_objects, lambda results: {"modified": sum(result.get("modified", 0) for result in results)}),
+}
+
+
+def is_bulk(command_type: str, params: Dict[str, Any] | None, slice_size: int = BULK_SLICE_SIZE) -> bool:
+    """Whether a command is a batch large enough to be sent in slices"""
+    return command_type in _SLICERS and _batch_length(command_type, params or {}) > slice_size
+
+
+def command_priority(command_type: str, params: Dict[str, Any] | None = None, slice_size: int = BULK_SLICE_SIZE) -> str:
+    """The class a command is scheduled in unless the caller chooses one"""
+    if is_bulk(command_type, params, slice_size):
+        return BULK
+    if is_read_only(command_type):
+        return INTERACTIVE
+    return NORMAL
+
+
+def slice_command(command_type: str, params: Dict[str, Any], slice_size: int = BULK_SLICE_SIZE) -> List[Dict[str, Any]]:
+    """Split the parameters of a large batch into those of ``slice_size`` item batches.
+
+    A ``client_token`` is carried over as one token per slice, so a retried
+    slice is still recognised by the plugin.
+    """
+    if not is_bulk(command_type, params, slice_size):
+        return [params]
+    split, _merge = _SLICERS[command_type]
+    slices = split(params, slice_size)
+    token = params.get(CLIENT_TOKEN)
+    if token:
+        for index, slice_params in enumerate(slices):
+            slice_params[CLIENT_TOKEN] = f"{token}-{index}"
+    return slices
+
+
+def merge_results(command_type: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine the results of the slices into the result of the whole batch"""
+    if len(results) == 1:
+        return results[0]
+    _split, merge = _SLICERS[command_type]
+    return merge(results)
+
+
+class _ClassStats:
+    def __init__(self):
+        self.scheduled = 0
+        self.waited = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.samples: Deque[float] = deque(maxlen=_SAMPLES)
+
+    def record(self, waited: float):
+        self.scheduled += 1
+        if waited > 0:
+            self.waited += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        self.samples.append(waited)
+
+    def as_dict(self, queued: int) -> Dict[str, Any]:
+        samples = sorted(self.samples)
+
+        def percentile(fraction: float) -> float:
+            return samples[min(int(fraction * len(samples)), len(samples) - 1)] if samples else 0.0
+
+        return {
+            "queued": queued,
+            "scheduled": self.scheduled,
+            "waited": self.waited,
+            "wait_avg_s": self.wait_total / self.scheduled if self.scheduled else 0.0,
+            "wait_p50_s": percentile(0.50),
+            "wait_p95_s": percentile(0.95),
+            "wait_p99_s": percentile(0.99),
+            "wait_max_s": self.wait_max,
+        }
+
+
+class CommandScheduler:
+    """Releases commands to Rhino by priority class.
+
+    Parameters:
+    - max_in_flight: Commands sent to Rhino at once, of any class.
+    - bulk_in_flight: Of those, how many may be bulk commands or slices, unless
+      sent inside ``bulk_allowance``.
+    """
+
+    def __init__(self, max_in_flight: int = 4, bulk_in_flight: int = 1):
+        self.max_in_flight = max_in_flight
+        self.bulk_in_flight = bulk_in_flight
+        self._running: Dict[str, int] = {priority: 0 for priority in PRIORITIES}
+        # (rank, order, priority, bulk limit, future)
+        self._queue: List[Tuple[int, int, str, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._stats = {priority: _ClassStats() for priority in PRIORITIES}
+
+    def _bulk_limit(self) -> int:
+        """Bulk commands that may run at once for a command sent from the current context"""
+        allowance = _bulk_allowance.get()
+        if allowance is None:
+            return self.bulk_in_flight
+        return max(self.bulk_in_flight, min(allowance, self.max_in_flight - 1))
+
+    def _can_start(self, priority: str, bulk_limit: int) -> bool:
+        if sum(self._running.values()) >= self.max_in_flight:
+            return False
+        return priority != BULK or self._running[BULK] < bulk_limit
+
+    def _release_next(self):
+        while self._queue:
+            entry = self._queue[0]
+            if entry[-1].done():
+                # Its caller gave up waiting
+                heapq.heappop(self._queue)
+                continue
+            if not self._can_start(entry[2], entry[3]):
+                if entry[2] != BULK or sum(self._running.values()) >= self.max_in_flight:
+                    return
+                # Bulk is the lowest class, so only bulk commands wait behind
+                # this one; those with a larger allowance may still start
+                entry = min((waiting for waiting in self._queue if not waiting[-1].done() and self._can_start(waiting[2], waiting[3])), default=None)
+                if entry is None:
+                    return
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+            else:
+                heapq.heappop(self._queue)
+            self._running[entry[2]] += 1
+            entry[-1].set_result(None)
+
+    async def _acquire(self, priority: str):
+        bulk_limit = self._bulk_limit()
+        if not self._queue and self._can_start(priority, bulk_limit):
+            self._running[priority] += 1
+            self._stats[priority].record(0.0)
+            return
+
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (PRIORITIES.index(priority), next(self._order), priority, bulk_limit, future))
+        self._release_next()
+        try:
+            await future
+        except BaseException:
+            if not future.cancelled():
+                # Released just as the caller gave up, pass the turn on
+                self._release(priority)
+            raise
+        self._stats[priority].record(time.monotonic() - started)
+
+    def _release(self, priority: str):
+        self._running[priority] -= 1
+        self._release_next()
+
+    async def run(self, priority: str, send: Callable[[], Awaitable[T]]) -> T:
+        """Wait for the turn of ``priority``, then await ``send()``.
+
+        The wait counts against the caller's deadline, see ``rhinomcp.timeouts``.
+        """
+        if priority not in self._running:
+            raise ValueError(f"Unknown priority {priority}, expected one of {', '.join(PRIORITIES)}")
+        left = remaining()
+        if left is None:
+            await self._acquire(priority)
+        else:
+            try:
+                await asyncio.wait_for(self._acquire(priority), timeout=left)
+            except asyncio.TimeoutError:
+                raise RhinoTimeoutError(f"Deadline exceeded after waiting {left:.1f}s for the turn of a {priority} command")
+        try:
+            return await send()
+        finally:
+            self._release(priority)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queueing latency and current load of each class"""
+        queued = {priority: 0 for priority in PRIORITIES}
+        for _rank, _order, priority, _bulk_limit, future in self._queue:
+            if not future.done():
+                queued[priority] += 1
+        return {
+            "running": dict(self._running),
+            **{priority: self._stats[priority].as_dict(queued[priority]) for priority in PRIORITIES},
+        }
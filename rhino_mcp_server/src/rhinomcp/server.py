@@ -1,12 +1,25 @@
 # rhino_mcp_server.py
-from mcp.server.fastmcp import FastMCP, Context, Image
-import socket
-import json
-import asyncio
+from mcp.server.fastmcp import FastMCP, Context
+import argparse
+import os
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, Dict, Any, List
+from typing import AsyncIterator, Dict, Any, Iterable, List, Sequence, Tuple
+
+from rhinomcp.async_connection import RHINO_HOST, RHINO_PORT, run_sync
+from rhinomcp.bulk import Progress, create_block_instances, create_objects_columnar, transform_objects
+from rhinomcp.cache import ResponseCache
+from rhinomcp.logs import configure_logging
+from rhinomcp.metrics import METRICS
+from rhinomcp.recorder import start_recording, stop_recording
+from rhinomcp.pool import (
+    RHINO_POOL_SIZE,
+    RhinoConnectionPool,
+    close_async_rhino_connection,
+    get_async_rhino_connection,
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
@@ -15,148 +28,76 @@ logger = logging.getLogger("RhinoMCPServer")
 
 @dataclass
 class RhinoConnection:
+    """Blocking connection to Rhino for scripts and other synchronous callers.
+
+    This is a thin wrapper around a ``RhinoConnectionPool``: commands run on a
+    background event loop, so the MCP tools and scripts share one protocol
+    implementation and the connection can be shared between threads.
+    """
     host: str
     port: int
-    sock: socket.socket | None = None  # Changed from 'socket' to 'sock' to avoid naming conflict
-    
+    framing: str = "auto"  # "auto" asks the plugin for length framing, "legacy" never does
+    max_connections: int = 1
+    cache_ttl: float = 5.0  # seconds reads are answered from the cache, 0 turns it off
+    _pool: RhinoConnectionPool = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._pool = run_sync(self._create_pool())
+
+    async def _create_pool(self) -> RhinoConnectionPool:
+        # Created on the background loop, which is where it will be used
+        return RhinoConnectionPool(
+            self.host, self.port, max_size=self.max_connections, framing=self.framing,
+            cache=ResponseCache(ttl=self.cache_ttl),
+        )
+
     def connect(self) -> bool:
         """Connect to the Rhino addon socket server"""
-        if self.sock:
-            return True
-            
+        async def _connect():
+            async with self._pool.connection():
+                pass
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.connect((self.host, self.port))
-            logger.info(f"Connected to Rhino at {self.host}:{self.port}")
+            run_sync(_connect())
             return True
         except Exception as e:
             logger.error(f"Failed to connect to Rhino: {str(e)}")
-            self.sock = None
             return False
-    
+
     def disconnect(self):
         """Disconnect from the Rhino addon"""
-        if self.sock:
-            try:
-                self.sock.close()
-            except Exception as e:
-                logger.error(f"Error disconnecting from Rhino: {str(e)}")
-            finally:
-                self.sock = None
-
-    def receive_full_response(self, sock, buffer_size=8192):
-        """Receive the complete response, potentially in multiple chunks"""
-        chunks = []
-        # Use a consistent timeout value that matches the addon's timeout
-        sock.settimeout(15.0)  # Match the addon's timeout
-        
-        try:
-            while True:
-                try:
-                    chunk = sock.recv(buffer_size)
-                    if not chunk:
-                        # If we get an empty chunk, the connection might be closed
-                        if not chunks:  # If we haven't received anything yet, this is an error
-                            raise Exception("Connection closed before receiving any data")
-                        break
-                    
-                    chunks.append(chunk)
-                    
-                    # Check if we've received a complete JSON object
-                    try:
-                        data = b''.join(chunks)
-                        json.loads(data.decode('utf-8'))
-                        # If we get here, it parsed successfully
-                        logger.info(f"Received complete response ({len(data)} bytes)")
-                        return data
-                    except json.JSONDecodeError:
-                        # Incomplete JSON, continue receiving
-                        continue
-                except socket.timeout:
-                    # If we hit a timeout during receiving, break the loop and try to use what we have
-                    logger.warning("Socket timeout during chunked receive")
-                    break
-                except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
-                    logger.error(f"Socket connection error during receive: {str(e)}")
-                    raise  # Re-raise to be handled by the caller
-        except socket.timeout:
-            logger.warning("Socket timeout during chunked receive")
-        except Exception as e:
-            logger.error(f"Error during receive: {str(e)}")
-            raise
-            
-        # If we get here, we either timed out or broke out of the loop
-        # Try to use what we have
-        if chunks:
-            data = b''.join(chunks)
-            logger.info(f"Returning data after receive completion ({len(data)} bytes)")
-            try:
-                # Try to parse what we have
-                json.loads(data.decode('utf-8'))
-                return data
-            except json.JSONDecodeError:
-                # If we can't parse it, it's incomplete
-                raise Exception("Incomplete JSON response received")
-        else:
-            raise Exception("No data received")
-
-    def send_command(self, command_type: str, params: Dict[str, Any] = {}) -> Dict[str, Any]:
+        run_sync(self._pool.clear())
+
+    def send_command(
+        self,
+        command_type: str,
+        params: Dict[str, Any] = {},
+        timeout: float | None = None,
+        priority: str | None = None,
+    ) -> Dict[str, Any]:
         """Send a command to Rhino and return the response"""
-        if not self.sock and not self.connect():
-            raise ConnectionError("Not connected to Rhino")
-        
-        command = {
-            "type": command_type,
-            "params": params or {}
-        }
-        
-        try:
-            # Log the command being sent
-            logger.info(f"Sending command: {command_type} with params: {params}")
-
-            if self.sock is None:
-                raise Exception("Socket is not connected")
-            
-            # Send the command
-            self.sock.sendall(json.dumps(command).encode('utf-8'))
-            logger.info(f"Command sent, waiting for response...")
-            
-            # Set a timeout for receiving - use the same timeout as in receive_full_response
-            self.sock.settimeout(15.0)  # Match the addon's timeout
-            
-            # Receive the response using the improved receive_full_response method
-            response_data = self.receive_full_response(self.sock)
-            logger.info(f"Received {len(response_data)} bytes of data")
-            
-            response = json.loads(response_data.decode('utf-8'))
-            logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
-            
-            if response.get("status") == "error":
-                logger.error(f"Rhino error: {response.get('message')}")
-                raise Exception(response.get("message", "Unknown error from Rhino"))
-            
-            return response.get("result", {})
-        except socket.timeout:
-            logger.error("Socket timeout while waiting for response from Rhino")
-            # Don't try to reconnect here - let the get_rhino_connection handle reconnection
-            # Just invalidate the current socket so it will be recreated next time
-            self.sock = None
-            raise Exception("Timeout waiting for Rhino response - try simplifying your request")
-        except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
-            logger.error(f"Socket connection error: {str(e)}")
-            self.sock = None
-            raise Exception(f"Connection to Rhino lost: {str(e)}")
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response from Rhino: {str(e)}")
-            # Try to log what was received
-            if 'response_data' in locals() and response_data: # type: ignore
-                logger.error(f"Raw response (first 200 bytes): {response_data[:200]}")
-            raise Exception(f"Invalid response from Rhino: {str(e)}")
-        except Exception as e:
-            logger.error(f"Error communicating with Rhino: {str(e)}")
-            # Don't try to reconnect here - let the get_rhino_connection handle reconnection
-            self.sock = None
-            raise Exception(f"Communication error with Rhino: {str(e)}")
+        return run_sync(self._pool.send_command(command_type, params, timeout=timeout, priority=priority))
+
+    def send_commands(
+        self, commands: Iterable[Tuple[str, Dict[str, Any]]], timeout: float | None = None
+    ) -> List[Dict[str, Any] | Exception]:
+        """Pipeline several commands and return their results (or exceptions) in order"""
+        return run_sync(self._pool.send_commands(commands, timeout=timeout))
+
+    def create_objects_columnar(self, object_type: str, **columns: Any) -> List[Dict[str, Any]]:
+        """Create many objects of one type from parallel arrays, see ``rhinomcp.bulk.create_objects_columnar``"""
+        return run_sync(create_objects_columnar(self._pool, object_type, **columns))
+
+    def create_block_instances(self, block: str, **columns: Any) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Place many instances of a block, see ``rhinomcp.bulk.create_block_instances``"""
+        return run_sync(create_block_instances(self._pool, block, **columns))
+
+    def transform_objects(self, ids: Sequence[str] | None = None, **transforms: Any) -> Dict[str, Any]:
+        """Transform many objects at once, see ``rhinomcp.bulk.transform_objects``"""
+        return run_sync(transform_objects(self._pool, ids, **transforms))
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool metrics, see ``RhinoConnectionPool.stats``"""
+        return self._pool.stats()
 
 @asynccontextmanager
 async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
@@ -170,8 +111,8 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
         
         # Try to connect to Rhino on startup to verify it's available
         try:
-            # This will initialize the global connection if needed
-            rhino = get_rhino_connection()
+            # This will initialize the event loop's global connection if needed
+            await get_async_rhino_connection()
             logger.info("Successfully connected to Rhino on startup")
         except Exception as e:
             logger.warning(f"Could not connect to Rhino on startup: {str(e)}")
@@ -181,15 +122,43 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
         yield {}
     finally:
         # Clean up the global connection on shutdown
-        global _rhino_connection
-        if _rhino_connection:
-            logger.info("Disconnecting from Rhino on shutdown")
-            _rhino_connection.disconnect()
-            _rhino_connection = None
+        await close_async_rhino_connection()
         logger.info("RhinoMCP server shut down")
 
+def _reports_error(content: Sequence[Any]) -> bool:
+    """Whether a tool's result is one of the error strings or ``{"error": ...}`` objects the tools return"""
+    for item in content:
+        text = getattr(item, "text", "")
+        if text.startswith("Error") or text.lstrip("{ \n").startswith('"error"'):
+            return True
+    return False
+
+def progress_reporter(ctx: Context) -> Progress:
+    """A ``rhinomcp.bulk`` progress callback reporting to the client of the tool call ``ctx`` belongs to"""
+    async def progress(done: int, total: int | None):
+        try:
+            await ctx.report_progress(done, total)
+        except ValueError:
+            # Called outside of an MCP request, there is nobody to report to
+            pass
+
+    return progress
+
+class RhinoMCP(FastMCP):
+    """FastMCP counting the calls, errors and latency of every tool in ``METRICS``"""
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Sequence[Any]:
+        started = time.perf_counter()
+        failed = True
+        try:
+            content = await super().call_tool(name, arguments)
+            failed = _reports_error(content)
+            return content
+        finally:
+            METRICS.count_tool(name, time.perf_counter() - started, failed)
+
 # Create the MCP server with lifespan support
-mcp = FastMCP(
+mcp = RhinoMCP(
     "RhinoMCP",
     description="Rhino integration through the Model Context Protocol",
     lifespan=server_lifespan
@@ -206,7 +175,7 @@ def get_rhino_connection():
     
     # Create a new connection if needed
     if _rhino_connection is None:
-        _rhino_connection = RhinoConnection(host="127.0.0.1", port=1999)
+        _rhino_connection = RhinoConnection(host=RHINO_HOST, port=RHINO_PORT, max_connections=RHINO_POOL_SIZE)
         if not _rhino_connection.connect():
             logger.error("Failed to connect to Rhino")
             _rhino_connection = None
@@ -218,7 +187,26 @@ def get_rhino_connection():
 # Main execution
 def main():
     """Run the MCP server"""
-    mcp.run()
+    parser = argparse.ArgumentParser(description="Rhino integration through the Model Context Protocol")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    parser.add_argument("--log-file", help="also write the log to this file as JSON lines, rotated at 10 MB")
+    parser.add_argument("--log-sample-rate", type=float, default=1.0,
+                        help="fraction of the DEBUG and INFO records that are written, warnings and errors always are")
+    parser.add_argument("--record", help="record the commands sent to Rhino to this file, see rhinomcp.replay")
+    parser.add_argument("--metrics-file", default=os.environ.get("RHINOMCP_METRICS_FILE"),
+                        help="write the metrics to this file in the Prometheus text format whenever get_server_metrics "
+                             "is called and on exit, defaults to $RHINOMCP_METRICS_FILE")
+    args = parser.parse_args()
+    METRICS.prometheus_file = args.metrics_file
+    configure_logging(args.log_level, file=args.log_file, sample_rate=args.log_sample_rate)
+    if args.record:
+        start_recording(args.record)
+    try:
+        mcp.run()
+    finally:
+        stop_recording()
+        if METRICS.prometheus_file:
+            METRICS.write_prometheus(METRICS.prometheus_file)
 
 
 if __name__ == "__main__":
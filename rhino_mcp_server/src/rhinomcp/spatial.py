@@ -0,0 +1,92 @@
+"""Spatial queries over the bounding boxes of the document's objects.
+
+The plugin keeps an R-tree of every object's bounding box, the one
+``get_document_objects`` reports, built by the first query and updated with
+every change to the document. Three commands use it:
+
+- ``query_objects_in_box``: objects whose box intersects the box from
+  ``min`` to ``max``, or lies inside it with ``contained``.
+- ``query_objects_within_radius``: objects whose box comes within
+  ``radius`` of ``center``, with that distance.
+- ``nearest_objects``: the ``count`` objects whose boxes are nearest to
+  ``point``, nearest first, optionally no farther than ``max_distance``.
+
+The first two answer with pages of ids in the order of
+``get_document_objects``; the iterators here stream them:
+
+    async for object_id in iter_objects_in_box(pool, [0, 0, 0], [10, 10, 5]):
+        ...
+
+Distances are measured to the bounding box, zero for points inside it.
+"""
+
+import math
+from typing import Any, AsyncIterator, Dict, Iterable, List, Sequence, Tuple
+
+from rhinomcp.async_connection import AsyncRhinoConnection
+from rhinomcp.documents import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, iter_pages
+from rhinomcp.pool import RhinoConnectionPool
+
+QUERY_OBJECTS_IN_BOX = "query_objects_in_box"
+QUERY_OBJECTS_WITHIN_RADIUS = "query_objects_within_radius"
+NEAREST_OBJECTS = "nearest_objects"
+
+DEFAULT_NEAREST_COUNT = 10
+
+Point = Sequence[float]
+Box = Sequence[Point]
+
+
+def box_distance(box: Box, point: Point) -> float:
+    """Distance from ``point`` to the box ``[min, max]``, zero inside it"""
+    return math.sqrt(sum(max(box[0][axis] - point[axis], 0.0, point[axis] - box[1][axis]) ** 2 for axis in range(3)))
+
+
+def boxes_intersect(a: Box, b: Box) -> bool:
+    return all(a[0][axis] <= b[1][axis] and b[0][axis] <= a[1][axis] for axis in range(3))
+
+
+def box_contains(outer: Box, inner: Box) -> bool:
+    return all(outer[0][axis] <= inner[0][axis] and inner[1][axis] <= outer[1][axis] for axis in range(3))
+
+
+def normalize_box(a: Point, b: Point) -> List[List[float]]:
+    """The box with opposite corners ``a`` and ``b`` as ``[min, max]``"""
+    return [[float(min(a[axis], b[axis])) for axis in range(3)], [float(max(a[axis], b[axis])) for axis in range(3)]]
+
+
+def _with_distances(page: Dict[str, Any]) -> Iterable[Tuple[str, float]]:
+    return zip(page.get("ids", []), page.get("distances", []))
+
+
+def _page_size(page_size: int) -> int:
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+    return page_size
+
+
+async def iter_objects_in_box(
+    rhino: RhinoConnectionPool | AsyncRhinoConnection,
+    min: Point,
+    max: Point,
+    contained: bool = False,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> AsyncIterator[str]:
+    """Yield the id of every object whose bounding box intersects the box, or lies inside it with ``contained``"""
+    params: Dict[str, Any] = {"min": list(min), "max": list(max), "limit": _page_size(page_size)}
+    if contained:
+        params["contained"] = True
+    async for object_id in iter_pages(rhino, QUERY_OBJECTS_IN_BOX, params, lambda page: page.get("ids", [])):
+        yield object_id
+
+
+async def iter_objects_within_radius(
+    rhino: RhinoConnectionPool | AsyncRhinoConnection,
+    center: Point,
+    radius: float,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> AsyncIterator[Tuple[str, float]]:
+    """Yield the id and distance of every object whose bounding box comes within ``radius`` of ``center``"""
+    params = {"center": list(center), "radius": float(radius), "limit": _page_size(page_size)}
+    async for object_id, distance in iter_pages(rhino, QUERY_OBJECTS_WITHIN_RADIUS, params, _with_distances):
+        yield object_id, distance
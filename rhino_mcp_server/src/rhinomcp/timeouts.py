@@ -0,0 +1,91 @@
+"""Per-command timeouts and caller deadlines.
+
+Every command gets the timeout from ``COMMAND_TIMEOUTS`` unless the caller
+overrides it. On top of that a caller can bound everything it sends inside a
+block with ``deadline``; the deadline lives in a context variable, so it
+follows the call into tools, retries and gathered tasks:
+
+    with deadline(5.0):
+        await rhino.send_command("get_document_info")
+        await rhino.send_command("select_objects", {...})
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator
+
+from rhinomcp.errors import RhinoTimeoutError
+
+DEFAULT_TIMEOUT = 15.0
+
+# Seconds to wait for each command's reply. Reads should fail fast when Rhino
+# is wedged; batches and Grasshopper solutions legitimately take much longer.
+COMMAND_TIMEOUTS: Dict[str, float] = {
+    "ping": 2.0,
+    "get_document_info": 1.0,
+    "get_document_objects": 10.0,
+    "subscribe_document_events": 10.0,
+    "get_object_info": 2.0,
+    "get_selected_objects_info": 5.0,
+    "get_or_set_current_layer": 5.0,
+    "select_objects": 10.0,
+    "query_objects_in_box": 10.0,
+    "query_objects_within_radius": 10.0,
+    "nearest_objects": 10.0,
+    "create_object": 15.0,
+    "create_layer": 15.0,
+    "delete_object": 15.0,
+    "delete_layer": 15.0,
+    "modify_object": 15.0,
+    "create_objects": 120.0,
+    "create_objects_columnar": 120.0,
+    "create_block_definition": 15.0,
+    "create_block_instances": 120.0,
+    "modify_objects": 120.0,
+    "execute_rhinoscript_python_code": 120.0,
+    "open_grasshopper": 60.0,
+    "import_grasshopper_definition": 120.0,
+    "export_grasshopper_definition": 120.0,
+}
+
+_deadline: ContextVar[float | None] = ContextVar("rhinomcp_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """Make every command sent inside the block finish within ``seconds`` from now.
+
+    Nested deadlines can only shorten the time left. ``None`` leaves the
+    current deadline as it is.
+    """
+    if seconds is None:
+        yield
+        return
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left until the current deadline, or ``None`` without one"""
+    expires = _deadline.get()
+    if expires is None:
+        return None
+    return expires - time.monotonic()
+
+
+def command_timeout(command_type: str, timeout: float | None = None) -> float:
+    """Timeout for one command: the override or table value, cut short by the deadline"""
+    if timeout is None:
+        timeout = COMMAND_TIMEOUTS.get(command_type, DEFAULT_TIMEOUT)
+    left = remaining()
+    if left is not None:
+        if left <= 0:
+            raise RhinoTimeoutError(f"Deadline exceeded before {command_type} was sent")
+        timeout = min(timeout, left)
+    return timeout
@@ -0,0 +1,90 @@
+from mcp.server.fastmcp import Context
+from rhinomcp.bulk import MAX_COLUMNAR_CHUNK, create_objects_columnar
+from rhinomcp.patterns import array_columns
+from rhinomcp.server import get_async_rhino_connection, mcp, logger, progress_reporter
+from typing import Any, List, Dict
+
+
+@mcp.tool()
+async def create_array(
+    ctx: Context,
+    type: str,
+    pattern: Dict[str, Any],
+    params: Dict[str, Any] = None,
+    size: Any = None,
+    color: Any = None,
+    orient: bool = False,
+    name: str = None,
+    timeout: float = None,
+    chunk_size: int = MAX_COLUMNAR_CHUNK
+) -> Dict[str, Any]:
+    """
+    Create an array of objects of one type from a pattern: a grid, a circle, a spiral or points along a curve,
+    with sizes and colors changing across it. Use this instead of computing every position yourself,
+    one call creates the whole array.
+    
+    Parameters:
+    - type: Object type of every object ("POINT", "BOX", "SPHERE", "CONE", "CYLINDER", "CIRCLE", etc.)
+    - pattern: Where the objects go, a dictionary with a "kind" and its settings:
+        - {"kind": "grid", "count": [nx, ny, nz], "spacing": [sx, sy, sz], "center": [x, y, z]}
+          count and spacing can also be single numbers; the grid is centered on center
+        - {"kind": "polar", "count": n, "radius": r, "center": [x, y, z], "start_angle": 0, "sweep": 360, "rise": 0}
+          angles in degrees; rise lifts every object above the previous one, for a helix
+        - {"kind": "spiral", "count": n, "spacing": s, "center": [x, y, z], "angle": 137.508, "rise": 0}
+          golden-angle (Fibonacci) spiral, the n-th object at s * sqrt(n) from the center
+        - {"kind": "curve", "count": n, "points": [[x, y, z], ...], "degree": 3}
+          objects evenly spaced along the curve through these control points
+    - params: Type-specific parameters of every object, as for create_object(), around the origin
+    - size: Optional factor for the size params (width, length, height, radius, radius_x, radius_y): a number,
+      a gradient, or a list of gradients that multiply
+    - color: Optional [r, g, b] color of every object, or a gradient between two colors
+    - orient: Optional, turn every object about Z to face along the circle, spiral or curve
+    - name: Optional name of every object
+    - timeout: Optional seconds to wait for Rhino for each chunk, overriding the default of 120 seconds
+    - chunk_size: Optional number of objects sent to Rhino at once
+
+    A gradient goes from one value to another along a coordinate of the objects:
+    {"along": "x" | "y" | "z" | "radial" | "index", "from": a, "to": b, "range": [low, high], "function": "linear"}
+    - along: Position along an axis, distance from the pattern's center, or order in the array
+    - range: Optional coordinates where the gradient starts and ends, by default the extent of the array
+    - function: Optional "linear", "smooth", "ease_in" or "ease_out"
+
+    Returns:
+    - A dictionary with the following keys:
+        - "created": The number of objects created
+        - "failed": The number of objects that could not be created
+        - "ids": The id of every object in order, null for those that failed
+        - "errors": The index and error message of every object that failed
+
+    Example of params, a 6x6x6 grid of boxes shrinking and turning from blue to red away from the center:
+    {
+        "type": "BOX",
+        "pattern": {"kind": "grid", "count": [6, 6, 6], "spacing": 15},
+        "params": {"width": 1, "length": 1, "height": 1},
+        "size": {"along": "radial", "from": 10, "to": 0, "range": [0, 75]},
+        "color": {"along": "radial", "from": [0, 0, 255], "to": [255, 0, 0], "range": [0, 75]}
+    }
+    """
+    try:
+        # Get the global connection
+        rhino = await get_async_rhino_connection()
+
+        columns = array_columns(pattern, params, size=size, color=color, orient=orient)
+        results = await create_objects_columnar(
+            rhino, type, names=name, chunk_size=max(1, chunk_size), timeout=timeout, progress=progress_reporter(ctx),
+            **columns
+        )
+
+        ids = [result.get("id") if "error" not in result else None for result in results]
+        errors = [{"index": index, "error": result["error"]} for index, result in enumerate(results) if "error" in result]
+        return {
+            "created": len(results) - len(errors),
+            "failed": len(errors),
+            "ids": ids,
+            "errors": errors
+        }
+    except Exception as e:
+        logger.error(f"Error creating array: {str(e)}")
+        return {
+            "error": str(e)
+        }
\ No newline at end of file
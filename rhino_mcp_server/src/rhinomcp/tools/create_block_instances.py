@@ -0,0 +1,96 @@
+from mcp.server.fastmcp import Context
+from rhinomcp.bulk import MAX_COLUMNAR_CHUNK, create_block_instances as place_instances, instancing_savings
+from rhinomcp.server import get_async_rhino_connection, mcp, logger, progress_reporter
+from typing import Any, List, Dict
+
+
+@mcp.tool()
+async def create_block_instances(
+    ctx: Context,
+    block: str,
+    objects: List[Dict[str, Any]] = None,
+    replace: bool = False,
+    translations: List[Any] = None,
+    rotations: List[Any] = None,
+    scales: List[Any] = None,
+    colors: List[Any] = None,
+    names: List[str] = None,
+    count: int = None,
+    timeout: float = None,
+    chunk_size: int = MAX_COLUMNAR_CHUNK
+) -> Dict[str, Any]:
+    """
+    Place many copies of the same geometry as instances of a block. The geometry is defined once and
+    every instance only stores its transform, which keeps both the request and the document small.
+    Prefer this over create_objects for hundreds of identical objects.
+
+    Every transform is either shared by all instances or given as a list with one entry per instance.
+    
+    Parameters:
+    - block: Name of the block
+    - objects: Optional objects making up the block, each as for create_objects() (type, params, and optional
+      name, color, translation, rotation, scale). When given, the block is defined first; leave it out to place more
+      instances of an existing block. Objects without a color take the color of each instance.
+    - replace: Optional, redefine an existing block of the same name, which also updates its placed instances
+    - translations: Optional [x, y, z] translation, or one per instance
+    - rotations: Optional [x, y, z] rotation in radians around the block's center, or one per instance
+    - scales: Optional [x, y, z] scale factors from the block's minimum corner, or one per instance
+    - colors: Optional [r, g, b] color values (0-255), or one per instance
+    - names: Optional name for every instance, one per instance
+    - count: Number of instances, only needed when no value is given per instance
+    - timeout: Optional seconds to wait for Rhino for each chunk, overriding the default of 120 seconds
+    - chunk_size: Optional number of instances sent to Rhino at once
+
+    Returns:
+    - A dictionary with the following keys:
+        - "block": The name of the block
+        - "created": The number of instances placed
+        - "failed": The number of instances that could not be placed
+        - "ids": The id of every instance in order, null for those that failed
+        - "errors": The index, name and error message of every instance that failed
+        - "instance_count": The number of instances of the block in the document
+        - "definition_bytes", "instance_bytes": Rhino's memory estimate of the block's geometry and of one instance
+        - "saved_bytes": Estimated memory saved over copying the geometry for every instance
+
+    Example of params:
+    {
+        "block": "Column",
+        "objects": [
+            {"type": "CYLINDER", "params": {"radius": 0.3, "height": 4.0, "cap": true}},
+            {"type": "BOX", "params": {"width": 1.0, "length": 1.0, "height": 0.2}, "translation": [0, 0, 4.1]}
+        ],
+        "translations": [[0, 0, 0], [5, 0, 0], [10, 0, 0], [15, 0, 0]],
+        "colors": [200, 200, 200]
+    }
+    """
+    try:
+        # Get the global connection
+        rhino = await get_async_rhino_connection()
+
+        results, description = await place_instances(
+            rhino, block, objects=objects, replace=replace, translations=translations, rotations=rotations,
+            scales=scales, colors=colors, names=names, count=count, chunk_size=max(1, chunk_size), timeout=timeout,
+            progress=progress_reporter(ctx)
+        )
+
+        ids = [result.get("id") if "error" not in result else None for result in results]
+        errors = [
+            {"index": index, "name": names[index] if names else None, "error": result["error"]}
+            for index, result in enumerate(results) if "error" in result
+        ]
+        return {
+            "block": block,
+            "created": len(results) - len(errors),
+            "failed": len(errors),
+            "ids": ids,
+            "errors": errors,
+            "instance_count": description.get("instance_count", 0),
+            "definition_bytes": description.get("definition_bytes", 0),
+            "instance_bytes": description.get("instance_bytes", 0),
+            "saved_bytes": instancing_savings(description)
+        }
+    except Exception as e:
+        logger.error(f"Error creating block instances: {str(e)}")
+        return {
+            "error": str(e)
+        }
\ No newline at end of file
@@ -1,10 +1,12 @@
 from mcp.server.fastmcp import Context
 import json
-from rhinomcp.server import get_rhino_connection, mcp, logger
+import uuid
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
+from rhinomcp.retry import CLIENT_TOKEN
 from typing import Any, List, Dict
 
 @mcp.tool()
-def create_layer(
+async def create_layer(
     ctx: Context,
     name: str = None,
     color: List[int]= None,
@@ -28,7 +30,7 @@ def create_layer(
     """
     try:
         # Get the global connection
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
 
         command_params = {
             "name": name
@@ -37,8 +39,11 @@ def create_layer(
         if color is not None: command_params["color"] = color
         if parent is not None: command_params["parent"] = parent
 
+        # Lets the connection retry the creation safely if the reply gets lost
+        command_params[CLIENT_TOKEN] = uuid.uuid4().hex
+
         # Create the layer
-        result = rhino.send_command("create_layer", command_params)  
+        result = await rhino.send_command("create_layer", command_params)  
         
         return f"Created layer: {result['name']}"
     except Exception as e:
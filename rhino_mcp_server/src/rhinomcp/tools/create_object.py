@@ -1,10 +1,12 @@
 from mcp.server.fastmcp import Context
 import json
-from rhinomcp.server import get_rhino_connection, mcp, logger
+import uuid
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
+from rhinomcp.retry import CLIENT_TOKEN
 from typing import Any, List, Dict
 
 @mcp.tool()
-def create_object(
+async def create_object(
     ctx: Context,
     type: str = "BOX",
     name: str = None,
@@ -99,7 +101,7 @@ def create_object(
     """
     try:
         # Get the global connection
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
 
         command_params = {
             "type": type,
@@ -113,8 +115,11 @@ def create_object(
         if name: command_params["name"] = name
         if color: command_params["color"] = color
 
+        # Lets the connection retry the creation safely if the reply gets lost
+        command_params[CLIENT_TOKEN] = uuid.uuid4().hex
+
         # Create the object
-        result = result = rhino.send_command("create_object", command_params)  
+        result = result = await rhino.send_command("create_object", command_params)  
         
         return f"Created {type} object: {result['name']}"
     except Exception as e:
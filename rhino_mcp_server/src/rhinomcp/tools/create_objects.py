@@ -1,19 +1,24 @@
 from mcp.server.fastmcp import Context
-import json
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.bulk import MAX_CHUNK_OBJECTS, create_objects_in_chunks
+from rhinomcp.server import get_async_rhino_connection, mcp, logger, progress_reporter
 from typing import Any, List, Dict
 
 
 @mcp.tool()
-def create_objects(
+async def create_objects(
     ctx: Context,
-    objects: List[Dict[str, Any]]
-) -> str:
+    objects: List[Dict[str, Any]],
+    timeout: float = None,
+    chunk_size: int = MAX_CHUNK_OBJECTS
+) -> Dict[str, Any]:
     """
     Create multiple objects at once in the Rhino document.
+    Any number of objects can be created with one call, they are sent to Rhino in chunks.
     
     Parameters:
     - objects: A list of dictionaries, each containing the parameters for a single object
+    - timeout: Optional seconds to wait for Rhino for each chunk, overriding the default of 120 seconds
+    - chunk_size: Optional number of objects sent to Rhino at once
 
     Each object should have the following values:
     - type: Object type ("POINT", "LINE", "POLYLINE", "BOX", "SPHERE", etc.)
@@ -25,7 +30,11 @@ def create_objects(
     - scale: Optional [x, y, z] scale factors
 
     Returns:
-    A message indicating the created objects.
+    - A dictionary with the following keys:
+        - "created": The number of objects created
+        - "failed": The number of objects that could not be created
+        - "ids": The id of every object in the order they were given, null for those that failed
+        - "errors": The index, name and error message of every object that failed
     
     Examples of params:
     [
@@ -71,15 +80,25 @@ def create_objects(
     """
     try:
         # Get the global connection
-        rhino = get_rhino_connection()
-        command_params = {}
-        for obj in objects:
-            command_params[obj["name"]] = obj
-        result = rhino.send_command("create_objects", command_params)
-  
-        
-        return f"Created {len(result)} objects"
-    except Exception as e:
-        logger.error(f"Error creating object: {str(e)}")
-        return f"Error creating object: {str(e)}"
+        rhino = await get_async_rhino_connection()
+
+        results = await create_objects_in_chunks(
+            rhino, objects, max_objects=max(1, chunk_size), timeout=timeout, progress=progress_reporter(ctx)
+        )
 
+        ids = [result.get("id") if "error" not in result else None for result in results]
+        errors = [
+            {"index": index, "name": obj.get("name"), "error": result["error"]}
+            for index, (obj, result) in enumerate(zip(objects, results)) if "error" in result
+        ]
+        return {
+            "created": len(results) - len(errors),
+            "failed": len(errors),
+            "ids": ids,
+            "errors": errors
+        }
+    except Exception as e:
+        logger.error(f"Error creating objects: {str(e)}")
+        return {
+            "error": str(e)
+        }
\ No newline at end of file
@@ -0,0 +1,86 @@
+from mcp.server.fastmcp import Context
+from rhinomcp.bulk import MAX_COLUMNAR_CHUNK, create_objects_columnar as create_columnar
+from rhinomcp.server import get_async_rhino_connection, mcp, logger, progress_reporter
+from typing import Any, List, Dict
+
+
+@mcp.tool()
+async def create_objects_columnar(
+    ctx: Context,
+    type: str,
+    params: Dict[str, Any] = None,
+    translations: List[Any] = None,
+    rotations: List[Any] = None,
+    scales: List[Any] = None,
+    colors: List[Any] = None,
+    names: List[str] = None,
+    count: int = None,
+    timeout: float = None,
+    chunk_size: int = MAX_COLUMNAR_CHUNK
+) -> Dict[str, Any]:
+    """
+    Create many objects of the same type that only differ in a few values, such as a grid of boxes
+    or a field of spheres. Much faster and smaller than create_objects for thousands of objects.
+
+    Every value is either shared by all objects or given as a list with one entry per object.
+    
+    Parameters:
+    - type: Object type of every object ("POINT", "LINE", "CIRCLE", "ARC", "ELLIPSE", "BOX", "SPHERE", "CONE", "CYLINDER", "POLYLINE", "CURVE")
+    - params: Type-specific parameters as for create_object(). A number is shared by all objects, a list of numbers
+      has one per object. start, end and center are shared as [x, y, z] or given per object as [[x, y, z], ...].
+      points are always shared.
+    - translations: Optional [x, y, z] translation, or one per object
+    - rotations: Optional [x, y, z] rotation in radians, or one per object
+    - scales: Optional [x, y, z] scale factors, or one per object
+    - colors: Optional [r, g, b] color values (0-255), or one per object
+    - names: Optional name for every object, one per object
+    - count: Number of objects, only needed when no value is given per object
+    - timeout: Optional seconds to wait for Rhino for each chunk, overriding the default of 120 seconds
+    - chunk_size: Optional number of objects sent to Rhino at once
+
+    Returns:
+    - A dictionary with the following keys:
+        - "created": The number of objects created
+        - "failed": The number of objects that could not be created
+        - "ids": The id of every object in order, null for those that failed
+        - "errors": The index, name and error message of every object that failed
+
+    Examples of params:
+    {
+        "type": "BOX",
+        "params": {"width": [1, 2, 3], "length": 1.0, "height": [3, 2, 1]},
+        "translations": [[0, 0, 0], [5, 0, 0], [10, 0, 0]],
+        "colors": [255, 0, 0]
+    }
+    {
+        "type": "CIRCLE",
+        "params": {"center": [[0, 0, 0], [0, 0, 1], [0, 0, 2]], "radius": [1.0, 1.5, 2.0]},
+        "names": ["Ring 1", "Ring 2", "Ring 3"]
+    }
+    """
+    try:
+        # Get the global connection
+        rhino = await get_async_rhino_connection()
+
+        results = await create_columnar(
+            rhino, type, params=params, translations=translations, rotations=rotations, scales=scales,
+            colors=colors, names=names, count=count, chunk_size=max(1, chunk_size), timeout=timeout,
+            progress=progress_reporter(ctx)
+        )
+
+        ids = [result.get("id") if "error" not in result else None for result in results]
+        errors = [
+            {"index": index, "name": names[index] if names else None, "error": result["error"]}
+            for index, result in enumerate(results) if "error" in result
+        ]
+        return {
+            "created": len(results) - len(errors),
+            "failed": len(errors),
+            "ids": ids,
+            "errors": errors
+        }
+    except Exception as e:
+        logger.error(f"Error creating objects: {str(e)}")
+        return {
+            "error": str(e)
+        }
\ No newline at end of file
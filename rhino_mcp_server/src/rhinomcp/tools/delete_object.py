@@ -1,12 +1,12 @@
 from mcp.server.fastmcp import Context
 import json
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import Any, List, Dict
 
 
 
 @mcp.tool()
-def delete_object(ctx: Context, id: str = None, name: str = None, all: bool = None) -> str:
+async def delete_object(ctx: Context, id: str = None, name: str = None, all: bool = None) -> str:
     """
     Delete an object from the Rhino document.
     
@@ -16,7 +16,7 @@ def delete_object(ctx: Context, id: str = None, name: str = None, all: bool = No
     """
     try:
         # Get the global connection
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
 
         commandParams = {}
         if id is not None:
@@ -26,7 +26,7 @@ def delete_object(ctx: Context, id: str = None, name: str = None, all: bool = No
         if all:
             commandParams["all"] = all
         
-        result = rhino.send_command("delete_object", commandParams)
+        result = await rhino.send_command("delete_object", commandParams)
 
         return f"Deleted object: {result['name']}"
     except Exception as e:
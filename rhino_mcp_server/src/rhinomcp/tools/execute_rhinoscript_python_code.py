@@ -1,16 +1,17 @@
 from mcp.server.fastmcp import Context
 import json
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import Any, List, Dict
 
 
 @mcp.tool()
-def execute_rhinoscript_python_code(ctx: Context, code: str) -> Dict[str, Any]:
+async def execute_rhinoscript_python_code(ctx: Context, code: str, timeout: float = None) -> Dict[str, Any]:
     """
     Execute arbitrary RhinoScript code in Rhino.
     
     Parameters:
     - code: The RhinoScript code to execute
+    - timeout: Optional seconds to wait for Rhino, overriding the default of 120 seconds
 
     GUIDE: 
     
@@ -32,9 +33,9 @@ def execute_rhinoscript_python_code(ctx: Context, code: str) -> Dict[str, Any]:
     """
     try:
         # Get the global connection
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
         
-        return rhino.send_command("execute_rhinoscript_python_code", {"code": code})
+        return await rhino.send_command("execute_rhinoscript_python_code", {"code": code}, timeout=timeout)
 
     except Exception as e:
         logger.error(f"Error executing code: {str(e)}")
@@ -1,9 +1,9 @@
 from mcp.server.fastmcp import Context
-from rhinomcp import get_rhino_connection, mcp, logger
+from rhinomcp import get_async_rhino_connection, mcp, logger
 from typing import Any, Dict
 
 @mcp.tool()
-def export_grasshopper_definition(ctx: Context) -> Dict[str, Any]:
+async def export_grasshopper_definition(ctx: Context) -> Dict[str, Any]:
     """
     Export the current Grasshopper definition to a JSON representation.
     
@@ -28,10 +28,10 @@ def export_grasshopper_definition(ctx: Context) -> Dict[str, Any]:
     """
     try:
         # Get the global connection
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
         
         # Send the command to export the definition
-        return rhino.send_command("export_grasshopper_definition", {})
+        return await rhino.send_command("export_grasshopper_definition", {})
         
     except Exception as e:
         logger.error(f"Error exporting Grasshopper definition: {str(e)}")
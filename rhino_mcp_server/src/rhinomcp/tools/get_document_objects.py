@@ -0,0 +1,37 @@
+from mcp.server.fastmcp import Context
+from rhinomcp import get_async_rhino_connection, mcp, logger
+from rhinomcp.documents import page_params
+from typing import Any, Dict, List
+
+@mcp.tool()
+async def get_document_objects(
+    ctx: Context,
+    cursor: str = None,
+    limit: int = 100,
+    fields: List[str] = None
+) -> Dict[str, Any]:
+    """
+    List the objects of the Rhino document one page at a time.
+    Use this instead of get_document_info when the document has more objects than get_document_info returns.
+
+    Parameters:
+    - cursor: The "next_cursor" of the previous page, leave empty for the first page
+    - limit: Number of objects per page (at most 5000)
+    - fields: Optional list of keys to return for each object, out of "id", "name", "type", "layer", "color" and "bounding_box".
+              All of them by default.
+
+    Returns:
+    - A dictionary with the following keys:
+        - "objects": The objects of this page
+        - "next_cursor": The cursor of the next page, or null on the last page
+        - "object_count": The total number of objects in the document
+    """
+    try:
+        rhino = await get_async_rhino_connection()
+        return await rhino.send_command("get_document_objects", page_params(cursor, limit, fields))
+
+    except Exception as e:
+        logger.error(f"Error getting document objects from Rhino: {str(e)}")
+        return {
+            "error": str(e)
+        }
\ No newline at end of file
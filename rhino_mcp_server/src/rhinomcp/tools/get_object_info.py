@@ -1,10 +1,10 @@
 from mcp.server.fastmcp import Context
 import json
-from rhinomcp import get_rhino_connection, mcp, logger
+from rhinomcp import get_async_rhino_connection, mcp, logger
 from typing import Dict, Any
 
 @mcp.tool()
-def get_object_info(ctx: Context, id: str = None, name: str = None) -> Dict[str, Any]:
+async def get_object_info(ctx: Context, id: str = None, name: str = None) -> Dict[str, Any]:
     """
     Get detailed information about a specific object in the Rhino document.
     The information contains the object's id, name, type, all custom user attributes and geometry info.
@@ -29,8 +29,8 @@ def get_object_info(ctx: Context, id: str = None, name: str = None) -> Dict[str,
     - name: The name of the object to get information about
     """
     try:
-        rhino = get_rhino_connection()
-        return rhino.send_command("get_object_info", {"id": id, "name": name})
+        rhino = await get_async_rhino_connection()
+        return await rhino.send_command("get_object_info", {"id": id, "name": name})
 
     except Exception as e:
         logger.error(f"Error getting object info from Rhino: {str(e)}")
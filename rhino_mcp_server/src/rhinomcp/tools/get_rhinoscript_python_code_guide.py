@@ -1,11 +1,11 @@
 from mcp.server.fastmcp import Context
-from rhinomcp import get_rhino_connection, mcp, logger, rhinoscriptsyntax_json
+from rhinomcp import get_async_rhino_connection, mcp, logger, rhinoscriptsyntax_json
 from typing import Any, List, Dict
 
 
 
 @mcp.tool()
-def get_rhinoscript_python_code_guide(ctx: Context, function_name: str) -> Dict[str, Any]:
+async def get_rhinoscript_python_code_guide(ctx: Context, function_name: str) -> Dict[str, Any]:
     """
     Return the RhinoScriptsyntax Details for a specific function.
 
@@ -1,10 +1,10 @@
 from mcp.server.fastmcp import Context
-from rhinomcp import get_rhino_connection, mcp, logger, rhinoscriptsyntax_json
+from rhinomcp import get_async_rhino_connection, mcp, logger, rhinoscriptsyntax_json
 from typing import Any, List, Dict
 
 
 @mcp.tool()
-def get_rhinoscript_python_function_names(ctx: Context, categories: List[str]) -> List[str]:
+async def get_rhinoscript_python_function_names(ctx: Context, categories: List[str]) -> List[str]:
     """
     Return the RhinoScriptsyntax Function Names for specified categories.
 
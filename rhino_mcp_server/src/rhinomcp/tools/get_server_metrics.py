@@ -0,0 +1,41 @@
+from mcp.server.fastmcp import Context
+from rhinomcp import mcp, logger
+from rhinomcp.metrics import METRICS
+from rhinomcp.pool import running_pool
+from typing import Any, Dict
+
+@mcp.tool()
+async def get_server_metrics(ctx: Context, reset: bool = False) -> Dict[str, Any]:
+    """
+    Get the call counts, error counts and latency of the commands sent to Rhino and of the tools of this server.
+    Use this to find out which operations are slow or failing.
+
+    Parameters:
+    - reset: Start counting from zero again after reading the metrics
+
+    Returns:
+    - A dictionary with the following keys:
+        - "uptime_s": Seconds since the metrics started counting
+        - "commands": Per command type: calls, errors, latency in seconds, request and response sizes in bytes
+                      and the seconds spent encoding and decoding JSON
+        - "tools": Per tool: calls, errors and latency in seconds
+        - "pool": Statistics of the connection pool, when connected to Rhino
+        - "prometheus_file": The file the metrics were also written to, when the server was started with --metrics-file
+    """
+    try:
+        metrics = METRICS.as_dict()
+        pool = running_pool()
+        if pool is not None:
+            metrics["pool"] = pool.stats()
+        if METRICS.prometheus_file:
+            METRICS.write_prometheus(METRICS.prometheus_file)
+            metrics["prometheus_file"] = METRICS.prometheus_file
+        if reset:
+            METRICS.reset()
+        return metrics
+
+    except Exception as e:
+        logger.error(f"Error getting server metrics: {str(e)}")
+        return {
+            "error": str(e)
+        }
\ No newline at end of file
@@ -1,16 +1,17 @@
 from mcp.server.fastmcp import Context
-from rhinomcp import get_rhino_connection, mcp, logger
+from rhinomcp import get_async_rhino_connection, mcp, logger
 from typing import Any, Dict
 import json
 
 @mcp.tool()
-def import_grasshopper_definition(ctx: Context, definition: Dict[str, Any]) -> Dict[str, Any]:
+async def import_grasshopper_definition(ctx: Context, definition: Dict[str, Any], timeout: float = None) -> Dict[str, Any]:
     """
     Import a Grasshopper definition from a JSON representation.
     
     Parameters:
     - definition: A dictionary containing the Grasshopper definition in JSON format.
                  This should include components, connections, and their properties.
+    - timeout: Optional seconds to wait for Rhino, overriding the default of 120 seconds
     
     Returns:
     - A dictionary with the status of the import operation.
@@ -32,10 +33,10 @@ def import_grasshopper_definition(ctx: Context, definition: Dict[str, Any]) -> D
     """
     try:
         # Get the global connection
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
         
         # Send the command to import the definition
-        return rhino.send_command("import_grasshopper_definition", {"definition": definition})
+        return await rhino.send_command("import_grasshopper_definition", {"definition": definition}, timeout=timeout)
         
     except Exception as e:
         logger.error(f"Error importing Grasshopper definition: {str(e)}")
@@ -1,21 +1,31 @@
 from mcp.server.fastmcp import Context
 import json
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.bulk import MAX_COLUMNAR_CHUNK, transform_objects
+from rhinomcp.server import get_async_rhino_connection, mcp, logger, progress_reporter
 from typing import Any, List, Dict
 
 
 @mcp.tool()
-def modify_objects(
+async def modify_objects(
     ctx: Context,
-    objects: List[Dict[str, Any]],
-    all: bool = None
+    objects: List[Dict[str, Any]] = None,
+    all: bool = None,
+    ids: List[str] = None,
+    selected: bool = None,
+    xforms: List[Any] = None,
+    translations: List[Any] = None,
+    rotations: List[Any] = None,
+    scales: List[Any] = None,
+    timeout: float = None,
+    chunk_size: int = MAX_COLUMNAR_CHUNK
 ) -> str:
     """
-    Create multiple objects at once in the Rhino document.
+    Modify multiple objects at once in the Rhino document.
     
     Parameters:
     - objects: A List of objects, each containing the parameters for a single object modification 
     - all: Optional boolean to modify all objects, if true, only one object is required in the objects dictionary
+    - timeout: Optional seconds to wait for Rhino, overriding the default of 120 seconds
 
     Each object can have the following parameters:
     - id: The id of the object to modify
@@ -25,21 +35,43 @@ def modify_objects(
     - scale: Optional [x, y, z] scale factors
     - visible: Optional boolean to set visibility
 
+    To only transform many objects, leave out objects and give the objects as ids, or set
+    selected or all. Every transform is shared by all objects or given as a list with one
+    entry per id, which is much faster than one entry in objects per object:
+    - ids: The ids of the objects to transform
+    - selected: Optional boolean to transform the selected objects
+    - xforms: Optional 4x4 transformation matrix as a list of rows, or one per id.
+      Cannot be combined with translations, rotations and scales.
+    - translations: Optional [x, y, z] translation, or one per id
+    - rotations: Optional [x, y, z] rotation in radians about the object's center, or one per id
+    - scales: Optional [x, y, z] scale factors from the object's bounding box corner, or one per id
+    - chunk_size: Optional number of objects sent to Rhino at once
+
     Returns:
     A message indicating the modified objects.
     """
     try:
         # Get the global connection
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
+        if objects is None:
+            result = await transform_objects(
+                rhino, ids=ids, selected=bool(selected), all=bool(all), xforms=xforms, translations=translations,
+                rotations=rotations, scales=scales, chunk_size=max(1, chunk_size), timeout=timeout,
+                progress=progress_reporter(ctx)
+            )
+            message = f"Modified {result['modified']} objects"
+            if result["errors"]:
+                message += f", {len(result['errors'])} failed: {json.dumps(result['errors'][:10])}"
+            return message
+
         command_params = {}
         command_params["objects"] = objects
         if all:
             command_params["all"] = all
-        result = rhino.send_command("modify_objects", command_params)
+        result = await rhino.send_command("modify_objects", command_params, timeout=timeout)
   
         
         return f"Modified {result['modified']} objects"
     except Exception as e:
         logger.error(f"Error modifying objects: {str(e)}")
-        return f"Error modifying objects: {str(e)}"
-
+        return f"Error modifying objects: {str(e)}"
\ No newline at end of file
@@ -0,0 +1,38 @@
+from mcp.server.fastmcp import Context
+from rhinomcp import get_async_rhino_connection, mcp, logger
+from rhinomcp.spatial import DEFAULT_NEAREST_COUNT, NEAREST_OBJECTS
+from typing import Any, Dict, List
+
+@mcp.tool()
+async def nearest_objects(
+    ctx: Context,
+    point: List[float],
+    count: int = DEFAULT_NEAREST_COUNT,
+    max_distance: float = None
+) -> Dict[str, Any]:
+    """
+    Find the objects of the Rhino document nearest to a point, by the distance to their bounding boxes.
+    Returns ids only, use get_object_info for the details of the ones you need.
+
+    Parameters:
+    - point: [x, y, z] point to measure from
+    - count: Number of objects to find (at most 5000), default 10
+    - max_distance: Optional largest distance, farther objects are left out even if fewer than count are found
+
+    Returns:
+    - A dictionary with the following keys:
+        - "ids": The ids of the objects, nearest first
+        - "distances": The distance from point to the bounding box of each of them, 0 for boxes around point
+    """
+    try:
+        rhino = await get_async_rhino_connection()
+        params = {"point": point, "count": count}
+        if max_distance is not None:
+            params["max_distance"] = max_distance
+        return await rhino.send_command(NEAREST_OBJECTS, params)
+
+    except Exception as e:
+        logger.error(f"Error finding nearest objects: {str(e)}")
+        return {
+            "error": str(e)
+        }
\ No newline at end of file
@@ -1,9 +1,9 @@
 from mcp.server.fastmcp import Context
 import json
-from rhinomcp import get_rhino_connection, mcp, logger
+from rhinomcp import get_async_rhino_connection, mcp, logger
 
 @mcp.tool()
-def open_grasshopper(ctx: Context) -> str:
+async def open_grasshopper(ctx: Context) -> str:
     """Open Grasshopper in Rhino
     
     Returns:
@@ -11,10 +11,10 @@ def open_grasshopper(ctx: Context) -> str:
     """
     try:
         # Get the global connection
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
 
         # Send the command to open Grasshopper
-        result = rhino.send_command("open_grasshopper", {})
+        result = await rhino.send_command("open_grasshopper", {})
         
         return f"Grasshopper opened successfully"
     except Exception as e:
@@ -0,0 +1,45 @@
+from mcp.server.fastmcp import Context
+from rhinomcp import get_async_rhino_connection, mcp, logger
+from rhinomcp.spatial import QUERY_OBJECTS_IN_BOX
+from typing import Any, Dict, List
+
+@mcp.tool()
+async def query_objects_in_box(
+    ctx: Context,
+    min: List[float],
+    max: List[float],
+    contained: bool = False,
+    cursor: str = None,
+    limit: int = 1000
+) -> Dict[str, Any]:
+    """
+    Find the objects in a region of the Rhino document, by their bounding boxes.
+    Returns ids only, use get_object_info for the details of the ones you need.
+
+    Parameters:
+    - min: [x, y, z] corner of the box
+    - max: [x, y, z] opposite corner of the box
+    - contained: Optional boolean to only find objects lying completely inside the box, instead of all that intersect it
+    - cursor: The "next_cursor" of the previous page, leave empty for the first page
+    - limit: Number of ids per page (at most 5000)
+
+    Returns:
+    - A dictionary with the following keys:
+        - "ids": The ids of the objects found on this page
+        - "next_cursor": The cursor of the next page, or null on the last page
+        - "count": The number of objects found on all pages
+    """
+    try:
+        rhino = await get_async_rhino_connection()
+        params = {"min": min, "max": max, "limit": limit}
+        if contained:
+            params["contained"] = True
+        if cursor is not None:
+            params["cursor"] = cursor
+        return await rhino.send_command(QUERY_OBJECTS_IN_BOX, params)
+
+    except Exception as e:
+        logger.error(f"Error querying objects in box: {str(e)}")
+        return {
+            "error": str(e)
+        }
\ No newline at end of file
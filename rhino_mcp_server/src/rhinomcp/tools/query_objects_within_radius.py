@@ -0,0 +1,42 @@
+from mcp.server.fastmcp import Context
+from rhinomcp import get_async_rhino_connection, mcp, logger
+from rhinomcp.spatial import QUERY_OBJECTS_WITHIN_RADIUS
+from typing import Any, Dict, List
+
+@mcp.tool()
+async def query_objects_within_radius(
+    ctx: Context,
+    center: List[float],
+    radius: float,
+    cursor: str = None,
+    limit: int = 1000
+) -> Dict[str, Any]:
+    """
+    Find the objects of the Rhino document whose bounding boxes come within a distance of a point.
+    Returns ids only, use get_object_info for the details of the ones you need.
+
+    Parameters:
+    - center: [x, y, z] point to measure from
+    - radius: Largest distance from center to an object's bounding box
+    - cursor: The "next_cursor" of the previous page, leave empty for the first page
+    - limit: Number of ids per page (at most 5000)
+
+    Returns:
+    - A dictionary with the following keys:
+        - "ids": The ids of the objects found on this page
+        - "distances": The distance from center to the bounding box of each of them, 0 for boxes around center
+        - "next_cursor": The cursor of the next page, or null on the last page
+        - "count": The number of objects found on all pages
+    """
+    try:
+        rhino = await get_async_rhino_connection()
+        params = {"center": center, "radius": radius, "limit": limit}
+        if cursor is not None:
+            params["cursor"] = cursor
+        return await rhino.send_command(QUERY_OBJECTS_WITHIN_RADIUS, params)
+
+    except Exception as e:
+        logger.error(f"Error querying objects within radius: {str(e)}")
+        return {
+            "error": str(e)
+        }
\ No newline at end of file
@@ -1,14 +1,16 @@
 from mcp.server.fastmcp import Context
 import json
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.query import validate_query
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import Any, List, Dict
 
 
 @mcp.tool()
-def select_objects(
+async def select_objects(
     ctx: Context,
     filters: Dict[str, List[Any]] = {},
     filters_type: str = "and",
+    query: Dict[str, Any] = None,
 ) -> str:
     """
     Select objects in the Rhino document.
@@ -16,6 +18,7 @@ def select_objects(
     Parameters:
     - filters: A dictionary containing the filters. The filters parameter is necessary, unless it's empty, in which case all objects will be selected.
     - filters_type: The type of the filters, it's "and" or "or", default is "and"
+    - query: Optional query for anything filters cannot express, used instead of filters
 
     Note:
     The filter value is always a list, even if it's a single value. The reason is that a filter can contain multiple values, for example when we query by a attribute that has EITHER value1 OR value2.
@@ -34,6 +37,24 @@ def select_objects(
         "category": ["custom_attribute_value"]
     },
     filters_type = "or"
+
+    A query compares a field of every object and combines comparisons with "and", "or" and "not".
+    Fields are name, layer, color, type (e.g. "Brep", "Curve") or the key of a user custom attribute,
+    written "user:name" when it is called like one of the others. Each field is compared with one of:
+    - eq: equal to a value
+    - in: equal to one of a list of values
+    - prefix: starting with a string
+    - range: [low, high] for attributes holding numbers, either may be null
+
+    Example:
+    query = {
+        "and": [
+            {"field": "layer", "eq": "Facade"},
+            {"field": "name", "prefix": "Panel"},
+            {"field": "height", "range": [2.5, null]},
+            {"not": {"field": "status", "in": ["demolished", "hidden"]}}
+        ]
+    }
     
 
     Returns:
@@ -41,13 +62,17 @@ def select_objects(
     """
     try:
         # Get the global connection
-        rhino = get_rhino_connection()
-        command_params = {
-            "filters": filters,
-            "filters_type": filters_type
-        }
+        rhino = await get_async_rhino_connection()
+        if query is not None:
+            validate_query(query)
+            command_params = {"query": query}
+        else:
+            command_params = {
+                "filters": filters,
+                "filters_type": filters_type
+            }
 
-        result = rhino.send_command("select_objects", command_params)
+        result = await rhino.send_command("select_objects", command_params)
           
         return f"Selected {result['count']} objects"
     except Exception as e:
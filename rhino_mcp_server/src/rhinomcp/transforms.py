@@ -0,0 +1,84 @@
+"""Transformation matrices for many objects at once, built with NumPy.
+
+``modify_objects`` can move a batch of objects by one 4x4 matrix per
+object. Composing them here costs a few array operations, however many
+objects there are, and sends Rhino one packed array:
+
+    offsets = np.zeros((len(ids), 3))
+    offsets[::2, 2] = 0.5  # stagger every other panel
+    xforms = transform_matrices(translations=offsets)
+    await transform_objects(pool, ids, xforms=xforms)
+
+NumPy is needed for ``transform_matrices`` only; matrices can also be given
+as nested lists.
+"""
+
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+
+def _rows(value: Any, count: int | None) -> "np.ndarray":
+    rows = np.asarray(value, dtype=float)
+    if rows.ndim == 1:
+        rows = np.broadcast_to(rows, (count or 1, 3))
+    if rows.ndim != 2 or rows.shape[1] != 3:
+        raise ValueError(f"Expected [x, y, z] or one per object, got shape {rows.shape}")
+    return rows
+
+
+def _rotations(axis: int, angles: "np.ndarray") -> "np.ndarray":
+    cos, sin = np.cos(angles), np.sin(angles)
+    matrices = np.tile(np.eye(4), (len(angles), 1, 1))
+    a, b = [(1, 2), (0, 2), (0, 1)][axis]
+    # Counterclockwise looking down the axis; about Y that puts the sine below the diagonal
+    sign = -1.0 if axis == 1 else 1.0
+    matrices[:, a, a] = cos
+    matrices[:, a, b] = -sign * sin
+    matrices[:, b, a] = sign * sin
+    matrices[:, b, b] = cos
+    return matrices
+
+
+def transform_matrices(
+    translations: Any = None,
+    rotations: Any = None,
+    scales: Any = None,
+    pivots: Any = None,
+    count: int | None = None,
+) -> "np.ndarray":
+    """``(N, 4, 4)`` matrices that rotate, then scale, then translate each object.
+
+    Each argument is ``[x, y, z]`` for all objects or an ``(N, 3)`` array.
+    Rotations are in radians about X, Y and Z, combined like
+    ``modify_object`` does so Z turns first. Rotating and scaling happen
+    about ``pivots``, by default the origin; ``modify_object`` uses each
+    object's bounding box instead.
+    """
+    if np is None:
+        raise ImportError("transform_matrices requires numpy to be installed")
+    given = [np.asarray(value) for value in (translations, rotations, scales, pivots) if value is not None]
+    sizes = {len(value) for value in given if value.ndim == 2}
+    if len(sizes) > 1:
+        raise ValueError(f"Got different numbers of rows: {sorted(sizes)}")
+    count = sizes.pop() if sizes else (count or 1)
+
+    matrices = np.tile(np.eye(4), (count, 1, 1))
+    pivot = _rows(pivots, count) if pivots is not None else np.zeros((count, 3))
+    if rotations is not None:
+        angles = _rows(rotations, count)
+        rotation = _rotations(0, angles[:, 0]) @ _rotations(1, angles[:, 1]) @ _rotations(2, angles[:, 2])
+        matrices = rotation @ matrices
+    if scales is not None:
+        factors = _rows(scales, count)
+        scale = np.tile(np.eye(4), (count, 1, 1))
+        scale[:, [0, 1, 2], [0, 1, 2]] = factors
+        matrices = scale @ matrices
+    # Both turned about the pivot: move it to the origin first and back after
+    matrices[:, :3, 3] += pivot - np.einsum("nij,nj->ni", matrices[:, :3, :3], pivot)
+    if translations is not None:
+        matrices[:, :3, 3] += _rows(translations, count)
+    return matrices
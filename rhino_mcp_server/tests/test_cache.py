@@ -0,0 +1,18 @@
+from rhinomcp.cache import ResponseCache
+
+
+def test_pages_with_a_next_cursor_are_not_kept():
+    cache = ResponseCache()
+    params = {"limit": 2}
+    cache.put("get_document_objects", params, {"objects": [{}, {}], "next_cursor": "snapshot:2"}, cache.generation)
+    assert cache.get("get_document_objects", params) is None
+
+    cache.put("get_document_objects", params, {"objects": [{}], "next_cursor": None}, cache.generation)
+    assert cache.get("get_document_objects", params) == {"objects": [{}], "next_cursor": None}
+
+
+def test_writes_drop_cached_reads():
+    cache = ResponseCache()
+    cache.put("get_object_info", {"id": "a"}, {"id": "a"}, cache.generation)
+    cache.invalidate()
+    assert cache.get("get_object_info", {"id": "a"}) is None
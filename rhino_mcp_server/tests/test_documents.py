@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from rhinomcp.async_connection import AsyncRhinoConnection
+from rhinomcp.documents import iter_document_objects
+from rhinomcp.fake_rhino import MAX_PAGE_SNAPSHOTS, FakeRhinoServer
+
+
+def run(server: FakeRhinoServer, send):
+    async def main():
+        rhino = AsyncRhinoConnection(*server.address)
+        await rhino.connect()
+        try:
+            return await send(rhino)
+        finally:
+            await rhino.disconnect()
+
+    return asyncio.run(main())
+
+
+def test_pages_list_every_object_once_in_serial_order():
+    with FakeRhinoServer(object_count=1234) as server:
+        async def send(rhino):
+            return [obj["id"] async for obj in iter_document_objects(rhino, page_size=100, fields=["id"])]
+
+        ids = run(server, send)
+        assert ids == [obj["id"] for _serial, obj in sorted(server.objects.items())]
+
+
+def test_objects_added_while_paging_are_not_listed_and_deleted_ones_are_left_out():
+    with FakeRhinoServer(object_count=10) as server:
+        async def send(rhino):
+            first = await rhino.send_command("get_document_objects", {"limit": 5, "fields": ["id"]})
+            server.delete_object(next(reversed(server._ids)))
+            server.add_object(name="late")
+            second = await rhino.send_command("get_document_objects", {"limit": 5, "fields": ["id"], "cursor": first["next_cursor"]})
+            return first, second
+
+        first, second = run(server, send)
+        assert len(first["objects"]) == 5
+        assert len(second["objects"]) == 4
+        assert second["next_cursor"] is None
+
+
+def test_cursor_expires_after_the_last_page_and_behind_newer_snapshots():
+    with FakeRhinoServer(object_count=10) as server:
+        async def send(rhino):
+            params = {"limit": 5, "fields": ["id"]}
+            first = await rhino.send_command("get_document_objects", params)
+            last = await rhino.send_command("get_document_objects", dict(params, cursor=first["next_cursor"]))
+            assert last["next_cursor"] is None
+            # The snapshot is dropped with its last page
+            with pytest.raises(Exception, match="cursor has expired"):
+                await rhino.send_command("get_document_objects", dict(params, cursor=first["next_cursor"]))
+
+            oldest = await rhino.send_command("get_document_objects", params)
+            for _index in range(MAX_PAGE_SNAPSHOTS):
+                await rhino.send_command("get_document_objects", params)
+            with pytest.raises(Exception, match="cursor has expired"):
+                await rhino.send_command("get_document_objects", dict(params, cursor=oldest["next_cursor"]))
+            with pytest.raises(Exception, match="cursor has expired"):
+                await rhino.send_command("get_document_objects", dict(params, cursor="42"))
+
+        run(server, send)
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from rhinomcp.errors import RhinoTimeoutError
+from rhinomcp.fake_rhino import FakeRhinoServer
+from rhinomcp.pool import RhinoConnectionPool
+from rhinomcp.timeouts import COMMAND_TIMEOUTS
+
+
+def run(server: FakeRhinoServer, send):
+    async def main():
+        pool = RhinoConnectionPool(*server.address)
+        try:
+            return await send(pool)
+        finally:
+            await pool.close()
+
+    return asyncio.run(main())
+
+
+def test_timeout_override_above_table_value_is_honoured():
+    latency = COMMAND_TIMEOUTS["get_document_info"] + 0.5
+    with FakeRhinoServer(latency={"get_document_info": latency}) as server:
+        result = run(server, lambda pool: pool.send_command("get_document_info", timeout=latency + 2))
+    assert "object_count" in result
+
+
+def test_timeout_override_below_table_value_is_honoured():
+    with FakeRhinoServer(latency={"get_document_objects": 0.5}) as server:
+        with pytest.raises(RhinoTimeoutError):
+            run(server, lambda pool: pool.send_command("get_document_objects", timeout=0.2))
+
+
+def test_timed_out_reads_are_not_retried():
+    timeout = COMMAND_TIMEOUTS["get_document_info"]
+    with FakeRhinoServer(latency={"get_document_info": timeout + 0.5}) as server:
+        async def send(pool):
+            with pytest.raises(RhinoTimeoutError):
+                await pool.send_command("get_document_info")
+            return pool.stats()
+
+        stats = run(server, send)
+    assert stats["retries"] == 0
+
+
+def test_coalesced_pages_get_cursors_of_their_own():
+    with FakeRhinoServer(object_count=20, latency=0.1) as server:
+        async def send(pool):
+            params = {"limit": 5}
+            first, second = await asyncio.gather(
+                pool.send_command("get_document_objects", params), pool.send_command("get_document_objects", params)
+            )
+            assert first["next_cursor"] != second["next_cursor"]
+            # Paging one to the end leaves the other's cursor valid
+            cursor = first["next_cursor"]
+            while cursor is not None:
+                cursor = (await pool.send_command("get_document_objects", dict(params, cursor=cursor)))["next_cursor"]
+            return await pool.send_command("get_document_objects", dict(params, cursor=second["next_cursor"]))
+
+        page = run(server, send)
+    assert len(page["objects"]) == 5
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from rhinomcp.async_connection import AsyncRhinoConnection
+from rhinomcp.fake_rhino import FakeRhinoServer
+from rhinomcp.spatial import box_distance, boxes_intersect, iter_objects_in_box, iter_objects_within_radius
+
+
+def run(server: FakeRhinoServer, send):
+    async def main():
+        rhino = AsyncRhinoConnection(*server.address)
+        await rhino.connect()
+        try:
+            return await send(rhino)
+        finally:
+            await rhino.disconnect()
+
+    return asyncio.run(main())
+
+
+def test_box_and_radius_pages_match_a_scan():
+    with FakeRhinoServer(object_count=500) as server:
+        boxes = {obj["id"]: obj["bounding_box"] for obj in server.objects.values()}
+        box = [[0, 0, 0], [200, 1, 1]]
+
+        async def send(rhino):
+            in_box = [object_id async for object_id in iter_objects_in_box(rhino, *box, page_size=37)]
+            near = [hit async for hit in iter_objects_within_radius(rhino, [100, 0, 0], 50, page_size=37)]
+            return in_box, near
+
+        in_box, near = run(server, send)
+        assert in_box == [object_id for object_id, bounds in boxes.items() if boxes_intersect(box, bounds)]
+        assert dict(near) == {object_id: box_distance(bounds, [100, 0, 0]) for object_id, bounds in boxes.items() if box_distance(bounds, [100, 0, 0]) <= 50}
+
+
+def test_later_pages_keep_the_hits_of_the_first():
+    with FakeRhinoServer(object_count=100) as server:
+        async def send(rhino):
+            params = {"min": [0, 0, 0], "max": [1000, 1, 1], "limit": 60}
+            first = await rhino.send_command("query_objects_in_box", params)
+            server.add_object(name="late")
+            second = await rhino.send_command("query_objects_in_box", dict(params, cursor=first["next_cursor"]))
+            with pytest.raises(Exception, match="cursor has expired"):
+                await rhino.send_command("query_objects_in_box", dict(params, cursor=first["next_cursor"]))
+            return first, second
+
+        first, second = run(server, send)
+        assert first["count"] == second["count"] == 100
+        assert len(first["ids"]) + len(second["ids"]) == 100